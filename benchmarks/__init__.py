@@ -0,0 +1 @@
+"""Benchmark suite of click-params conversions."""
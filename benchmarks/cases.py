@@ -0,0 +1,210 @@
+"""Benchmark cases: each exported parameter type with a generator of synthetic valid items."""
+import json
+import random
+import uuid
+from ipaddress import IPv4Address, IPv6Address
+from typing import Callable, List, NamedTuple
+
+import click
+
+import click_params as cp
+from click_params.miscellaneous import ChoiceListParamType, JsonParamType
+
+MIXES = ('valid', 'mixed', 'invalid')
+# in the mixed inputs, one item out of MIXED_INVALID_RATE is invalid
+MIXED_INVALID_RATE = 10
+
+
+class Case(NamedTuple):
+    name: str
+    # returns the parameter type to benchmark, a factory is used so that a case does not share state with another one
+    factory: Callable[[], click.ParamType]
+    # returns a valid item from a random generator and the index of the item
+    valid_item: Callable[[random.Random, int], str]
+    # a list case converts one expression of n items, a single case converts n items one by one
+    is_list: bool
+
+
+def invalid_item(_rng: random.Random, index: int) -> str:
+    return f'bad value#{index}'
+
+
+def int_item(rng: random.Random, _index: int) -> str:
+    return str(rng.randint(-(10**6), 10**6))
+
+
+def float_item(rng: random.Random, _index: int) -> str:
+    return f'{rng.uniform(-1000, 1000):.4f}'
+
+
+def complex_item(rng: random.Random, _index: int) -> str:
+    return f'{rng.randint(-100, 100)}+{rng.randint(0, 100)}j'
+
+
+def decimal_item(rng: random.Random, _index: int) -> str:
+    return f'{rng.randint(0, 10**6)}.{rng.randint(0, 99):02d}'
+
+
+def fraction_item(rng: random.Random, _index: int) -> str:
+    return f'{rng.randint(-1000, 1000)}/{rng.randint(1, 1000)}'
+
+
+def ipv4_item(rng: random.Random, _index: int) -> str:
+    return str(IPv4Address(rng.getrandbits(32)))
+
+
+def ipv6_item(rng: random.Random, _index: int) -> str:
+    return str(IPv6Address(rng.getrandbits(128)))
+
+
+def ip_item(rng: random.Random, index: int) -> str:
+    return ipv6_item(rng, index) if index % 2 else ipv4_item(rng, index)
+
+
+def ipv4_network_item(rng: random.Random, _index: int) -> str:
+    return f'{IPv4Address(rng.getrandbits(24) << 8)}/24'
+
+
+def ipv6_network_item(rng: random.Random, _index: int) -> str:
+    return f'{IPv6Address(rng.getrandbits(64) << 64)}/64'
+
+
+def ip_network_item(rng: random.Random, index: int) -> str:
+    return ipv6_network_item(rng, index) if index % 2 else ipv4_network_item(rng, index)
+
+
+# non adjacent /24 networks, so that they are not merged into bigger intervals
+ALLOWED_NETWORKS = [f'10.{index // 128}.{index % 128 * 2}.0/24' for index in range(10_000)]
+
+
+def allowed_ip_item(rng: random.Random, _index: int) -> str:
+    index = rng.randrange(len(ALLOWED_NETWORKS))
+    return f'10.{index // 128}.{index % 128 * 2}.{rng.randint(0, 255)}'
+
+
+def domain_item(rng: random.Random, index: int) -> str:
+    return f'host{index}.example{rng.randint(0, 99)}.com'
+
+
+def url_item(rng: random.Random, index: int) -> str:
+    return f'https://www.example{rng.randint(0, 99)}.com/path/{index}?q={rng.randint(0, 99)}'
+
+
+def email_item(rng: random.Random, index: int) -> str:
+    return f'user{index}@example{rng.randint(0, 99)}.org'
+
+
+def slug_item(rng: random.Random, index: int) -> str:
+    return f'slug-{index}-{rng.randint(0, 99)}'
+
+
+def mac_address_item(rng: random.Random, _index: int) -> str:
+    return ':'.join(f'{rng.getrandbits(8):02x}' for _ in range(6))
+
+
+def uuid_item(rng: random.Random, _index: int) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128)))
+
+
+def datetime_item(rng: random.Random, index: int) -> str:
+    date = f'20{rng.randint(10, 29)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}'
+    return f'{date} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00' if index % 2 else date
+
+
+def string_item(_rng: random.Random, index: int) -> str:
+    return f'item{index}'
+
+
+CHOICES = [f'choice{index}' for index in range(1000)]
+
+
+def choice_item(rng: random.Random, _index: int) -> str:
+    return rng.choice(CHOICES)
+
+
+def json_item(rng: random.Random, index: int) -> str:
+    return json.dumps({'id': index, 'name': f'item{index}', 'score': rng.random(), 'tags': ['a', 'b']})
+
+
+def json_document_item(rng: random.Random, index: int) -> str:
+    # a configuration-like document of about 10 KiB
+    records = [
+        {'id': index * 100 + position, 'name': f'item{position}', 'score': rng.random(), 'enabled': position % 2 == 0}
+        for position in range(100)
+    ]
+    return json.dumps({'version': 1, 'records': records, 'tags': [f'tag{position}' for position in range(50)]})
+
+
+def first_of_item(rng: random.Random, index: int) -> str:
+    # mostly urls, which are tried last
+    return ipv4_item(rng, index) if index % 10 == 0 else url_item(rng, index)
+
+
+CASES: List[Case] = [
+    # single types
+    Case('DOMAIN', lambda: cp.DOMAIN, domain_item, False),
+    Case('URL', lambda: cp.URL, url_item, False),
+    Case('EMAIL', lambda: cp.EMAIL, email_item, False),
+    Case('SLUG', lambda: cp.SLUG, slug_item, False),
+    Case('JSON', lambda: cp.JSON, json_item, False),
+    Case('JSON[json]', lambda: JsonParamType(backend='json'), json_item, False),
+    Case('JSON document', lambda: cp.JSON, json_document_item, False),
+    Case('JSON document[json]', lambda: JsonParamType(backend='json'), json_document_item, False),
+    Case('MAC_ADDRESS', lambda: cp.MAC_ADDRESS, mac_address_item, False),
+    Case('IP_ADDRESS', lambda: cp.IP_ADDRESS, ip_item, False),
+    Case('IPV4_ADDRESS', lambda: cp.IPV4_ADDRESS, ipv4_item, False),
+    Case('IPV6_ADDRESS', lambda: cp.IPV6_ADDRESS, ipv6_item, False),
+    Case('IP_NETWORK', lambda: cp.IP_NETWORK, ip_network_item, False),
+    Case('IPV4_NETWORK', lambda: cp.IPV4_NETWORK, ipv4_network_item, False),
+    Case('IPV6_NETWORK', lambda: cp.IPV6_NETWORK, ipv6_network_item, False),
+    Case('Ipv4AddressRange', lambda: cp.Ipv4AddressRange(IPv4Address(0), IPv4Address(2**32 - 1)), ipv4_item, False),
+    Case('Ipv6AddressRange', lambda: cp.Ipv6AddressRange(IPv6Address(0), IPv6Address(2**128 - 1)), ipv6_item, False),
+    Case('IpAddressInNetworks', lambda: cp.IpAddressInNetworks(ALLOWED_NETWORKS), allowed_ip_item, False),
+    Case('DECIMAL', lambda: cp.DECIMAL, decimal_item, False),
+    Case('DecimalRange', lambda: cp.DecimalRange(0, 10**6 + 1), decimal_item, False),
+    Case('FRACTION', lambda: cp.FRACTION, fraction_item, False),
+    Case('FractionRange', lambda: cp.FractionRange(-1000, 1000), fraction_item, False),
+    Case('COMPLEX', lambda: cp.COMPLEX, complex_item, False),
+    Case('FirstOf', lambda: cp.FirstOf(cp.IP_ADDRESS, cp.DOMAIN, cp.URL), first_of_item, False),
+    Case(
+        'FirstOf[adaptive]', lambda: cp.FirstOf(cp.IP_ADDRESS, cp.DOMAIN, cp.URL, adaptive=True), first_of_item, False
+    ),
+    # list types
+    Case('DomainListParamType', cp.DomainListParamType, domain_item, True),
+    Case('UrlListParamType', cp.UrlListParamType, url_item, True),
+    Case('EmailListParamType', cp.EmailListParamType, email_item, True),
+    Case('SlugListParamType', cp.SlugListParamType, slug_item, True),
+    Case('StringListParamType', cp.StringListParamType, string_item, True),
+    Case('MacAddressListParamType', cp.MacAddressListParamType, mac_address_item, True),
+    Case('UUIDListParamType', cp.UUIDListParamType, uuid_item, True),
+    Case('UUIDListParamType[packed]', lambda: cp.UUIDListParamType(packed=True), uuid_item, True),
+    Case('DateTimeListParamType', cp.DateTimeListParamType, datetime_item, True),
+    Case('ChoiceListParamType', lambda: ChoiceListParamType(CHOICES), choice_item, True),
+    Case('IpAddressListParamType', cp.IpAddressListParamType, ip_item, True),
+    Case('Ipv4AddressListParamType', cp.Ipv4AddressListParamType, ipv4_item, True),
+    Case('Ipv6AddressListParamType', cp.Ipv6AddressListParamType, ipv6_item, True),
+    Case('IpNetworkListParamType', cp.IpNetworkListParamType, ip_network_item, True),
+    Case('Ipv4NetworkListParamType', cp.Ipv4NetworkListParamType, ipv4_network_item, True),
+    Case('Ipv6NetworkListParamType', cp.Ipv6NetworkListParamType, ipv6_network_item, True),
+    Case(
+        'IpAddressInNetworksListParamType',
+        lambda: cp.IpAddressInNetworksListParamType(ALLOWED_NETWORKS),
+        allowed_ip_item,
+        True,
+    ),
+    Case('IntListParamType', cp.IntListParamType, int_item, True),
+    Case('FloatListParamType', cp.FloatListParamType, float_item, True),
+    Case('DecimalListParamType', cp.DecimalListParamType, decimal_item, True),
+    Case('FractionListParamType', cp.FractionListParamType, fraction_item, True),
+    Case('ComplexListParamType', cp.ComplexListParamType, complex_item, True),
+]
+
+
+def make_items(case: Case, size: int, mix: str, seed: int = 0) -> List[str]:
+    """Returns size synthetic items for a case, all valid, all invalid or with one invalid item out of ten."""
+    rng = random.Random(seed)
+    items = []
+    for index in range(size):
+        invalid = mix == 'invalid' or (mix == 'mixed' and index % MIXED_INVALID_RATE == MIXED_INVALID_RATE - 1)
+        items.append(invalid_item(rng, index) if invalid else case.valid_item(rng, index))
+    return items
@@ -0,0 +1,52 @@
+"""
+Compares two result files produced by benchmarks.run.
+
+Usage: python -m benchmarks.compare baseline.json candidate.json [--threshold 1.1]
+The command exits with code 1 if a case is slower than threshold times its baseline.
+"""
+import json
+from typing import Any, Dict, Tuple
+
+import click
+
+Key = Tuple[str, int, str]
+
+
+def load(file) -> Dict[Key, Dict[str, Any]]:
+    return {(result['case'], result['size'], result['mix']): result for result in json.load(file)['results']}
+
+
+def ratio(candidate: float, baseline: float) -> float:
+    return candidate / baseline if baseline else float('inf')
+
+
+@click.command()
+@click.argument('baseline', type=click.File())
+@click.argument('candidate', type=click.File())
+@click.option('-t', '--threshold', type=click.FloatRange(1), default=1.1, help='time ratio considered as a regression.')
+def cli(baseline, candidate, threshold):
+    """Compares the time and peak memory of two benchmark runs."""
+    baseline_results = load(baseline)
+    candidate_results = load(candidate)
+    regressions = 0
+    click.echo(f'{"case":<28} {"size":>9} {"mix":<8} {"time ratio":>10} {"memory ratio":>12}')
+    for key in sorted(baseline_results.keys() & candidate_results.keys()):
+        time_ratio = ratio(candidate_results[key]['seconds'], baseline_results[key]['seconds'])
+        memory_ratio = ratio(candidate_results[key]['peak_memory'], baseline_results[key]['peak_memory'])
+        flag = ''
+        if time_ratio > threshold:
+            regressions += 1
+            flag = ' <- slower'
+        case, size, mix = key
+        click.echo(f'{case:<28} {size:>9} {mix:<8} {time_ratio:>10.2f} {memory_ratio:>12.2f}{flag}')
+
+    missing = baseline_results.keys() ^ candidate_results.keys()
+    if missing:
+        click.echo(f'{len(missing)} measures are only present in one of the files', err=True)
+    if regressions:
+        click.echo(f'{regressions} measures are slower than {threshold} times their baseline', err=True)
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,110 @@
+"""
+Runs the benchmark suite and stores the results as json.
+
+Usage: python -m benchmarks.run --output results.json [--sizes 1,100,10000] [--cases URL,IntListParamType]
+"""
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import click
+
+from click_params import IntListParamType, StringListParamType
+
+from .cases import CASES, MIXES, Case, make_items
+
+DEFAULT_SIZES = [1, 10, 100, 1000, 10_000, 100_000, 1_000_000]
+# a measure is repeated until its cumulated time reaches this value in seconds, or the maximum number of repeats
+MIN_TOTAL_TIME = 0.2
+
+
+def convert(case: Case, param_type: click.ParamType, items: List[str], expression: str) -> None:
+    try:
+        if case.is_list:
+            param_type.convert(expression, None, None)
+            return
+        for item in items:
+            try:
+                param_type.convert(item, None, None)
+            except click.BadParameter:
+                pass
+    except click.BadParameter:
+        pass
+
+
+def measure(case: Case, size: int, mix: str, max_repeat: int) -> Dict[str, Any]:
+    """Returns the best conversion time and the peak memory used to convert size items of a case."""
+    items = make_items(case, size, mix)
+    expression = ','.join(items)
+    timings = []
+    while len(timings) < max_repeat and sum(timings) < MIN_TOTAL_TIME:
+        param_type = case.factory()
+        start = time.perf_counter()
+        convert(case, param_type, items, expression)
+        timings.append(time.perf_counter() - start)
+
+    param_type = case.factory()
+    tracemalloc.start()
+    try:
+        convert(case, param_type, items, expression)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    seconds = min(timings)
+    return {
+        'case': case.name,
+        'size': size,
+        'mix': mix,
+        'seconds': seconds,
+        'items_per_second': size / seconds if seconds else None,
+        'peak_memory': peak_memory,
+        'repeat': len(timings),
+    }
+
+
+@click.command()
+@click.option('-o', '--output', type=click.File('w'), default='-', help='json file where results are written.')
+@click.option('-s', '--sizes', type=IntListParamType(), default=DEFAULT_SIZES, help='numbers of items to convert.')
+@click.option(
+    '-c', '--cases', 'case_names', type=StringListParamType(), help='names of the cases to run, all by default.'
+)
+@click.option('-m', '--mixes', type=StringListParamType(), default=list(MIXES), help='valid, mixed and/or invalid.')
+@click.option('-r', '--repeat', type=click.IntRange(1), default=5, help='maximum number of runs of each measure.')
+def cli(output, sizes, case_names, mixes, repeat):
+    """Benchmarks the conversion of every parameter type of click-params."""
+    unknown_mixes = set(mixes) - set(MIXES)
+    if unknown_mixes:
+        raise click.BadParameter(f'unknown mixes: {sorted(unknown_mixes)}', param_hint='--mixes')
+    cases = [case for case in CASES if not case_names or case.name in case_names]
+    if case_names and len(cases) != len(case_names):
+        unknown_cases = sorted(set(case_names) - {case.name for case in cases})
+        raise click.BadParameter(f'unknown cases: {unknown_cases}', param_hint='--cases')
+
+    results = []
+    for case in cases:
+        for size in sizes:
+            for mix in mixes:
+                result = measure(case, size, mix, repeat)
+                click.echo(
+                    f'{case.name:<28} {size:>9} {mix:<8} {result["seconds"]:.6f}s '
+                    f'{result["peak_memory"] / 1024:.0f} KiB',
+                    err=True,
+                )
+                results.append(result)
+
+    metadata = {
+        'date': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+    }
+    json.dump({'metadata': metadata, 'results': results}, output, indent=2)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,22 @@
+"""
+pytest-benchmark version of the suite, it is not part of the test suite and must be run explicitly:
+pytest benchmarks --benchmark-only
+"""
+import pytest
+
+from .cases import CASES, MIXES, make_items
+from .run import convert
+
+pytest.importorskip('pytest_benchmark')
+
+SIZES = [1, 1000, 100_000]
+
+
+@pytest.mark.parametrize('mix', MIXES)
+@pytest.mark.parametrize('size', SIZES)
+@pytest.mark.parametrize('case', CASES, ids=[case.name for case in CASES])
+def test_conversion(benchmark, case, size, mix):
+    items = make_items(case, size, mix)
+    expression = ','.join(items)
+    benchmark.extra_info['items'] = size
+    benchmark(convert, case, case.factory(), items, expression)
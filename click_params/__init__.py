@@ -1,113 +1,197 @@
-from .base import BaseParamType, ListParamType, RangeParamType, ValidatorParamType
-from .domain import (
-    DOMAIN,
-    EMAIL,
-    PUBLIC_URL,
-    SLUG,
-    URL,
-    DomainListParamType,
-    EmailListParamType,
-    EmailParamType,
-    PublicUrlListParamType,
-    SlugListParamType,
-    UrlListParamType,
-    UrlParamType,
-)
-from .miscellaneous import (  # ChoiceListParamType,
-    JSON,
-    MAC_ADDRESS,
-    DateTimeListParamType,
-    FirstOf,
-    MacAddressListParamType,
-    StringListParamType,
-    UUIDListParamType,
-)
-from .network import (
-    IP_ADDRESS,
-    IP_NETWORK,
-    IPV4_ADDRESS,
-    IPV4_NETWORK,
-    IPV6_ADDRESS,
-    IPV6_NETWORK,
-    IpAddressListParamType,
-    IpNetworkListParamType,
-    Ipv4AddressListParamType,
-    Ipv4AddressRange,
-    Ipv4NetworkListParamType,
-    Ipv6AddressListParamType,
-    Ipv6AddressRange,
-    Ipv6NetworkListParamType,
-)
-from .numeric import (
-    COMPLEX,
-    DECIMAL,
-    FRACTION,
-    ComplexListParamType,
-    DecimalListParamType,
-    DecimalRange,
-    FloatListParamType,
-    FractionListParamType,
-    FractionRange,
-    IntListParamType,
-)
-from .test_utils import assert_equals_output, assert_in_output, assert_list_in_output
+"""A bunch of useful click parameter types.
 
-__all__ = [
-    # base
-    'BaseParamType',
-    'ValidatorParamType',
-    'RangeParamType',
-    'ListParamType',
-    # domain
-    'DOMAIN',
-    'PUBLIC_URL',
-    'URL',
-    'UrlParamType',
-    'EmailParamType',
-    'EMAIL',
-    'SLUG',
-    'DomainListParamType',
-    'PublicUrlListParamType',
-    'UrlListParamType',
-    'EmailListParamType',
-    'SlugListParamType',
-    # miscellaneous
-    'JSON',
-    'MAC_ADDRESS',
-    # 'ChoiceListParamType',
-    'StringListParamType',
-    'MacAddressListParamType',
-    'UUIDListParamType',
-    'DateTimeListParamType',
-    'FirstOf',
-    # network
-    'IP_ADDRESS',
-    'IPV6_ADDRESS',
-    'IPV4_ADDRESS',
-    'IP_NETWORK',
-    'IPV4_NETWORK',
-    'IPV6_NETWORK',
-    'Ipv4AddressRange',
-    'Ipv6AddressRange',
-    'IpAddressListParamType',
-    'Ipv4AddressListParamType',
-    'Ipv6AddressListParamType',
-    'Ipv4NetworkListParamType',
-    'IpNetworkListParamType',
-    'Ipv6NetworkListParamType',
-    # numeric
-    'FRACTION',
-    'FractionRange',
-    'DECIMAL',
-    'DecimalRange',
-    'COMPLEX',
-    'IntListParamType',
-    'FloatListParamType',
-    'FractionListParamType',
-    'DecimalListParamType',
-    'ComplexListParamType',
-    # test_utils
-    'assert_equals_output',
-    'assert_in_output',
-    'assert_list_in_output',
-]
+Public names are resolved lazily: a submodule (and the third-party packages it depends on) is only imported the first
+time one of its names is accessed, which keeps the import of this package cheap for short-lived command line tools.
+"""
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+# static analysers cannot follow __getattr__, they read the names of _PUBLIC_NAMES from these imports
+if TYPE_CHECKING:  # pragma: no cover
+    from .base import (  # noqa: F401
+        BaseParamType,
+        ConversionCache,
+        ConversionStats,
+        ListParamType,
+        PackedSequence,
+        RangeParamType,
+        RangeSequence,
+        ValidatorParamType,
+        disable_instrumentation,
+        enable_instrumentation,
+    )
+    from .domain import (  # noqa: F401
+        DOMAIN,
+        EMAIL,
+        PUBLIC_URL,
+        SLUG,
+        URL,
+        DomainListParamType,
+        EmailListParamType,
+        EmailParamType,
+        PublicUrlListParamType,
+        SlugListParamType,
+        UrlListParamType,
+        UrlParamType,
+    )
+    from .miscellaneous import (  # noqa: F401
+        JSON,
+        JSON_LINES,
+        MAC_ADDRESS,
+        ChoiceListParamType,
+        DateTimeListParamType,
+        FirstOf,
+        JsonLinesParamType,
+        MacAddressListParamType,
+        PackedUUIDList,
+        StringListParamType,
+        UUIDListParamType,
+        register_json_backend,
+    )
+    from .network import (  # noqa: F401
+        IP_ADDRESS,
+        IP_NETWORK,
+        IPV4_ADDRESS,
+        IPV4_NETWORK,
+        IPV6_ADDRESS,
+        IPV6_NETWORK,
+        IpAddressInNetworks,
+        IpAddressInNetworksListParamType,
+        IpAddressListParamType,
+        IpNetworkListParamType,
+        IpNetworkSet,
+        Ipv4AddressListParamType,
+        Ipv4AddressRange,
+        Ipv4AddressSequence,
+        Ipv4NetworkListParamType,
+        Ipv6AddressListParamType,
+        Ipv6AddressRange,
+        Ipv6AddressSequence,
+        Ipv6NetworkListParamType,
+        PackedIpv4AddressList,
+        PackedIpv6AddressList,
+    )
+    from .numeric import (  # noqa: F401
+        COMPLEX,
+        DECIMAL,
+        FRACTION,
+        ComplexListParamType,
+        DecimalListParamType,
+        DecimalRange,
+        FloatListParamType,
+        FractionListParamType,
+        FractionRange,
+        IntListParamType,
+    )
+    from .options import BatchArgument, BatchOption, batch_argument, batch_option  # noqa: F401
+    from .test_utils import assert_equals_output, assert_in_output, assert_list_in_output  # noqa: F401
+
+# public names of each submodule, a submodule is only imported when one of its names is accessed
+_PUBLIC_NAMES = {
+    'base': [
+        'BaseParamType',
+        'ValidatorParamType',
+        'RangeParamType',
+        'ListParamType',
+        'PackedSequence',
+        'RangeSequence',
+        'ConversionCache',
+        'ConversionStats',
+        'enable_instrumentation',
+        'disable_instrumentation',
+    ],
+    'domain': [
+        'DOMAIN',
+        'PUBLIC_URL',
+        'URL',
+        'UrlParamType',
+        'EmailParamType',
+        'EMAIL',
+        'SLUG',
+        'DomainListParamType',
+        'PublicUrlListParamType',
+        'UrlListParamType',
+        'EmailListParamType',
+        'SlugListParamType',
+    ],
+    'miscellaneous': [
+        'JSON',
+        'JSON_LINES',
+        'JsonLinesParamType',
+        'MAC_ADDRESS',
+        'ChoiceListParamType',
+        'StringListParamType',
+        'MacAddressListParamType',
+        'UUIDListParamType',
+        'PackedUUIDList',
+        'DateTimeListParamType',
+        'FirstOf',
+        'register_json_backend',
+    ],
+    'network': [
+        'IP_ADDRESS',
+        'IPV6_ADDRESS',
+        'IPV4_ADDRESS',
+        'IP_NETWORK',
+        'IPV4_NETWORK',
+        'IPV6_NETWORK',
+        'Ipv4AddressRange',
+        'Ipv6AddressRange',
+        'IpAddressListParamType',
+        'Ipv4AddressListParamType',
+        'Ipv6AddressListParamType',
+        'Ipv4NetworkListParamType',
+        'IpNetworkListParamType',
+        'Ipv6NetworkListParamType',
+        'IpNetworkSet',
+        'IpAddressInNetworks',
+        'IpAddressInNetworksListParamType',
+        'PackedIpv4AddressList',
+        'PackedIpv6AddressList',
+        'Ipv4AddressSequence',
+        'Ipv6AddressSequence',
+    ],
+    'numeric': [
+        'FRACTION',
+        'FractionRange',
+        'DECIMAL',
+        'DecimalRange',
+        'COMPLEX',
+        'IntListParamType',
+        'FloatListParamType',
+        'FractionListParamType',
+        'DecimalListParamType',
+        'ComplexListParamType',
+    ],
+    'options': [
+        'BatchOption',
+        'BatchArgument',
+        'batch_option',
+        'batch_argument',
+    ],
+    'test_utils': [
+        'assert_equals_output',
+        'assert_in_output',
+        'assert_list_in_output',
+    ],
+}
+
+__all__ = [name for names in _PUBLIC_NAMES.values() for name in names]
+
+# maps each public name to the submodule defining it
+_SUBMODULES = {name: module_name for module_name, names in _PUBLIC_NAMES.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _SUBMODULES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # we cache the value in the module namespace so that __getattr__ is not called again for this name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
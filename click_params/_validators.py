@@ -0,0 +1,74 @@
+"""Fast validation functions used by the parameter types of click-params.
+
+The patterns are the ones of the validators package, compiled once. ASCII values are checked directly against them,
+other values (IDN domains, extended latin usernames, non-string values) are delegated to the validators package.
+Each function returns a plain boolean, so no error object is built for invalid values.
+"""
+import re
+from typing import Any
+
+import validators
+
+_WHITESPACE_OR_UNDERSCORES = re.compile(r'\s|__+')
+_DOMAIN = re.compile(
+    r'^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z0-9][a-z0-9-_]{0,61}[a-z]$',
+    re.IGNORECASE,
+)
+_EMAIL_USERNAME = re.compile(
+    r'(^[\u0100-\u017F\u0180-\u024F]'
+    r"|[-!#$%&'*+/=?^_`{}|~0-9a-z]+(\.[-!#$%&'*+/=?^_`{}|~0-9a-z]+)*$"
+    r'|^"([\001-\010\013\014\016-\037!#-\[\]-\177]|\\[\011.])*"$)',
+    re.IGNORECASE,
+)
+_SLUG = re.compile(r'^[a-z0-9]+(?:-[a-z0-9]+)*$')
+_MAC_ADDRESS = re.compile(r'^([0-9A-Fa-f]{2}[:-]){5}([0-9A-Fa-f]{2})$')
+
+
+def _is_ascii_domain(value: str) -> bool:
+    # the idna codec leaves ascii values unchanged and the pattern already rejects the labels it would refuse
+    return not _WHITESPACE_OR_UNDERSCORES.search(value) and _DOMAIN.match(value) is not None
+
+
+def domain(value: Any) -> bool:
+    """
+    Returns True if value is a valid domain name, like validators.domain with its default options.
+    :param value: the value to check.
+    """
+    if not isinstance(value, str) or not value.isascii():
+        return bool(validators.domain(value))
+    return _is_ascii_domain(value)
+
+
+def email(value: Any) -> bool:
+    """
+    Returns True if value is a valid email address, like validators.email with its default options.
+    :param value: the value to check.
+    """
+    if not isinstance(value, str) or not value.isascii():
+        return bool(validators.email(value))
+    if value.count('@') != 1:
+        return False
+    username, domain_part = value.split('@')
+    if len(username) > 64 or len(domain_part) > 253:
+        return False
+    return _EMAIL_USERNAME.match(username) is not None and _is_ascii_domain(domain_part)
+
+
+def slug(value: Any) -> bool:
+    """
+    Returns True if value is a valid slug, like validators.slug.
+    :param value: the value to check.
+    """
+    if not isinstance(value, str):
+        return bool(validators.slug(value))
+    return _SLUG.match(value) is not None
+
+
+def mac_address(value: Any) -> bool:
+    """
+    Returns True if value is a valid mac address, like validators.mac_address.
+    :param value: the value to check.
+    """
+    if not isinstance(value, str):
+        return bool(validators.mac_address(value))
+    return _MAC_ADDRESS.match(value) is not None
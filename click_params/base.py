@@ -1,34 +1,739 @@
 """Base classes to implement various parameter types"""
-from typing import Any, Callable, List, Optional, Tuple, Union
+import math
+import os
+import re
+import stat
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import Counter, OrderedDict, namedtuple
+from collections.abc import Hashable, Sequence, Sized
+from copy import copy
+from functools import partial, wraps
+from itertools import accumulate, chain
+from time import perf_counter
+from typing import IO, TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
 
 import click
 
 from .annotations import Error, Max, Min
 
+if TYPE_CHECKING:  # pragma: no cover
+    import random
+    from concurrent.futures import Executor, ProcessPoolExecutor
+
+# size of the chunks read from files passed to list types, it bounds the memory used to split them
+CHUNK_SIZE = 1024 * 1024
+
+
+def iter_file_chunks(path: str) -> Iterator[bytes]:
+    """
+    Yields the content of a file in chunks of bytes. Regular files are memory-mapped, other files like pipes are
+    read sequentially. If path is "-", the standard input is read.
+    :param path: path of the file to read.
+    """
+    if path == '-':
+        stream = click.get_binary_stream('stdin')
+        yield from iter(partial(stream.read, CHUNK_SIZE), b'')
+        return
+
+    with open(path, 'rb') as file:
+        file_stat = os.fstat(file.fileno())
+        if not stat.S_ISREG(file_stat.st_mode):
+            yield from iter(partial(file.read, CHUNK_SIZE), b'')
+            return
+        if not file_stat.st_size:  # an empty file cannot be memory-mapped
+            return
+        import mmap
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            for start in range(0, file_stat.st_size, CHUNK_SIZE):
+                yield mapped_file[start : start + CHUNK_SIZE]
+
+
+class PackedSequence(Sequence):
+    """
+    Base class of the compact containers returned by some list types. Items are stored in one contiguous buffer, they
+    are only turned into python objects when they are accessed. The buffer is available with the buffer property, the
+    container itself only supports the buffer protocol with python 3.12+.
+    Subclasses must implement _unpack and _pack, and set stride to the number of buffer elements used by an item.
+    """
+
+    stride = 1
+
+    def __init__(self, data: Union[bytes, array]):
+        self._data = data
+
+    def _unpack(self, data: Any) -> Any:
+        """Returns the python object of an item from its buffer representation."""
+        raise NotImplementedError
+
+    def _pack(self, value: Any) -> Any:
+        """Returns the buffer representation of value, a ValueError or a TypeError is raised for an invalid value."""
+        raise NotImplementedError
+
+    def _join(self, chunks: List[Any]) -> Union[bytes, array]:
+        return b''.join(chunks)
+
+    @property
+    def buffer(self) -> memoryview:
+        """A read-only memoryview of the underlying buffer."""
+        return memoryview(self._data).toreadonly()
+
+    def __buffer__(self, flags: int) -> memoryview:  # buffer protocol of python 3.12+
+        return self.buffer
+
+    def tobytes(self) -> bytes:
+        return self.buffer.tobytes()
+
+    def __len__(self) -> int:
+        return len(self._data) // self.stride
+
+    def __getitem__(self, index):
+        stride = self.stride
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return type(self)(self._data[start * stride : stop * stride])
+            chunks = [self._data[i * stride : (i + 1) * stride] for i in range(start, stop, step)]
+            return type(self)(self._join(chunks))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{type(self).__name__} index out of range')
+        return self._unpack(self._data[index] if stride == 1 else self._data[index * stride : (index + 1) * stride])
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            packed_value = self._pack(value)
+        except (ValueError, TypeError):
+            return False
+        if self.stride == 1:
+            return packed_value in self._data
+        # a match must be aligned on an item boundary
+        position = self._data.find(packed_value)
+        while position != -1 and position % self.stride:
+            position = self._data.find(packed_value, position + 1)
+        return position != -1
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is type(self):
+            return self._data == other._data
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self)!r})'
+
+
+def _ranges_intersect(first: range, second: range) -> bool:
+    """Returns True if two non-empty ranges have at least one common value."""
+    low = max(min(first[0], first[-1]), min(second[0], second[-1]))
+    high = min(max(first[0], first[-1]), max(second[0], second[-1]))
+    if low > high:
+        return False
+    # common values are the solutions of x = first[0] mod step1 and x = second[0] mod step2 (chinese remainder theorem)
+    step1, step2 = abs(first.step), abs(second.step)
+    gcd = math.gcd(step1, step2)
+    difference = second[0] - first[0]
+    if difference % gcd:
+        return False
+    modulus = step2 // gcd
+    solution = first[0] + step1 * ((difference // gcd) * pow(step1 // gcd, -1, modulus) % modulus)
+    period = step1 * modulus
+    # smallest solution greater than or equal to low
+    solution += -((solution - low) // period) * period
+    return solution <= high
+
+
+def _range_length(segment: range) -> int:
+    """Returns the length of a range, even when it does not fit in a C ssize_t like len requires."""
+    sign = 1 if segment.step > 0 else -1
+    return max(0, (segment.stop - segment.start + segment.step - sign) // segment.step)
+
+
+class RangeSequence(Sequence):
+    """
+    Sequence of integers stored as a list of range segments, like the result of "1-1000,2000-3000:2". Length, indexing
+    and membership are computed from the segments, so items are only created when they are accessed. Subclasses can
+    store other values as integers by implementing _unpack and _pack.
+    """
+
+    def __init__(self, segments: Iterable[range]):
+        self._segments = [segment for segment in segments if segment]
+        # start index of each segment in the sequence
+        self._offsets = list(accumulate(map(_range_length, self._segments), initial=0))
+        self._single_values: Optional[set] = None
+        self._long_segments: List[range] = []
+
+    def _unpack(self, value: int) -> Any:
+        """Returns the item represented by an integer of a segment."""
+        return value
+
+    def _pack(self, value: Any) -> int:
+        """Returns the integer representing value, a ValueError or a TypeError is raised for an invalid value."""
+        if not isinstance(value, int):
+            raise TypeError(f'{value!r} is not an integer')
+        return value
+
+    @property
+    def segments(self) -> Tuple[range, ...]:
+        return tuple(self._segments)
+
+    def overlaps(self) -> List[Tuple[range, range]]:
+        """Returns the pairs of segments which have common values, in the order of the segments."""
+        segments = self._segments
+        bounds = sorted((min(s[0], s[-1]), max(s[0], s[-1]), index) for index, s in enumerate(segments))
+        pairs = []
+        # segments which can still overlap the next ones, as tuples (high, index)
+        active: List[Tuple[int, int]] = []
+        for low, high, index in bounds:
+            active = [(other_high, other) for other_high, other in active if other_high >= low]
+            for _, other in active:
+                if _ranges_intersect(segments[other], segments[index]):
+                    pairs.append((min(other, index), max(other, index)))
+            active.append((high, index))
+        return [(segments[first], segments[second]) for first, second in sorted(pairs)]
+
+    def __len__(self) -> int:
+        # like for range, an OverflowError is raised when the length is bigger than sys.maxsize
+        return self._offsets[-1]
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self._unpack, chain.from_iterable(self._segments))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._offsets[-1])
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            segments = []
+            for offset, segment in zip(self._offsets, self._segments):
+                segments.append(segment[max(start - offset, 0) : max(stop - offset, 0)])
+            return self._from_segments(segments)
+
+        size = self._offsets[-1]
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f'{type(self).__name__} index out of range')
+        position = bisect_right(self._offsets, index) - 1
+        return self._unpack(self._segments[position][index - self._offsets[position]])
+
+    def _from_segments(self, segments: Iterable[range]) -> 'RangeSequence':
+        """Returns a sequence of the same type with other segments."""
+        sequence = copy(self)
+        RangeSequence.__init__(sequence, segments)
+        return sequence
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            number = self._pack(value)
+        except (ValueError, TypeError):
+            return False
+        if self._single_values is None:
+            # single values are looked up in a set, longer segments with the constant time membership of range
+            self._single_values = {segment[0] for segment in self._segments if _range_length(segment) == 1}
+            self._long_segments = [segment for segment in self._segments if _range_length(segment) > 1]
+        return number in self._single_values or any(number in segment for segment in self._long_segments)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return self._offsets[-1] == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self._segments!r})'
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class ConversionCache:
+    """
+    Thread-safe cache of conversion results bounded to maxsize entries, the least recently used entries are evicted
+    first. It can be shared by many parameter types since keys include the configuration of the type.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if not isinstance(maxsize, int) or maxsize < 1:
+            raise ValueError('maxsize must be a positive integer')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        """Returns a tuple (found, value). Unhashable keys are never found."""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return False, None
+            except TypeError:
+                return False, None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(self, key: Any, value: Any) -> None:
+        """Stores value under key, it does nothing if key is not hashable."""
+        if not isinstance(key, Hashable):
+            return
+        with self._lock:
+            try:
+                self._data[key] = value
+            except TypeError:  # a tuple key can contain unhashable objects
+                return
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Removes all entries and resets hit and miss counters."""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self):
+        # a cache is copied empty, e.g. when a parameter type is sent to a worker process
+        return type(self), (self.maxsize,)
+
+
+class _Failure:
+    """Cached result of a failed conversion."""
+
+    def __init__(self, errors: Any = None):
+        self.errors = errors
+
+
+def _make_cache(cache: Union[int, ConversionCache]) -> ConversionCache:
+    return cache if isinstance(cache, ConversionCache) else ConversionCache(cache)
+
+
+_default_executor: Optional['ProcessPoolExecutor'] = None
+
+
+def _get_default_executor() -> 'ProcessPoolExecutor':
+    """Returns the process pool shared by list types using parallel=True, it is created on first use."""
+    global _default_executor
+    if _default_executor is None:
+        # multiprocessing is only imported when a list type converts items in parallel
+        from concurrent.futures import ProcessPoolExecutor
+
+        _default_executor = ProcessPoolExecutor()
+    return _default_executor
+
+
+class ItemErrors(list):
+    """List of non-compliant items, unchecked is the number of items not converted after the error limit was reached."""
+
+    unchecked = 0
+
+
+def _convert_chunk(list_type: 'ListParamType', items: List[str]) -> Tuple[List[str], List[int], List[Any]]:
+    """
+    Converts a chunk of items in a worker and returns a tuple (errors, positions, converted_items) where positions are
+    the indexes of the non-compliant items in the chunk.
+    """
+    errors = ItemErrors()
+    converted_items = list(list_type._iter_compliant_items(items, errors))
+    # items are converted in order and an item which failed fails again, so each error is the first occurrence of its
+    # value after the previous one
+    positions = []
+    position = -1
+    for item in errors:
+        position = items.index(item, position + 1)
+        positions.append(position)
+    return errors, positions, converted_items
+
+
+class _ConversionTimer:
+    """Counters and a bounded sample of conversion times of a parameter type class or a click parameter."""
+
+    max_samples = 1024
+    percentiles = (50, 90, 99)
+
+    def __init__(self):
+        self.calls = 0
+        self.items = 0
+        self.failures = 0
+        self.total_time = 0.0
+        self.samples: List[float] = []
+
+    def add(self, duration: float, items: int, failed: bool, rng: 'random.Random') -> None:
+        self.calls += 1
+        self.items += items
+        self.failures += failed
+        self.total_time += duration
+        if len(self.samples) < self.max_samples:
+            self.samples.append(duration)
+        else:
+            # reservoir sampling, the samples stay a uniform selection of all the measures
+            index = rng.randrange(self.calls)
+            if index < self.max_samples:
+                self.samples[index] = duration
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {'calls': self.calls, 'items': self.items, 'failures': self.failures, 'total_time': self.total_time}
+        samples = sorted(self.samples)
+        for percentile in self.percentiles:
+            data[f'p{percentile}'] = samples[len(samples) * percentile // 100] if samples else 0.0
+        return data
+
+
+class ConversionStats:
+    """
+    Thread-safe registry of conversion counters and timers, per parameter type class and per click parameter. It is
+    filled while instrumentation is enabled with enable_instrumentation.
+    """
+
+    def __init__(self):
+        # the modules only used by instrumentation are imported when it is enabled, to keep clis fast to start
+        import random
+
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self._types: Dict[str, _ConversionTimer] = {}
+        self._parameters: Dict[str, _ConversionTimer] = {}
+
+    def record(
+        self,
+        param_type: click.ParamType,
+        param: Optional[click.Parameter],
+        ctx: Optional[click.Context],
+        duration: float,
+        items: int,
+        failed: bool,
+    ) -> None:
+        """
+        Records a conversion.
+        :param param_type: the parameter type which converted the value.
+        :param param: the click parameter using the type, None for nested conversions.
+        :param ctx: the click context.
+        :param duration: the conversion time in seconds.
+        :param items: the number of converted items.
+        :param failed: True if the conversion failed.
+        """
+        type_name = type(param_type).__name__
+        param_name = None
+        if param is not None:
+            param_name = f'{ctx.command_path}:{param.name}' if ctx is not None else param.name
+        with self._lock:
+            timer = self._types.get(type_name) or self._types.setdefault(type_name, _ConversionTimer())
+            timer.add(duration, items, failed, self._rng)
+            if param_name is not None:
+                timer = self._parameters.get(param_name) or self._parameters.setdefault(param_name, _ConversionTimer())
+                timer.add(duration, items, failed, self._rng)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Returns the statistics per type class and per parameter, times are in seconds."""
+        with self._lock:
+            return {
+                'types': {name: timer.as_dict() for name, timer in self._types.items()},
+                'parameters': {name: timer.as_dict() for name, timer in self._parameters.items()},
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._types.clear()
+            self._parameters.clear()
+
+    def dump(self, file: Union[None, str, os.PathLike, IO[str]] = None) -> None:
+        """
+        Writes the snapshot as json.
+        :param file: a path or a text file, the standard error by default.
+        """
+        import json
+
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, 'w') as f:
+                json.dump(self.snapshot(), f, indent=2)
+        else:
+            json.dump(self.snapshot(), file or sys.stderr, indent=2)
+
+
+_conversion_stats: Optional[ConversionStats] = None
+_instrumentation_lock = threading.Lock()
+# original methods of the instrumented classes, restored when instrumentation is disabled
+_original_methods: Dict[Tuple[type, str], Callable] = {}
+_exit_hook: Optional[Callable] = None
+# parameter types currently converting a value in each thread
+_active_conversions = threading.local()
+
+
+def _count_converted_items(param_type: click.ParamType, result: Any) -> int:
+    if isinstance(param_type, ListParamType):
+        return len(result) if isinstance(result, Sized) else 0
+    return 1
+
+
+def _count_batch_items(_param_type: click.ParamType, result: Any) -> int:
+    return len(result)
+
+
+def _count_tried_items(_param_type: click.ParamType, result: Tuple[bool, Any]) -> int:
+    return 1 if result[0] else 0
+
+
+def _instrumented(method: Callable, count_items: Callable[[click.ParamType, Any], int]) -> Callable:
+    @wraps(method)
+    def wrapper(self, value, param=None, ctx=None):
+        stats = _conversion_stats
+        stack = _active_conversions.__dict__.setdefault('stack', [])
+        # a method calling the method of its parent class is only measured once
+        if stats is None or (stack and stack[-1] is self):
+            return method(self, value, param, ctx)
+        # nested conversions, like the items of a list, are only recorded for their type
+        record_param = None if stack else param
+        stack.append(self)
+        start = perf_counter()
+        try:
+            result = method(self, value, param, ctx)
+        except click.BadParameter:
+            stats.record(self, record_param, ctx, perf_counter() - start, 0, True)
+            raise
+        finally:
+            stack.pop()
+        items = count_items(self, result)
+        # try_convert reports a failure by returning (False, None) instead of raising an error
+        failed = count_items is _count_tried_items and not items
+        stats.record(self, record_param, ctx, perf_counter() - start, items, failed)
+        return result
+
+    return wrapper
+
+
+def _instrument_class(cls: type) -> None:
+    methods = (
+        ('convert', _count_converted_items),
+        ('convert_many', _count_batch_items),
+        ('try_convert', _count_tried_items),
+    )
+    for name, count_items in methods:
+        method = cls.__dict__.get(name)
+        if method is not None and (cls, name) not in _original_methods:
+            _original_methods[cls, name] = method
+            setattr(cls, name, _instrumented(method, count_items))
+
+
+def enable_instrumentation(exit_hook: Union[bool, str, os.PathLike] = False) -> ConversionStats:
+    """
+    Starts recording the conversions of click-params types and returns the registry of statistics. Conversion methods
+    are wrapped only while instrumentation is enabled, so it costs nothing when disabled.
+    :param exit_hook: if True, the statistics are written as json to the standard error when the program exits. It can
+    also be the path of the json file to write.
+    """
+    global _conversion_stats, _exit_hook
+    import atexit
+
+    # imported here to avoid a circular import
+    from .miscellaneous import JsonParamType
+
+    with _instrumentation_lock:
+        if _conversion_stats is None:
+            _conversion_stats = ConversionStats()
+            classes = [CustomParamType, JsonParamType]
+            while classes:
+                cls = classes.pop()
+                _instrument_class(cls)
+                classes.extend(cls.__subclasses__())
+        if exit_hook:
+            if _exit_hook is not None:
+                atexit.unregister(_exit_hook)
+            _exit_hook = partial(_conversion_stats.dump, None if exit_hook is True else exit_hook)
+            atexit.register(_exit_hook)
+        return _conversion_stats
+
+
+def disable_instrumentation() -> None:
+    """Stops recording conversions, restores the conversion methods and removes the exit hook."""
+    global _conversion_stats, _exit_hook
+    with _instrumentation_lock:
+        for (cls, name), method in _original_methods.items():
+            setattr(cls, name, method)
+        _original_methods.clear()
+        if _exit_hook is not None:
+            import atexit
+
+            atexit.unregister(_exit_hook)
+            _exit_hook = None
+        _conversion_stats = None
+
+
+def _try_convert(param_type: click.ParamType, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+    """Calls the try_convert method of param_type, or its convert method for click types which do not have one."""
+    try_convert = getattr(param_type, 'try_convert', None)
+    if try_convert is not None:
+        return try_convert(value, param, ctx)
+    try:
+        return True, param_type.convert(value, param, ctx)
+    except click.BadParameter:
+        return False, None
+
+
+def _convert_each(param_type: click.ParamType, values: Iterable[Any], param, ctx) -> Tuple[List[Any], List[Any]]:
+    """Converts values one by one with param_type and returns a tuple (errors, converted_values)."""
+    errors = []
+    converted_values = []
+    for value in values:
+        converted, result = _try_convert(param_type, value, param, ctx)
+        if converted:
+            converted_values.append(result)
+        else:
+            errors.append(value)
+    return errors, converted_values
+
+
+def _invalid_values_message(name: Optional[str], errors: List[Any]) -> str:
+    return f'Invalid {name} values: {errors}'
+
 
 class CustomParamType(click.ParamType):
     # in click 8, name does not exist, it is just a type annotation, so to not break code, I need this hack
     name: Optional[str] = None
+    # pattern matched by every string the type can convert, FirstOf(adaptive=True) skips the type for other strings,
+    # so subclasses accepting more strings must widen or reset it
+    _shape: Optional[Pattern[str]] = None
+    # cheap key used by list types to sort converted values, None if values are sorted by themselves
+    _sort_key: Optional[Callable[[Any], Any]] = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # types defined while instrumentation is enabled are instrumented too
+        if _conversion_stats is not None:
+            _instrument_class(cls)
+
+    def _cache_key(self) -> Any:
+        """Returns a hashable object representing the configuration of the type, by default the instance itself."""
+        return self
+
+    def try_convert(self, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+        """
+        Converts value without raising an error if it is invalid, it returns a tuple (True, converted_value) or
+        (False, None). Types implement it without building the error message of convert.
+        :param value: the value to convert.
+        :param param: the click parameter using this type.
+        :param ctx: the click context.
+        """
+        try:
+            return True, self.convert(value, param, ctx)
+        except click.BadParameter:
+            return False, None
+
+    def convert_many(self, values: Iterable[Any], param=None, ctx=None) -> List[Any]:
+        """
+        Converts a batch of values, like the ones of an option with multiple=True or an argument with nargs=-1, and
+        fails once with all the invalid values instead of failing on the first one.
+        :param values: the values to convert.
+        :param param: the click parameter using this type.
+        :param ctx: the click context.
+        """
+        errors, converted_values = _convert_each(self, values, param, ctx)
+        if errors:
+            self.fail(_invalid_values_message(self.name, errors), param, ctx)
+        return converted_values
+
+
+class _CachedParamType(CustomParamType):
+    """Base class of the parameter types looking their conversion results up in a ConversionCache when it is enabled."""
 
+    _cache: Optional[ConversionCache] = None
 
-class BaseParamType(CustomParamType):
+    @property
+    def cache(self) -> Optional[ConversionCache]:
+        """The conversion cache of this type or None if caching is disabled."""
+        return self._cache
+
+    def enable_cache(self, cache: Union[int, ConversionCache] = 1024) -> ConversionCache:
+        """
+        Caches conversion results, valid and invalid, so that values already seen are not converted again.
+        :param cache: maximum size of the new cache or an existing cache to share.
+        """
+        self._cache = _make_cache(cache)
+        return self._cache
+
+    def disable_cache(self) -> None:
+        self._cache = None
+
+
+class BaseParamType(_CachedParamType):
     def __init__(self, _type: Any, errors: Union[Error, Tuple[Error]], name: Optional[str] = None):
         self._type = _type
         self._errors = errors
         self._name = name or self.name
         self._error_message = '{value} is not a valid %s' % self._name
 
-    def convert(self, value, param, ctx):
+    def _cache_key(self) -> Any:
+        return type(self), self._type, self._errors
+
+    def _try_convert(self, value: Any) -> Tuple[bool, Any]:
+        cache = self._cache
+        if cache is not None:
+            key = (self._cache_key(), value)
+            found, result = cache.get(key)
+            if found:
+                return (False, None) if isinstance(result, _Failure) else (True, result)
         try:
-            return self._type(value)
+            result = self._type(value)
         except self._errors:
+            if cache is not None:
+                cache.put(key, _Failure())
+            return False, None
+        if cache is not None:
+            cache.put(key, result)
+        return True, result
+
+    def convert(self, value, param, ctx):
+        converted, result = self._try_convert(value)
+        if not converted:
             self.fail(self._error_message.format(value=value), param, ctx)
+        return result
+
+    def try_convert(self, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+        # subclasses overriding convert may reject other values
+        if type(self).convert is not BaseParamType.convert:
+            return super().try_convert(value, param, ctx)
+        return self._try_convert(value)
+
+    def convert_many(self, values: Iterable[Any], param=None, ctx=None) -> List[Any]:
+        # subclasses overriding convert are converted value by value
+        if self._cache is not None or type(self).convert is not BaseParamType.convert:
+            return super().convert_many(values, param, ctx)
+        # no BadParameter error is created for each invalid value
+        _type, type_errors = self._type, self._errors
+        errors = []
+        converted_values = []
+        for value in values:
+            try:
+                converted_values.append(_type(value))
+            except type_errors:
+                errors.append(value)
+        if errors:
+            self.fail(_invalid_values_message(self.name, errors), param, ctx)
+        return converted_values
 
     def __repr__(self):
         return self.name.upper()
 
 
-class ValidatorParamType(CustomParamType):
+class ValidatorParamType(_CachedParamType):
     """This class is intended to inherit by classes using validators functions."""
 
     def __init__(self, callback: Callable, name: Optional[str] = None):
@@ -36,11 +741,43 @@ class ValidatorParamType(CustomParamType):
         self._name = name or self.name
         self._error_message = '{value} is not a valid %s' % self._name
 
+    def _cache_key(self) -> Any:
+        callback = self._callback
+        if isinstance(callback, partial):
+            return type(self), callback.func, callback.args, tuple(sorted(callback.keywords.items()))
+        return type(self), callback
+
+    def _is_valid(self, value: Any) -> bool:
+        cache = self._cache
+        if cache is None:
+            return bool(self._callback(value))
+        key = (self._cache_key(), value)
+        found, is_valid = cache.get(key)
+        if not found:
+            is_valid = bool(self._callback(value))
+            cache.put(key, is_valid)
+        return is_valid
+
     def convert(self, value, param, ctx):
-        if not self._callback(value):
+        if not self._is_valid(value):
             self.fail(self._error_message.format(value=value), param, ctx)
         return value
 
+    def try_convert(self, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+        if type(self).convert is not ValidatorParamType.convert:
+            return super().try_convert(value, param, ctx)
+        return (True, value) if self._is_valid(value) else (False, None)
+
+    def convert_many(self, values: Iterable[Any], param=None, ctx=None) -> List[Any]:
+        if self._cache is not None or type(self).convert is not ValidatorParamType.convert:
+            return super().convert_many(values, param, ctx)
+        values = list(values)
+        callback = self._callback
+        errors = [value for value in values if not callback(value)]
+        if errors:
+            self.fail(_invalid_values_message(self.name, errors), param, ctx)
+        return values
+
     def __repr__(self):
         return self.name.upper()
 
@@ -51,6 +788,9 @@ class RangeParamType(CustomParamType):
         self._maximum = maximum
         self._clamp = clamp
         self._param_type = param_type
+        # the range only accepts values of the wrapped type
+        self._shape = getattr(param_type, '_shape', None)
+        self._sort_key = getattr(param_type, '_sort_key', None)
 
     def convert(self, value, param, ctx):
         converted_value = self._param_type.convert(value, param, ctx)
@@ -74,6 +814,52 @@ class RangeParamType(CustomParamType):
                 )
         return converted_value
 
+    def try_convert(self, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+        if type(self).convert is not RangeParamType.convert:
+            return super().try_convert(value, param, ctx)
+        converted, converted_value = _try_convert(self._param_type, value, param, ctx)
+        if not converted:
+            return False, None
+        if self._minimum is not None and converted_value < self._minimum:
+            return (True, self._minimum) if self._clamp else (False, None)
+        if self._maximum is not None and converted_value > self._maximum:
+            return (True, self._maximum) if self._clamp else (False, None)
+        return True, converted_value
+
+    def convert_many(self, values: Iterable[Any], param=None, ctx=None) -> List[Any]:
+        if type(self).convert is not RangeParamType.convert:
+            return super().convert_many(values, param, ctx)
+        param_type = self._param_type
+        if isinstance(param_type, CustomParamType):
+            converted_values = list(param_type.convert_many(values, param, ctx))
+        else:
+            errors, converted_values = _convert_each(param_type, values, param, ctx)
+            if errors:
+                self.fail(_invalid_values_message(param_type.name, errors), param, ctx)
+
+        minimum, maximum, clamp = self._minimum, self._maximum, self._clamp
+        errors = []
+        for index, converted_value in enumerate(converted_values):
+            if minimum is not None and converted_value < minimum:
+                if not clamp:
+                    errors.append(str(converted_value))
+                converted_values[index] = minimum
+            elif maximum is not None and converted_value > maximum:
+                if not clamp:
+                    errors.append(str(converted_value))
+                converted_values[index] = maximum
+
+        if errors:
+            self.fail(self._format_range_errors(errors), param, ctx)
+        return converted_values
+
+    def _format_range_errors(self, errors: List[str]) -> str:
+        if self._minimum is None:
+            return f'These values are bigger than the maximum valid value {self._maximum}: {errors}'
+        if self._maximum is None:
+            return f'These values are smaller than the minimum valid value {self._minimum}: {errors}'
+        return f'These values are not in the valid range of {self._minimum} to {self._maximum}: {errors}'
+
     def __repr__(self):
         parts = self.name.split(' ')
         titles = [part.title() for part in parts]
@@ -81,17 +867,76 @@ class RangeParamType(CustomParamType):
         return f'{new_name}({self._minimum!r}, {self._maximum!r})'
 
 
-class ListParamType(CustomParamType):
+class ListParamType(_CachedParamType):
     def __init__(
-        self, param_type: click.ParamType, separator: str = ',', name: Optional[str] = None, ignore_empty: bool = False
+        self,
+        param_type: click.ParamType,
+        separator: str = ',',
+        name: Optional[str] = None,
+        ignore_empty: bool = False,
+        stream: bool = False,
+        file_source: bool = False,
+        parallel: Union[bool, 'Executor'] = False,
+        parallel_threshold: int = 10_000,
+        chunk_size: int = 2_000,
+        fail_fast: bool = False,
+        max_errors: Optional[int] = None,
+        unique: bool = False,
+        sort: Union[bool, Callable[[Any], Any]] = False,
+        on_duplicates: Optional[Callable[[Counter], None]] = None,
     ):
         if not isinstance(separator, str):
             raise TypeError('separator must be a string')
+        if max_errors is not None and (not isinstance(max_errors, int) or max_errors < 1):
+            raise ValueError('max_errors must be a positive integer')
+        if sort and stream:
+            raise ValueError('sort cannot be used in stream mode')
+        if on_duplicates is not None and not unique:
+            raise ValueError('on_duplicates can only be used with unique')
         self._separator = separator
         self._name = name or self.name
         self._param_type = param_type
         self._error_message = 'These items are not %s: {errors}' % self._name
         self._ignore_empty = ignore_empty
+        self._stream = stream
+        self._file_source = file_source
+        self._parallel = parallel
+        self._parallel_threshold = parallel_threshold
+        self._chunk_size = chunk_size
+        self._max_errors = 1 if fail_fast else max_errors
+        self._unique = unique
+        self._sort = sort
+        self._on_duplicates = on_duplicates
+        self._item_cache: Optional[ConversionCache] = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # executors cannot be pickled, and a copy sent to a worker must not convert items in parallel again nor arrange
+        # them since the parent process does it, so a sort key or on_duplicates callback does not have to be picklable
+        state.update(_parallel=False, _unique=False, _sort=False, _on_duplicates=None)
+        return state
+
+    @property
+    def item_cache(self) -> Optional[ConversionCache]:
+        """The cache of converted items or None if it is disabled."""
+        return self._item_cache
+
+    def enable_cache(
+        self, cache: Union[int, ConversionCache] = 1024, item_cache: Union[None, int, ConversionCache] = None
+    ) -> ConversionCache:
+        """
+        Caches the results of whole expressions and optionally of each item. The expression cache is not used in stream
+        mode and for file sources.
+        :param cache: maximum size of the expression cache or an existing cache to share.
+        :param item_cache: maximum size of the item cache or an existing cache to share. Items are not cached if it is
+        None.
+        """
+        self._item_cache = None if item_cache is None else _make_cache(item_cache)
+        return super().enable_cache(cache)
+
+    def disable_cache(self) -> None:
+        super().disable_cache()
+        self._item_cache = None
 
     def _strip_separator(self, expression: str) -> str:
         """Returns a new expression with heading and trailing separator character removed."""
@@ -103,28 +948,258 @@ class ListParamType(CustomParamType):
         and converted_items is the list of converted expression items.
         :param expression: a string expression to convert to a list.
         """
-        errors = []
-        converted_items = []
-        for item in expression.split(self._separator):
-            try:
-                converted_items.append(self._param_type.convert(item, None, None))
-            except click.BadParameter:
-                errors.append(item)
+        return self._convert_items_to_list(expression.split(self._separator))
+
+    def _convert_items_to_list(self, items: Iterable[str]) -> Tuple[List[str], Any]:
+        """
+        Converts items and returns a tuple (errors, converted_items) like _convert_expression_to_list.
+        :param items: the raw items to convert.
+        """
+        if self._parallel and isinstance(items, list) and len(items) >= self._parallel_threshold:
+            return self._convert_items_in_parallel(items)
+        errors = ItemErrors()
+        converted_items = self._build_result(self._arrange_items(self._iter_compliant_items(items, errors)))
         return errors, converted_items
 
+    def _convert_items_in_parallel(self, items: List[str]) -> Tuple[List[str], Any]:
+        """
+        Converts items in chunks with the executor given by the parallel option. Errors and converted items are in the
+        same order as in the serial conversion.
+        :param items: the raw items to convert.
+        """
+        executor = _get_default_executor() if self._parallel is True else self._parallel
+        chunks = [items[i : i + self._chunk_size] for i in range(0, len(items), self._chunk_size)]
+        errors = ItemErrors()
+        converted_chunks = []
+        results = executor.map(_convert_chunk, [self] * len(chunks), chunks)
+        for index, (chunk_errors, positions, converted_chunk) in enumerate(results):
+            if self._max_errors is not None and len(errors) + len(chunk_errors) >= self._max_errors:
+                # the items of the chunk after the last error kept are counted as unchecked like in a serial conversion
+                kept = self._max_errors - len(errors)
+                errors.extend(chunk_errors[:kept])
+                converted_chunks.append(converted_chunk)
+                remaining = len(chunks[index]) - positions[kept - 1] - 1
+                errors.unchecked = remaining + sum(len(chunk) for chunk in chunks[index + 1 :])
+                break
+            errors.extend(chunk_errors)
+            converted_chunks.append(converted_chunk)
+        return errors, self._build_result(self._arrange_items(chain.from_iterable(converted_chunks)))
+
+    def _item_sort_key(self) -> Optional[Callable[[Any], Any]]:
+        """Returns the key used to sort items with sort=True, by default the one of the item type if it has one."""
+        return getattr(self._param_type, '_sort_key', None)
+
+    def _arrange_items(self, converted_items: Iterable[Any]) -> Iterable[Any]:
+        """
+        Removes duplicate items and sorts items when the unique and sort options are set. Items are still consumed
+        lazily when they are not sorted.
+        :param converted_items: an iterable of converted items.
+        """
+        if self._unique:
+            converted_items = self._iter_unique_items(converted_items)
+        if self._sort:
+            key = self._sort if callable(self._sort) else self._item_sort_key()
+            converted_items = sorted(converted_items, key=key)
+        return converted_items
+
+    def _iter_unique_items(self, converted_items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Yields the first occurrence of each item, in order. Duplicates are counted for the on_duplicates callback,
+        which is called once all items are consumed.
+        :param converted_items: an iterable of converted items.
+        """
+        seen = set()
+        # unhashable items, like json objects, are compared one by one
+        seen_unhashable = []
+        duplicates = Counter()
+        for item in converted_items:
+            try:
+                is_new = item not in seen
+                if is_new:
+                    seen.add(item)
+                key = item
+            except TypeError:
+                is_new = item not in seen_unhashable
+                if is_new:
+                    seen_unhashable.append(item)
+                key = repr(item)
+            if is_new:
+                yield item
+            else:
+                duplicates[key] += 1
+        if self._on_duplicates is not None:
+            self._on_duplicates(duplicates)
+
+    def _iter_compliant_items(self, items: Iterable[str], errors: ItemErrors) -> Iterator[Any]:
+        """
+        Yields the converted compliant items and appends the non-compliant ones to errors. When the error limit is
+        reached, the remaining items are only counted.
+        :param items: the raw items to convert.
+        :param errors: list where non-compliant items are stored.
+        """
+        items = iter(items)
+        item_converter = self._item_converter()
+        for item in items:
+            if item_converter is None:
+                converted, result = self._try_convert_item(item)
+            else:
+                convert_item, item_errors = item_converter
+                try:
+                    result = convert_item(item)
+                    converted = True
+                except item_errors:
+                    converted = False
+            if converted:
+                yield result
+                continue
+            errors.append(item)
+            if self._max_errors is not None and len(errors) >= self._max_errors:
+                errors.unchecked = sum(1 for _ in items)
+                return
+
+    def _item_converter(self) -> Optional[Tuple[Callable[[str], Any], Union[Error, Tuple[Error]]]]:
+        """
+        Returns the function converting items and the errors it raises when items of a BaseParamType can be converted
+        without calling its methods, like in BaseParamType.convert_many, otherwise None.
+        """
+        param_type = self._param_type
+        if (
+            self._item_cache is not None
+            or _conversion_stats is not None
+            or not isinstance(param_type, BaseParamType)
+            or param_type._cache is not None
+            or type(param_type).convert is not BaseParamType.convert
+            or type(param_type).try_convert is not BaseParamType.try_convert
+        ):
+            return None
+        return param_type._type, param_type._errors
+
+    def _try_convert_item(self, item: str) -> Tuple[bool, Any]:
+        """Converts one item of the list and returns a tuple (True, converted_item) or (False, None)."""
+        cache = self._item_cache
+        if cache is None:
+            return _try_convert(self._param_type, item)
+
+        param_type = self._param_type
+        key = (param_type._cache_key() if isinstance(param_type, CustomParamType) else param_type, item)
+        found, result = cache.get(key)
+        if found:
+            return (False, None) if isinstance(result, _Failure) else (True, result)
+        converted, result = _try_convert(param_type, item)
+        cache.put(key, result if converted else _Failure())
+        return converted, result
+
+    def _build_result(self, converted_items: Iterable[Any]) -> Any:
+        """
+        Returns the value of the parameter from its converted items. Subclasses can override it to return another
+        container than a list, it is not used in stream mode.
+        :param converted_items: an iterable of converted items.
+        """
+        return list(converted_items)
+
+    def _iter_expression(self, expression: str) -> Iterator[str]:
+        """
+        Yields the items of expression one by one, unlike str.split, the list of all items is never built.
+        :param expression: a string expression to split.
+        """
+        separator = self._separator
+        if not separator:
+            raise ValueError('empty separator')
+        start = 0
+        while True:
+            end = expression.find(separator, start)
+            if end == -1:
+                yield expression[start:]
+                return
+            yield expression[start:end]
+            start = end + len(separator)
+
+    def _iter_file_items(self, path: str, param, ctx) -> Iterator[str]:
+        """
+        Yields the items of a file (or of the standard input if path is "-"), they are delimited by the separator or by
+        newlines. Leading and trailing empty items are skipped like _strip_separator does for a string expression.
+        :param path: path of the file to read.
+        """
+        delimiters = re.compile(re.escape(self._separator.encode()) + rb'|\r?\n')
+        empty_items = 0
+        found_items = False
+        rest = b''
+        try:
+            for chunk in iter_file_chunks(path):
+                *parts, rest = delimiters.split(rest + chunk)
+                for part in parts:
+                    if not part:
+                        empty_items += found_items
+                        continue
+                    yield from [''] * empty_items
+                    empty_items = 0
+                    found_items = True
+                    yield part.decode()
+            if rest:
+                yield from [''] * empty_items
+                yield rest.decode()
+            elif not found_items and not self._ignore_empty:
+                # like an empty string expression, an empty file gives one empty item
+                yield ''
+        except OSError as e:
+            self.fail(f'unable to read {path}: {e.strerror}', param, ctx)
+        except UnicodeDecodeError:
+            self.fail(f'{path} is not a valid utf-8 file', param, ctx)
+
+    def _iter_converted_items(self, items: Iterable[str], param, ctx) -> Iterator[Any]:
+        """
+        Converts and yields items one by one. A BadParameter error is raised on the first non-compliant item.
+        :param items: the raw items to convert.
+        """
+        for item in items:
+            converted, converted_item = self._try_convert_item(item)
+            if not converted:
+                self.fail(self._error_message.format(errors=[item]), param, ctx)
+            yield converted_item
+
     def convert(self, value, param, ctx):
-        # if a value is already converted, we returned it
-        if isinstance(value, list):
+        # if a value is already converted (a list or any other container returned by this method), we returned it
+        if not isinstance(value, str):
             return value
 
-        if self._ignore_empty and value == '':
-            return []
-        value = self._strip_separator(value)
-        errors, converted_list = self._convert_expression_to_list(value)
+        if self._file_source and value.startswith('@'):
+            items = self._iter_file_items(value[1:], param, ctx)
+            if self._stream:
+                return self._arrange_items(self._iter_converted_items(items, param, ctx))
+            errors, converted_list = self._convert_items_to_list(items)
+        else:
+            if self._ignore_empty and value == '':
+                return iter(()) if self._stream else self._build_result(())
+            value = self._strip_separator(value)
+            if self._stream:
+                return self._arrange_items(self._iter_converted_items(self._iter_expression(value), param, ctx))
+            if self._cache is not None:
+                return self._convert_expression_with_cache(value, param, ctx)
+            errors, converted_list = self._convert_expression_to_list(value)
         if errors:
-            self.fail(self._error_message.format(errors=errors), param, ctx)
+            self.fail(self._format_errors(errors), param, ctx)
 
         return converted_list
 
+    def _format_errors(self, errors: List[str]) -> str:
+        message = self._error_message.format(errors=list(errors))
+        unchecked = getattr(errors, 'unchecked', 0)
+        if unchecked:
+            items = 'item was' if unchecked == 1 else 'items were'
+            message += f' (validation stopped, {unchecked} remaining {items} not checked)'
+        return message
+
+    def _convert_expression_with_cache(self, expression: str, param, ctx) -> Any:
+        key = (self._cache_key(), expression)
+        found, result = self._cache.get(key)
+        if not found:
+            errors, converted_list = self._convert_expression_to_list(expression)
+            result = _Failure(errors) if errors else converted_list
+            self._cache.put(key, result)
+        if isinstance(result, _Failure):
+            self.fail(self._format_errors(result.errors), param, ctx)
+        # a copy is returned so that the cached value is not altered if the caller modifies its list
+        return copy(result)
+
     def __repr__(self):
         return self.name.upper()
@@ -1,28 +1,40 @@
 """Domain parameter types."""
+import re
 from functools import partial
 
 from deprecated import deprecated
-from validators import domain, email, slug, url
+from validators import email, url
 
+from . import _validators
 from .base import ListParamType, ValidatorParamType
 
+# domain names have a dot, non-ascii names may have an ideographic dot the idna codec turns into a dot
+_DOMAIN_SHAPE = re.compile(r'.*[.\u0080-\U0010ffff]', re.DOTALL)
+# urls need a scheme and a network location
+_URL_SHAPE = re.compile(r'[^:]*://')
+_EMAIL_SHAPE = re.compile(r'[^@]*@')
+_SLUG_SHAPE = re.compile(r'[a-z0-9]')
+
 
 class DomainParamType(ValidatorParamType):
     name = 'domain name'
+    _shape = _DOMAIN_SHAPE
+    _sort_key = staticmethod(str.casefold)
 
     def __init__(self):
-        super().__init__(callback=domain)
+        super().__init__(callback=_validators.domain)
 
 
 class DomainListParamType(ListParamType):
     name = 'domain name list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(DOMAIN, separator=separator, name='domain names', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(DOMAIN, separator=separator, name='domain names', ignore_empty=ignore_empty, **kwargs)
 
 
 class UrlParamType(ValidatorParamType):
     name = 'url'
+    _shape = _URL_SHAPE
 
     def __init__(
         self,
@@ -49,8 +61,8 @@ class UrlParamType(ValidatorParamType):
 class UrlListParamType(ListParamType):
     name = 'url list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(URL, separator=separator, name='urls', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(URL, separator=separator, name='urls', ignore_empty=ignore_empty, **kwargs)
 
 
 @deprecated(
@@ -61,12 +73,14 @@ class UrlListParamType(ListParamType):
 class PublicUrlListParamType(ListParamType):
     name = 'url list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(PUBLIC_URL, separator=separator, name='urls', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(PUBLIC_URL, separator=separator, name='urls', ignore_empty=ignore_empty, **kwargs)
 
 
 class EmailParamType(ValidatorParamType):
     name = 'email address'
+    _shape = _EMAIL_SHAPE
+    _sort_key = staticmethod(str.casefold)
 
     def __init__(
         self,
@@ -76,37 +90,38 @@ class EmailParamType(ValidatorParamType):
         rfc_1034: bool = False,
         rfc_2782: bool = False,
     ):
-        super().__init__(
-            callback=partial(
-                email,
-                ipv6_address=ipv6_address,
-                ipv4_address=ipv4_address,
-                simple_host=simple_host,
-                rfc_1034=rfc_1034,
-                rfc_2782=rfc_2782,
-            )
-        )
+        options = {
+            'ipv6_address': ipv6_address,
+            'ipv4_address': ipv4_address,
+            'simple_host': simple_host,
+            'rfc_1034': rfc_1034,
+            'rfc_2782': rfc_2782,
+        }
+        # the fast validator only covers the default options
+        callback = partial(email, **options) if any(options.values()) else _validators.email
+        super().__init__(callback=callback)
 
 
 class EmailListParamType(ListParamType):
     name = 'email address list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(EMAIL, separator=separator, name='email addresses', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(EMAIL, separator=separator, name='email addresses', ignore_empty=ignore_empty, **kwargs)
 
 
 class SlugParamType(ValidatorParamType):
     name = 'slug'
+    _shape = _SLUG_SHAPE
 
     def __init__(self):
-        super().__init__(callback=slug)
+        super().__init__(callback=_validators.slug)
 
 
 class SlugListParamType(ListParamType):
     name = 'slug list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(SLUG, separator=separator, name='slugs', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(SLUG, separator=separator, name='slugs', ignore_empty=ignore_empty, **kwargs)
 
 
 DOMAIN = DomainParamType()
@@ -1,12 +1,64 @@
 """Parameter types that do not fit into other modules"""
+import codecs
 import json
+import re
+import uuid
+from datetime import datetime
+from itertools import chain
+from operator import attrgetter
 from textwrap import indent
-from typing import Any, Callable, List, Optional, Sequence, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Pattern, Sequence, Tuple, Type, Union
 
 import click
-from validators import mac_address
 
-from .base import CustomParamType, ListParamType, ValidatorParamType
+from . import _validators
+from .base import CustomParamType, ListParamType, PackedSequence, ValidatorParamType, _try_convert, iter_file_chunks
+
+JsonErrors = Union[Type[Exception], Tuple[Type[Exception], ...]]
+
+
+# translation table replacing digits by "0", decimal points and exponents by "." and other characters by spaces
+_NUMBER_CHARACTERS = bytes(
+    ord('0') if byte in b'0123456789' else ord('.') if byte in b'.eE' else ord(' ') for byte in range(256)
+)
+# 64-bit integers have at most 20 digits
+_LONG_INTEGER = b'0' * 19
+
+
+def _may_have_long_integer(value: str) -> bool:
+    """Returns True if value may contain a json integer of 19 digits or more, false positives are possible."""
+    try:
+        numbers = value.encode().translate(_NUMBER_CHARACTERS)
+    except UnicodeEncodeError:
+        return True
+    return numbers.startswith(_LONG_INTEGER) or b' ' + _LONG_INTEGER in numbers
+
+
+def _orjson_backend() -> Tuple[Callable[[str], Any], JsonErrors]:
+    import orjson
+
+    def loads(value: str) -> Any:
+        # orjson converts integers which do not fit in 64 bits to floats, json.loads keeps them exact
+        if not isinstance(value, str) or _may_have_long_integer(value):
+            return json.loads(value)
+        return orjson.loads(value)
+
+    return loads, orjson.JSONDecodeError
+
+
+# json decoders used instead of json.loads, the first available one is picked by default. Each factory returns a tuple
+# (loads, errors) and raises ImportError if its library is not installed.
+_JSON_BACKENDS: Dict[str, Callable[[], Tuple[Callable[[str], Any], JsonErrors]]] = {'orjson': _orjson_backend}
+
+
+def register_json_backend(name: str, loads: Callable[[str], Any], errors: JsonErrors = ValueError) -> None:
+    """
+    Registers a json decoder which can be selected with the backend parameter of JsonParamType.
+    :param name: the name of the backend.
+    :param loads: a function decoding a json string.
+    :param errors: the exception classes raised by loads for invalid documents.
+    """
+    _JSON_BACKENDS[name] = lambda: (loads, errors)
 
 
 class JsonParamType(click.ParamType):
@@ -20,6 +72,7 @@ class JsonParamType(click.ParamType):
         parse_int: Optional[Callable] = None,
         parse_constant: Optional[Callable] = None,
         object_pairs_hook: Optional[Callable] = None,
+        backend: Optional[str] = None,
         **kwargs,
     ):
         self._cls = cls
@@ -29,74 +82,535 @@ class JsonParamType(click.ParamType):
         self._parse_constant = parse_constant
         self._object_pairs_hook = object_pairs_hook
         self._kwargs = kwargs
+        self._loads: Optional[Callable[[str], Any]] = None
+        self._backend_errors: JsonErrors = ()
+        # by default the backend is selected on the first decoding, so that importing this module does not import it
+        self._backend = None if backend is None else self._select_backend(backend)
+
+    @property
+    def backend(self) -> str:
+        """The name of the json decoder used, the first available fast decoder unless one was given."""
+        if self._backend is None:
+            self._backend = self._select_backend(None)
+        return self._backend
+
+    def _select_backend(self, backend: Optional[str]) -> str:
+        """Sets the decoder of the backend and returns its name, fast decoders cannot honour json.loads options."""
+        if backend is not None and backend != 'json' and backend not in _JSON_BACKENDS:
+            raise ValueError(f'unknown json backend: {backend}')
+        options = (
+            self._cls,
+            self._object_hook,
+            self._parse_float,
+            self._parse_int,
+            self._parse_constant,
+            self._object_pairs_hook,
+        )
+        if backend == 'json' or self._kwargs or any(option is not None for option in options):
+            return 'json'
+        for name in _JSON_BACKENDS if backend is None else [backend]:
+            try:
+                self._loads, self._backend_errors = _JSON_BACKENDS[name]()
+            except ImportError:
+                if backend is not None:
+                    raise ValueError(f'json backend {backend} is not installed') from None
+                continue
+            return name
+        return 'json'
+
+    def _decode(self, value: str) -> Any:
+        """Decodes value, a json.JSONDecodeError is raised if it is not a valid json document."""
+        if self._backend is None:
+            self._backend = self._select_backend(None)
+        if self._loads is not None:
+            try:
+                return self._loads(value)
+            except self._backend_errors:
+                # json.loads decides, it accepts a few documents that fast decoders reject, like NaN or big integers
+                pass
+        return json.loads(
+            value,
+            cls=self._cls,
+            object_hook=self._object_hook,
+            parse_float=self._parse_float,
+            parse_int=self._parse_int,
+            parse_constant=self._parse_constant,
+            object_pairs_hook=self._object_pairs_hook,
+            **self._kwargs,
+        )
 
     def convert(self, value, param, ctx):
         try:
-            return json.loads(
-                value,
-                cls=self._cls,
-                object_hook=self._object_hook,
-                parse_float=self._parse_float,
-                parse_int=self._parse_int,
-                parse_constant=self._parse_constant,
-                object_pairs_hook=self._object_pairs_hook,
-                **self._kwargs,
-            )
+            return self._decode(value)
         except json.JSONDecodeError:
             self.fail(f'{value} is not a valid json string', param, ctx)
 
+    def try_convert(self, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+        """
+        Decodes value without raising an error if it is invalid, it returns a tuple (True, document) or (False, None).
+        :param value: the value to decode.
+        :param param: the click parameter using this type.
+        :param ctx: the click context.
+        """
+        if type(self).convert is not JsonParamType.convert:
+            try:
+                return True, self.convert(value, param, ctx)
+            except click.BadParameter:
+                return False, None
+        try:
+            return True, self._decode(value)
+        except json.JSONDecodeError:
+            return False, None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        # the decoder of a backend may be a closure which cannot be pickled, it is selected again when unpickled
+        state.update(_loads=None, _backend_errors=())
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._backend not in (None, 'json'):
+            try:
+                self._loads, self._backend_errors = _JSON_BACKENDS[self._backend]()
+            except (KeyError, ImportError):
+                # json.loads gives the same results, a worker process may not have the backend
+                self._backend = 'json'
+
+    def __repr__(self):
+        return self.name.upper()
+
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_LONGEST_JSON_LITERAL = len('-Infinity')
+
+
+class JsonLinesParamType(CustomParamType):
+    """
+    Decodes newline-delimited or concatenated json documents and returns an iterator of the decoded records. Records
+    are decoded on demand, so only the record being decoded is kept in memory.
+    """
+
+    name = 'json lines'
+
+    def __init__(
+        self,
+        cls: Optional[Callable] = None,
+        object_hook: Optional[Callable] = None,
+        parse_float: Optional[Callable] = None,
+        parse_int: Optional[Callable] = None,
+        parse_constant: Optional[Callable] = None,
+        object_pairs_hook: Optional[Callable] = None,
+        file_source: bool = False,
+        **kwargs,
+    ):
+        hooks = {
+            'object_hook': object_hook,
+            'parse_float': parse_float,
+            'parse_int': parse_int,
+            'parse_constant': parse_constant,
+            'object_pairs_hook': object_pairs_hook,
+        }
+        # like json.loads, only the given arguments are passed to the decoder class
+        self._decoder = (cls or json.JSONDecoder)(
+            **{key: hook for key, hook in hooks.items() if hook is not None}, **kwargs
+        )
+        self._file_source = file_source
+
+    def _iter_file_text(self, path: str, param, ctx) -> Iterator[str]:
+        """
+        Yields the content of a utf-8 file (or of the standard input if path is "-") in chunks of text.
+        :param path: path of the file to read.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            for chunk in iter_file_chunks(path):
+                yield decoder.decode(chunk)
+            yield decoder.decode(b'', final=True)
+        except OSError as e:
+            self.fail(f'unable to read {path}: {e.strerror}', param, ctx)
+        except UnicodeDecodeError:
+            self.fail(f'{path} is not a valid utf-8 file', param, ctx)
+
+    def _iter_records(self, chunks: Iterable[str], param, ctx) -> Iterator[Any]:
+        """
+        Decodes the json documents of chunks of text. The text read is cut after its last newline, and the documents of
+        the complete lines are decoded. Text without newline, like concatenated documents, is decoded as a whole and
+        only its trailing incomplete document is kept. An incomplete document is decoded again once the text read after
+        it is as long as itself, so that long documents are decoded in linear time.
+        :param chunks: the text to decode.
+        """
+        decoder = self._decoder
+        buffer = ''
+        # text read but not decoded yet, it is kept in a list so that a long document is not copied for each chunk
+        pending: List[str] = []
+        pending_size = 0
+        # line number and offset of the beginning of the buffer in the whole text
+        line = 1
+        offset = 0
+        for chunk in chain(chunks, [None]):
+            is_last = chunk is None
+            if not is_last:
+                pending.append(chunk)
+                pending_size += len(chunk)
+                if pending_size < len(buffer):
+                    continue
+            text = ''.join(pending)
+            cut = 0 if is_last else text.rfind('\n') + 1
+            pending = [text[cut:]] if cut else []
+            pending_size = len(text) - cut if cut else 0
+            buffer += text[:cut] if cut else text
+            position = 0
+            while True:
+                position = _JSON_WHITESPACE.match(buffer, position).end()
+                if position == len(buffer):
+                    break
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError as e:
+                    # the document may continue on the next lines, and a text which does not end with a newline may
+                    # also end in the middle of a number or of a literal like -Infinity
+                    incomplete = (
+                        not buffer[e.pos :].strip()
+                        or e.msg.startswith('Unterminated string')
+                        or (not cut and len(buffer) - e.pos < _LONGEST_JSON_LITERAL)
+                    )
+                    if incomplete and not is_last:
+                        break
+                    error_line = line + buffer.count('\n', 0, e.pos)
+                    self.fail(
+                        f'invalid json record at line {error_line} (offset {offset + e.pos}): {e.msg}', param, ctx
+                    )
+                if (
+                    not cut
+                    and not is_last
+                    and buffer[position] not in '{["'
+                    and (end == len(buffer) or buffer[end] in '.eE')
+                ):
+                    # a number at the end of a text without newline may continue in the next chunk, like 1 or 1.5e
+                    # which are decoded as 1
+                    break
+                position = end
+                yield record
+            line += buffer.count('\n', 0, position)
+            offset += position
+            buffer = buffer[position:]
+
+    def convert(self, value, param, ctx):
+        # if a value is already converted, we return it
+        if not isinstance(value, str):
+            return value
+        if self._file_source and value.startswith('@'):
+            return self._iter_records(self._iter_file_text(value[1:], param, ctx), param, ctx)
+        return self._iter_records([value], param, ctx)
+
     def __repr__(self):
         return self.name.upper()
 
 
 class MacAddressParamType(ValidatorParamType):
     name = 'mac address'
+    _shape = re.compile(r'[0-9A-Fa-f]{2}[:-]')
 
     def __init__(self):
-        super().__init__(callback=mac_address)
+        super().__init__(callback=_validators.mac_address)
 
 
 class MacAddressListParamType(ListParamType):
     name = 'mac address list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(MAC_ADDRESS, separator=separator, name='mac addresses', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(MAC_ADDRESS, separator=separator, name='mac addresses', ignore_empty=ignore_empty, **kwargs)
 
 
 class StringListParamType(ListParamType):
     name = 'string list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(click.STRING, separator, ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(click.STRING, separator, ignore_empty=ignore_empty, **kwargs)
+
+
+class _IndexedChoice(click.Choice):
+    """
+    click.Choice looking values up in a dict of the choices, casefolded when case_sensitive is False, instead of
+    normalizing and scanning all the choices for each value. click.Choice is still used for context token normalization
+    and to build the error message of invalid values.
+    """
+
+    def __init__(self, choices: Sequence[str], case_sensitive: bool = True):
+        super().__init__(choices, case_sensitive=case_sensitive)
+        # like in click.Choice, the last of choices which are equal once normalized wins
+        self._index = {self._normalize(choice): choice for choice in self.choices}
+
+    def _normalize(self, value: str) -> str:
+        return value if self.case_sensitive else value.casefold()
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, str) and (ctx is None or ctx.token_normalize_func is None):
+            try:
+                return self._index[self._normalize(value)]
+            except KeyError:
+                pass
+        return super().convert(value, param, ctx)
+
+
+class _PrefixTrie:
+    """Trie of strings returning the indices of the strings which start with a given prefix."""
+
+    def __init__(self, keys: Iterable[str]):
+        # each node maps characters to child nodes, and the empty string to the indices of the keys ending at this node
+        self._root: Dict[str, Any] = {}
+        for index, key in enumerate(keys):
+            node = self._root
+            for character in key:
+                node = node.setdefault(character, {})
+            node.setdefault('', []).append(index)
+
+    def search(self, prefix: str) -> List[int]:
+        """Returns the indices of the keys starting with prefix, in the order they were given."""
+        node = self._root
+        for character in prefix:
+            node = node.get(character)
+            if node is None:
+                return []
+        indices = []
+        nodes = [node]
+        while nodes:
+            for key, child in nodes.pop().items():
+                if key:
+                    nodes.append(child)
+                else:
+                    indices.extend(child)
+        return sorted(indices)
 
 
 class ChoiceListParamType(ListParamType):
     name = 'choice list'
 
-    def __init__(self, choices: Sequence[str], separator: str = ',', case_sensitive: bool = True):
-        super().__init__(click.Choice(choices, case_sensitive=case_sensitive), separator)
+    def __init__(self, choices: Sequence[str], separator: str = ',', case_sensitive: bool = True, **kwargs):
+        super().__init__(_IndexedChoice(choices, case_sensitive=case_sensitive), separator, name='choices', **kwargs)
+        self._trie: Optional[_PrefixTrie] = None
+
+    def shell_complete(self, ctx: click.Context, param: click.Parameter, incomplete: str) -> List[Any]:
+        """
+        Completes the last item of the list with the choices starting with it, the previous items are kept as is.
+        :param ctx: the invocation context.
+        :param param: the parameter requesting completion.
+        :param incomplete: the value being completed, may be empty.
+        """
+        from click.shell_completion import CompletionItem
+
+        choice_type = self._param_type
+        # the trie is only built for completion, a plain conversion does not need it
+        if self._trie is None:
+            self._trie = _PrefixTrie(choice_type._normalize(str(choice)) for choice in choice_type.choices)
+        head, separator, last = incomplete.rpartition(self._separator)
+        choices = choice_type.choices
+        return [
+            CompletionItem(f'{head}{separator}{choices[index]}')
+            for index in self._trie.search(choice_type._normalize(last))
+        ]
+
+
+class PackedUUIDList(PackedSequence):
+    """
+    Sequence of uuids stored as 16-byte big-endian values, like uuid.UUID.bytes, in a bytes object. Membership tests use
+    a set of the 16-byte values built on the first test.
+    """
+
+    stride = 16
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self._index: Optional[set] = None
+
+    def _unpack(self, data: bytes) -> uuid.UUID:
+        return uuid.UUID(bytes=data)
+
+    def _pack(self, value: Any) -> bytes:
+        if isinstance(value, str):
+            value = uuid.UUID(value)
+        elif not isinstance(value, uuid.UUID):
+            raise TypeError(f'{value!r} is not a uuid')
+        return value.bytes
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            packed_value = self._pack(value)
+        except (ValueError, TypeError):
+            return False
+        if self._index is None:
+            data = self._data
+            self._index = {data[i : i + 16] for i in range(0, len(data), 16)}
+        return packed_value in self._index
+
+
+def _decode_canonical_uuids(expression: str, separator: str) -> Optional[bytes]:
+    """
+    Returns the 16-byte values of the uuids of expression if it only contains canonical uuids delimited by separator, or
+    None otherwise. The positions of dashes and separators are checked with slices and all the hexadecimal digits are
+    decoded with one bytes.fromhex call, so no object is created per uuid. separator must not contain hexadecimal
+    digits or dashes.
+    """
+    stride = 36 + len(separator)
+    count, remainder = divmod(len(expression) + len(separator), stride)
+    if remainder or not count:
+        return None
+    for position in (8, 13, 18, 23):
+        if expression[position::stride] != '-' * count:
+            return None
+    for position, character in enumerate(separator, 36):
+        if expression[position::stride] != character * (count - 1):
+            return None
+    hex_digits = expression.replace(separator, '').replace('-', '')
+    if len(hex_digits) != 32 * count:
+        return None
+    try:
+        data = bytes.fromhex(hex_digits)
+    except ValueError:
+        return None
+    # bytes.fromhex skips whitespace, so whitespace in a uuid gives a shorter result
+    return data if len(data) == 16 * count else None
 
 
 class UUIDListParamType(ListParamType):
     name = 'uuid list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(click.UUID, separator=separator, name='uuid', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, packed: bool = False, **kwargs):
+        if packed and kwargs.get('stream'):
+            raise ValueError('packed cannot be used in stream mode')
+        super().__init__(click.UUID, separator=separator, name='uuid', ignore_empty=ignore_empty, **kwargs)
+        self._packed = packed
+        # expressions of canonical uuids can be decoded in one pass if the separator cannot be mistaken for a part of a
+        # uuid
+        self._decode_in_one_pass = packed and bool(separator) and not re.search('[0-9A-Fa-f-]', separator)
+
+    def _item_sort_key(self) -> Optional[Callable[[Any], Any]]:
+        return attrgetter('int')
+
+    def _convert_expression_to_list(self, expression: str) -> Tuple[List[str], Any]:
+        if self._decode_in_one_pass and not (self._unique or self._sort):
+            data = _decode_canonical_uuids(expression, self._separator)
+            if data is not None:
+                return [], PackedUUIDList(data)
+        return super()._convert_expression_to_list(expression)
+
+    def _build_result(self, converted_items: Iterable[uuid.UUID]) -> Any:
+        if not self._packed:
+            return super()._build_result(converted_items)
+        return PackedUUIDList(b''.join(item.bytes for item in converted_items))
+
+
+# strict shapes of the iso formats of click.DateTime, datetime.fromisoformat accepts and rejects the values matching
+# them like datetime.strptime with these formats
+_ISO_DATE = r'[0-9]{4}-[0-9]{2}-[0-9]{2}'
+_ISO_TIME = r'(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9]'
+_ISO_FORMAT_SHAPES: Dict[str, Pattern[str]] = {
+    '%Y-%m-%d': re.compile(_ISO_DATE),
+    '%Y-%m-%dT%H:%M:%S': re.compile(f'{_ISO_DATE}T{_ISO_TIME}'),
+    '%Y-%m-%d %H:%M:%S': re.compile(f'{_ISO_DATE} {_ISO_TIME}'),
+}
+# directives whose patterns depend on the current locale
+_LOCALE_DIRECTIVES = re.compile(r'%[aAbBcpxXZ]')
+
+
+def _strptime_pattern(date_format: str) -> Optional[Pattern[str]]:
+    """
+    Returns the pattern used by datetime.strptime to parse date_format, or None if it is unknown. A value which does not
+    fully match the pattern cannot be parsed with date_format.
+    """
+    if _LOCALE_DIRECTIVES.search(date_format):
+        return None
+    try:
+        from _strptime import _TimeRE_cache
+
+        return _TimeRE_cache.compile(date_format)
+    except Exception:  # the private module of the standard library may change, and the format may be invalid
+        return None
+
+
+class _LearningDateTime(click.DateTime):
+    """
+    click.DateTime trying first the format which matched the previous value, and parsing values of its iso formats with
+    datetime.fromisoformat. The previous formats are only skipped when their strptime patterns show that they cannot
+    match the value, so the results and the error messages are the same as with click.DateTime.
+    """
+
+    def __init__(self, formats: Optional[Sequence[str]] = None):
+        super().__init__(formats)
+        self._patterns = [_strptime_pattern(date_format) for date_format in self.formats]
+        self._iso_shapes = [_ISO_FORMAT_SHAPES.get(date_format) for date_format in self.formats]
+        self._last_index = 0
+
+    def _may_match(self, value: str, index: int) -> bool:
+        pattern = self._patterns[index]
+        return pattern is None or pattern.fullmatch(value) is not None
+
+    def _parse(self, value: str, index: int) -> Optional[datetime]:
+        iso_shape = self._iso_shapes[index]
+        try:
+            if iso_shape is not None and iso_shape.fullmatch(value):
+                return datetime.fromisoformat(value)
+            if self._may_match(value, index):
+                return datetime.strptime(value, self.formats[index])
+        except ValueError:
+            pass
+        return None
+
+    def convert(self, value, param, ctx):
+        if isinstance(value, str):
+            start = self._last_index
+            if any(self._may_match(value, index) for index in range(start)):
+                start = 0
+            for index in range(start, len(self.formats)):
+                converted_value = self._parse(value, index)
+                if converted_value is not None:
+                    self._last_index = index
+                    return converted_value
+        # click.DateTime builds the error message, and handles values which are not strings
+        return super().convert(value, param, ctx)
 
 
 class DateTimeListParamType(ListParamType):
     name = 'datetime list'
 
-    def __init__(self, separator: str = ',', formats: Optional[List[str]] = None, ignore_empty: bool = False):
+    def __init__(self, separator: str = ',', formats: Optional[List[str]] = None, ignore_empty: bool = False, **kwargs):
         super().__init__(
-            click.DateTime(formats=formats), separator=separator, name='datetimes', ignore_empty=ignore_empty
+            _LearningDateTime(formats=formats),
+            separator=separator,
+            name='datetimes',
+            ignore_empty=ignore_empty,
+            **kwargs,
         )
 
 
+# shapes of click types, int() needs at least one decimal digit
+_CLICK_SHAPES: Dict[type, Pattern[str]] = {
+    click.types.IntParamType: re.compile(r'\D*\d'),
+    click.IntRange: re.compile(r'\D*\d'),
+}
+
+
+def _shape_of(param_type: click.ParamType) -> Optional[Pattern[str]]:
+    """Returns the pattern matched by every string param_type can convert or None if it is unknown."""
+    if isinstance(param_type, CustomParamType):
+        return param_type._shape
+    return _CLICK_SHAPES.get(type(param_type))
+
+
 class FirstOf(CustomParamType):
-    def __init__(self, *param_types: click.ParamType, name: Optional[str] = None, return_param: bool = False):
+    def __init__(
+        self,
+        *param_types: click.ParamType,
+        name: Optional[str] = None,
+        return_param: bool = False,
+        adaptive: bool = False,
+    ):
         self.param_types = param_types
         self.return_param = return_param
+        self.adaptive = adaptive
+        # in adaptive mode, types are skipped for strings which do not have their shape
+        self._shapes = tuple(_shape_of(p) if adaptive else None for p in param_types)
         if not getattr(self, 'name', None):
             if name:
                 self.name = name
@@ -106,27 +620,31 @@ class FirstOf(CustomParamType):
                 self.name = '(' + ' | '.join(p.name for p in self.param_types) + ')'
 
     def convert(self, value: str, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Any:
-        # Collect failure messages to emit later.
-        fails: List[Tuple[click.ParamType, str]] = []
+        is_string = isinstance(value, str)
+        for param_type, shape in zip(self.param_types, self._shapes):
+            if shape is not None and is_string and shape.match(value) is None:
+                continue
+            # no error is raised and formatted for the types which do not accept the value
+            converted, result = _try_convert(param_type, value, param, ctx)
+            if converted:
+                return (param_type, result) if self.return_param else result
+
+        return self._fail_with_all_errors(value, param, ctx)
+
+    def _fail_with_all_errors(self, value: str, param: Optional[click.Parameter], ctx: Optional[click.Context]) -> Any:
+        # All types are converted again to collect their error messages, the types skipped in adaptive mode included,
+        # so the message is the same in both modes.
+        messages = []
         for param_type in self.param_types:
             try:
                 result = param_type.convert(value, param, ctx)
                 return (param_type, result) if self.return_param else result
             except click.BadParameter as e:
-                fails.append((param_type, str(e)))
-
-        self.fail(
-            'All possible options exhausted without any successful conversion:\n - '
-            + '\n - '.join(
-                [
-                    indent(
-                        f"{getattr(f[0], 'name', f[0].__class__.__name__).upper()}:" f' {f[1]}',
-                        ' ',
-                    )
-                    for f in fails
-                ]
-            )
-        )
+                messages.append(
+                    indent(f"{getattr(param_type, 'name', param_type.__class__.__name__).upper()}: {e}", ' ')
+                )
+
+        self.fail('All possible options exhausted without any successful conversion:\n - ' + '\n - '.join(messages))
 
     def __repr__(self):
         # added str() here to pass type check due to name being optional.
@@ -134,4 +652,5 @@ class FirstOf(CustomParamType):
 
 
 JSON = JsonParamType()
+JSON_LINES = JsonLinesParamType()
 MAC_ADDRESS = MacAddressParamType()
@@ -1,12 +1,194 @@
 """Network parameter types"""
 import ipaddress
-from typing import Optional
+import re
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union
 
-from .base import BaseParamType, ListParamType, RangeParamType
+import click
+
+from .base import (
+    BaseParamType,
+    CustomParamType,
+    ListParamType,
+    PackedSequence,
+    RangeParamType,
+    RangeSequence,
+    _try_convert,
+)
+
+AnyIpAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+AnyIpNetwork = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+Networks = Union['IpNetworkSet', Iterable[Union[str, AnyIpNetwork]]]
+
+# ipv4 addresses only contain ascii digits and dots, ipv6 addresses contain hexadecimal digits, dots and at least one
+# colon before an optional scope id or prefix length
+_IPV4_ADDRESS_SHAPE = re.compile(r'[0-9.]+\Z')
+_IPV6_SHAPE = re.compile(r'[0-9A-Fa-f.]*:[0-9A-Fa-f:.]*(?:[%/]|\Z)')
+_IP_ADDRESS_SHAPE = re.compile(r'[0-9.]+\Z|[0-9A-Fa-f.]*:[0-9A-Fa-f:.]*(?:[%/]|\Z)')
+# ipv4 networks may have a prefix length or a netmask after a slash
+_IPV4_NETWORK_SHAPE = re.compile(r'[0-9./]+\Z')
+_IP_NETWORK_SHAPE = re.compile(r'[0-9./]+\Z|[0-9A-Fa-f.]*:[0-9A-Fa-f:.]*(?:[%/]|\Z)')
+
+
+def _address_sort_key(address: AnyIpAddress) -> int:
+    """Returns an integer sorting ipv4 addresses before ipv6 addresses, without calling rich comparison methods."""
+    return int(address) | (address.version == 6) << 128
+
+
+def _network_sort_key(network: AnyIpNetwork) -> int:
+    """Returns an integer sorting networks like their comparison methods, with ipv4 networks first."""
+    return (_address_sort_key(network.network_address) << 8) | network.prefixlen
+
+
+class PackedIpv4AddressList(PackedSequence):
+    """Sequence of ipv4 addresses stored as 32-bit unsigned integers (native byte order) in an array('I')."""
+
+    typecode = 'I'
+
+    def _unpack(self, data: int) -> ipaddress.IPv4Address:
+        return ipaddress.IPv4Address(data)
+
+    def _pack(self, value: Any) -> int:
+        return int(ipaddress.IPv4Address(value))
+
+    def _join(self, chunks: List[array]) -> array:
+        data = array(self.typecode)
+        for chunk in chunks:
+            data.extend(chunk)
+        return data
+
+
+class PackedIpv6AddressList(PackedSequence):
+    """Sequence of ipv6 addresses stored as 16-byte packed addresses (network byte order) in a bytes object."""
+
+    stride = 16
+
+    def _unpack(self, data: bytes) -> ipaddress.IPv6Address:
+        return ipaddress.IPv6Address(data)
+
+    def _pack(self, value: Any) -> bytes:
+        return ipaddress.IPv6Address(value).packed
+
+
+class _IpAddressSequence(RangeSequence):
+    """Sequence of ip addresses stored as ranges of integers, addresses are only created when items are accessed."""
+
+    _address_class: Type[AnyIpAddress]
+
+    def _unpack(self, value: int) -> AnyIpAddress:
+        return self._address_class(value)
+
+    def _pack(self, value: Any) -> int:
+        return int(self._address_class(value))
+
+    @property
+    def networks(self) -> Tuple[AnyIpNetwork, ...]:
+        """The smallest networks covering each range of addresses, like ipaddress.summarize_address_range returns."""
+        address_class = self._address_class
+        return tuple(
+            chain.from_iterable(
+                ipaddress.summarize_address_range(address_class(segment[0]), address_class(segment[-1]))
+                for segment in self._segments
+            )
+        )
+
+
+class Ipv4AddressSequence(_IpAddressSequence):
+    """Sequence of ipv4 addresses stored as ranges of integers."""
+
+    _address_class = ipaddress.IPv4Address
+
+
+class Ipv6AddressSequence(_IpAddressSequence):
+    """Sequence of ipv6 addresses stored as ranges of integers."""
+
+    _address_class = ipaddress.IPv6Address
+
+
+class IpNetworkSet:
+    """
+    Set of ip networks collapsed into sorted and non-overlapping intervals of integers. Overlapping and adjacent networks
+    are merged, and membership of addresses and networks is checked with a binary search.
+    """
+
+    def __init__(self, networks: Iterable[AnyIpNetwork]):
+        intervals: Dict[int, List[Tuple[int, int]]] = {4: [], 6: []}
+        self.input_count = 0
+        for network in networks:
+            self.input_count += 1
+            intervals[network.version].append((int(network.network_address), int(network.broadcast_address)))
+
+        # for each ip version, starts and ends of the merged intervals
+        self._starts: Dict[int, List[int]] = {}
+        self._ends: Dict[int, List[int]] = {}
+        for version, version_intervals in intervals.items():
+            starts = self._starts[version] = []
+            ends = self._ends[version] = []
+            for start, end in sorted(version_intervals):
+                if ends and start <= ends[-1] + 1:
+                    ends[-1] = max(ends[-1], end)
+                else:
+                    starts.append(start)
+                    ends.append(end)
+        self._networks: Optional[Tuple[AnyIpNetwork, ...]] = None
+
+    @property
+    def networks(self) -> Tuple[AnyIpNetwork, ...]:
+        """The collapsed networks sorted by ip version and address, like ipaddress.collapse_addresses returns."""
+        if self._networks is None:
+            networks = []
+            for version, address_class in ((4, ipaddress.IPv4Address), (6, ipaddress.IPv6Address)):
+                for start, end in zip(self._starts[version], self._ends[version]):
+                    networks.extend(ipaddress.summarize_address_range(address_class(start), address_class(end)))
+            self._networks = tuple(networks)
+        return self._networks
+
+    @property
+    def merged_count(self) -> int:
+        """The number of input networks which were merged into other networks."""
+        return self.input_count - len(self.networks)
+
+    def _contains_interval(self, version: int, start: int, end: int) -> bool:
+        starts = self._starts[version]
+        index = bisect_right(starts, start) - 1
+        return index >= 0 and end <= self._ends[version][index]
+
+    def __contains__(self, value: Any) -> bool:
+        """value can be an address or a network, as a string or as an ipaddress object."""
+        try:
+            if isinstance(value, str):
+                value = ipaddress.ip_network(value) if '/' in value else ipaddress.ip_address(value)
+            if isinstance(value, (ipaddress.IPv4Network, ipaddress.IPv6Network)):
+                start, end = int(value.network_address), int(value.broadcast_address)
+            else:
+                start = end = int(value)
+            return self._contains_interval(value.version, start, end)
+        except (ValueError, TypeError, AttributeError):
+            return False
+
+    def __iter__(self) -> Iterator[AnyIpNetwork]:
+        return iter(self.networks)
+
+    def __len__(self) -> int:
+        return len(self.networks)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, IpNetworkSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self.networks)!r})'
 
 
 class IpAddress(BaseParamType):
     name = 'ip address'
+    _shape = _IP_ADDRESS_SHAPE
+    _sort_key = staticmethod(_address_sort_key)
 
     def __init__(self):
         super().__init__(_type=ipaddress.ip_address, errors=ValueError)
@@ -15,12 +197,174 @@ class IpAddress(BaseParamType):
 class IpAddressListParamType(ListParamType):
     name = 'ip address list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(IP_ADDRESS, separator=separator, name='ip addresses', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(IP_ADDRESS, separator=separator, name='ip addresses', ignore_empty=ignore_empty, **kwargs)
+
+
+class IpAddressInNetworks(CustomParamType):
+    """
+    Ip address which must be in one of the allowed networks and in none of the denied networks. Networks are collapsed
+    into sorted intervals of integers at construction, so each check is a binary search.
+    """
+
+    name = 'ip address'
+    _shape = _IP_ADDRESS_SHAPE
+    _sort_key = staticmethod(_address_sort_key)
+
+    def __init__(self, allowed: Networks, denied: Networks = ()):
+        self._allowed = self._to_network_set(allowed)
+        self._denied = self._to_network_set(denied)
+
+    @staticmethod
+    def _to_network_set(networks: Networks) -> IpNetworkSet:
+        if isinstance(networks, IpNetworkSet):
+            return networks
+        return IpNetworkSet(ipaddress.ip_network(network) for network in networks)
+
+    def convert(self, value, param, ctx):
+        address = IP_ADDRESS.convert(value, param, ctx)
+        number = int(address)
+        if not self._allowed._contains_interval(address.version, number, number):
+            self.fail(f'{address} is not in an allowed network.', param, ctx)
+        if self._denied._contains_interval(address.version, number, number):
+            self.fail(f'{address} is in a denied network.', param, ctx)
+        return address
+
+    def __repr__(self):
+        return f'IpAddressInNetworks({list(self._allowed)!r}, {list(self._denied)!r})'
+
+
+class IpAddressInNetworksListParamType(ListParamType):
+    name = 'ip address list'
+
+    def __init__(
+        self, allowed: Networks, denied: Networks = (), separator: str = ',', ignore_empty: bool = False, **kwargs
+    ):
+        super().__init__(
+            IpAddressInNetworks(allowed, denied),
+            separator=separator,
+            name='allowed ip addresses',
+            ignore_empty=ignore_empty,
+            **kwargs,
+        )
+
+
+class _AddressRangeExpression(CustomParamType):
+    """
+    Converts an address, a range of addresses like "10.0.0.1-10.0.0.9" or a network like "10.0.0.0/24" to the range of
+    integers of its addresses. A network stands for its hosts, like the ipaddress hosts method returns. The addresses
+    and the bounds of ranges and networks are converted with address_type, so they must be in its valid range. Scoped
+    ipv6 addresses are rejected since integers cannot keep their scope id.
+    """
+
+    def __init__(self, address_type: click.ParamType, network_class: Type[AnyIpNetwork], plural_name: str):
+        self._address_type = address_type
+        self._network_class = network_class
+        # the name of a range type with a minimum or a maximum is "ipv4 address range"
+        self.name = getattr(address_type, '_param_type', address_type).name
+        self._plural_name = plural_name
+
+    def _host_bounds(self, value: str) -> Optional[Tuple[AnyIpAddress, AnyIpAddress]]:
+        try:
+            network = self._network_class(value)
+        except ValueError:
+            return None
+        first, last = network.network_address, network.broadcast_address
+        # networks with more than two addresses exclude the subnet-router anycast address, and the broadcast address
+        # for ipv4
+        if network.num_addresses > 2:
+            first += 1
+            if network.version == 4:
+                last -= 1
+        return first, last
+
+    def _bounds(self, value: Any) -> Optional[Tuple[Any, Any]]:
+        """Returns the first and last addresses of value before they are converted, or None if it is not valid."""
+        if not isinstance(value, str):
+            return None if getattr(value, 'scope_id', None) else (value, value)
+        if '%' in value:
+            return None
+        if '/' in value:
+            return self._host_bounds(value)
+        if '-' in value:
+            first, last = value.split('-', 1)
+            return first, last
+        return value, value
+
+    def try_convert(self, value: Any, param=None, ctx=None) -> Tuple[bool, Any]:
+        bounds = self._bounds(value)
+        if bounds is None:
+            return False, None
+
+        converted_first, first = _try_convert(self._address_type, bounds[0], param, ctx)
+        converted_last, last = _try_convert(self._address_type, bounds[1], param, ctx)
+        if not (converted_first and converted_last) or first > last:
+            return False, None
+        return True, range(int(first), int(last) + 1)
+
+    def convert(self, value, param, ctx):
+        converted, converted_value = self.try_convert(value, param, ctx)
+        if converted:
+            return converted_value
+        if '%' in str(value):
+            self.fail(
+                f'{value} is a scoped address, ranges of {self._plural_name} cannot keep its scope id', param, ctx
+            )
+        bounds = self._bounds(value)
+        if bounds is not None and isinstance(self._address_type, RangeParamType):
+            address_type = self._address_type._param_type
+            if all(_try_convert(address_type, bound, param, ctx)[0] for bound in bounds):
+                # the bounds are valid addresses, the range type reports the one which is out of its range
+                for bound in bounds:
+                    self._address_type.convert(bound, param, ctx)
+        self.fail(f'{value} is not a valid {self.name}, range of {self._plural_name} or network', param, ctx)
+
+
+class AddressListParamType(ListParamType):
+    """
+    Base class of ipv4 and ipv6 address list types. When ranges is set, items can also be ranges of addresses or
+    networks, and an integer-backed sequence of addresses is returned instead of a list.
+    """
+
+    def __init__(
+        self,
+        address_type: click.ParamType,
+        network_class: Type[AnyIpNetwork],
+        sequence_class: Type[_IpAddressSequence],
+        separator: str = ',',
+        name: Optional[str] = None,
+        ignore_empty: bool = False,
+        packed: bool = False,
+        ranges: bool = False,
+        **kwargs,
+    ):
+        if ranges and (packed or kwargs.get('unique') or kwargs.get('sort')):
+            raise ValueError('ranges cannot be used with packed, unique or sort')
+        if packed and kwargs.get('stream'):
+            raise ValueError('packed cannot be used in stream mode')
+        if ranges:
+            address_type = _AddressRangeExpression(address_type, network_class, name or 'addresses')
+        super().__init__(address_type, separator=separator, name=name, ignore_empty=ignore_empty, **kwargs)
+        self._packed = packed
+        self._ranges = ranges
+        self._sequence_class = sequence_class
+
+    def _build_result(self, converted_items: Iterable[Any]) -> Any:
+        if not self._ranges:
+            return super()._build_result(converted_items)
+        return self._sequence_class(converted_items)
+
+    def _iter_converted_items(self, items: Iterable[str], param, ctx) -> Iterator[Any]:
+        converted_items = super()._iter_converted_items(items, param, ctx)
+        if not self._ranges:
+            return converted_items
+        return chain.from_iterable(self._sequence_class((segment,)) for segment in converted_items)
 
 
 class Ipv4Address(BaseParamType):
     name = 'ipv4 address'
+    _shape = _IPV4_ADDRESS_SHAPE
+    _sort_key = staticmethod(_address_sort_key)
 
     def __init__(self):
         super().__init__(_type=ipaddress.IPv4Address, errors=ValueError)
@@ -41,15 +385,41 @@ class Ipv4AddressRange(RangeParamType):
         return f'IPV4AddressRange({self._minimum!r}, {self._maximum!r})'
 
 
-class Ipv4AddressListParamType(ListParamType):
+class Ipv4AddressListParamType(AddressListParamType):
     name = 'ipv4 address list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(IPV4_ADDRESS, separator=separator, name='ipv4 addresses', ignore_empty=ignore_empty)
+    def __init__(
+        self,
+        separator: str = ',',
+        ignore_empty: bool = False,
+        packed: bool = False,
+        ranges: bool = False,
+        minimum: Optional[ipaddress.IPv4Address] = None,
+        maximum: Optional[ipaddress.IPv4Address] = None,
+        **kwargs,
+    ):
+        super().__init__(
+            IPV4_ADDRESS if minimum is None and maximum is None else Ipv4AddressRange(minimum, maximum),
+            ipaddress.IPv4Network,
+            Ipv4AddressSequence,
+            separator=separator,
+            name='ipv4 addresses',
+            ignore_empty=ignore_empty,
+            packed=packed,
+            ranges=ranges,
+            **kwargs,
+        )
+
+    def _build_result(self, converted_items: Iterable[ipaddress.IPv4Address]) -> Any:
+        if not self._packed:
+            return super()._build_result(converted_items)
+        return PackedIpv4AddressList(array(PackedIpv4AddressList.typecode, map(int, converted_items)))
 
 
 class Ipv6Address(BaseParamType):
     name = 'ipv6 address'
+    _shape = _IPV6_SHAPE
+    _sort_key = staticmethod(_address_sort_key)
 
     def __init__(self):
         super().__init__(_type=ipaddress.IPv6Address, errors=ValueError)
@@ -70,53 +440,125 @@ class Ipv6AddressRange(RangeParamType):
         return f'IPV6AddressRange({self._minimum!r}, {self._maximum!r})'
 
 
-class Ipv6AddressListParamType(ListParamType):
+class Ipv6AddressListParamType(AddressListParamType):
     name = 'ipv6 address list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(IPV6_ADDRESS, separator=separator, name='ipv6 addresses', ignore_empty=ignore_empty)
+    def __init__(
+        self,
+        separator: str = ',',
+        ignore_empty: bool = False,
+        packed: bool = False,
+        ranges: bool = False,
+        minimum: Optional[ipaddress.IPv6Address] = None,
+        maximum: Optional[ipaddress.IPv6Address] = None,
+        **kwargs,
+    ):
+        super().__init__(
+            IPV6_ADDRESS if minimum is None and maximum is None else Ipv6AddressRange(minimum, maximum),
+            ipaddress.IPv6Network,
+            Ipv6AddressSequence,
+            separator=separator,
+            name='ipv6 addresses',
+            ignore_empty=ignore_empty,
+            packed=packed,
+            ranges=ranges,
+            **kwargs,
+        )
+
+    def _build_result(self, converted_items: Iterable[ipaddress.IPv6Address]) -> Any:
+        if not self._packed:
+            return super()._build_result(converted_items)
+        data = bytearray()
+        for address in converted_items:
+            data += address.packed
+        return PackedIpv6AddressList(bytes(data))
 
 
 class IpNetwork(BaseParamType):
     name = 'ip network'
+    _shape = _IP_NETWORK_SHAPE
+    _sort_key = staticmethod(_network_sort_key)
 
     def __init__(self):
         super().__init__(_type=ipaddress.ip_network, errors=ValueError)
 
 
-class IpNetworkListParamType(ListParamType):
+class NetworkListParamType(ListParamType):
+    """Base class of network list types, they can return an IpNetworkSet instead of a list."""
+
+    def __init__(
+        self,
+        param_type: BaseParamType,
+        separator: str = ',',
+        name: Optional[str] = None,
+        ignore_empty: bool = False,
+        collapse: bool = False,
+        **kwargs,
+    ):
+        if collapse and kwargs.get('stream'):
+            raise ValueError('collapse cannot be used in stream mode')
+        super().__init__(param_type, separator=separator, name=name, ignore_empty=ignore_empty, **kwargs)
+        self._collapse = collapse
+
+    def _build_result(self, converted_items: Iterable[AnyIpNetwork]) -> Any:
+        if not self._collapse:
+            return super()._build_result(converted_items)
+        return IpNetworkSet(converted_items)
+
+
+class IpNetworkListParamType(NetworkListParamType):
     name = 'ip network list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(IP_NETWORK, separator=separator, name='ip networks', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, collapse: bool = False, **kwargs):
+        super().__init__(
+            IP_NETWORK, separator=separator, name='ip networks', ignore_empty=ignore_empty, collapse=collapse, **kwargs
+        )
 
 
 class Ipv4Network(BaseParamType):
     name = 'ipv4 network'
+    _shape = _IPV4_NETWORK_SHAPE
+    _sort_key = staticmethod(_network_sort_key)
 
     def __init__(self):
         super().__init__(_type=ipaddress.IPv4Network, errors=ValueError)
 
 
-class Ipv4NetworkListParamType(ListParamType):
+class Ipv4NetworkListParamType(NetworkListParamType):
     name = 'ipv4 network list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(IPV4_NETWORK, separator=separator, name='ipv4 networks', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, collapse: bool = False, **kwargs):
+        super().__init__(
+            IPV4_NETWORK,
+            separator=separator,
+            name='ipv4 networks',
+            ignore_empty=ignore_empty,
+            collapse=collapse,
+            **kwargs,
+        )
 
 
 class Ipv6Network(BaseParamType):
     name = 'ipv6 network'
+    _shape = _IPV6_SHAPE
+    _sort_key = staticmethod(_network_sort_key)
 
     def __init__(self):
         super().__init__(_type=ipaddress.IPv6Network, errors=ValueError)
 
 
-class Ipv6NetworkListParamType(ListParamType):
+class Ipv6NetworkListParamType(NetworkListParamType):
     name = 'ipv6 network list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(IPV6_NETWORK, separator=separator, name='ipv6 networks', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, collapse: bool = False, **kwargs):
+        super().__init__(
+            IPV6_NETWORK,
+            separator=separator,
+            name='ipv6 networks',
+            ignore_empty=ignore_empty,
+            collapse=collapse,
+            **kwargs,
+        )
 
 
 IP_ADDRESS = IpAddress()
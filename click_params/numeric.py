@@ -1,18 +1,140 @@
 """Numeric parameter types"""
-from decimal import Decimal, DecimalException
+import re
+from decimal import Context, Decimal, DecimalException
 from fractions import Fraction
-from typing import Optional
+from functools import partial
+from itertools import chain
+from types import ModuleType
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 
 import click
 
-from .base import BaseParamType, ListParamType, RangeParamType
+from .base import BaseParamType, ItemErrors, ListParamType, RangeParamType, RangeSequence
+
+
+def _import_numpy() -> Optional[ModuleType]:
+    """Returns the numpy module or None if it is not installed. The import is done on demand to not slow down clis."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+class NumberListParamType(ListParamType):
+    """
+    Base class of numeric list types which can return a numpy array instead of a list.
+    When as_array is set and numpy is installed, the whole expression is parsed in one vectorized pass, otherwise
+    items are converted one by one like in any other list type.
+    """
+
+    dtype = ''
+
+    def __init__(
+        self,
+        param_type: click.ParamType,
+        separator: str = ',',
+        name: Optional[str] = None,
+        ignore_empty: bool = False,
+        as_array: bool = False,
+        dtype: Any = None,
+        **kwargs,
+    ):
+        if as_array and kwargs.get('stream'):
+            raise ValueError('as_array cannot be used in stream mode')
+        super().__init__(param_type, separator=separator, name=name, ignore_empty=ignore_empty, **kwargs)
+        self._as_array = as_array
+        self._dtype = dtype or self.dtype
+
+    def _convert_items_to_list(self, items: Iterable[str]) -> Tuple[List[str], Any]:
+        numpy = _import_numpy() if self._as_array else None
+        if numpy is None:
+            return super()._convert_items_to_list(items)
+
+        items = items if isinstance(items, list) else list(items)
+        array = numpy.array(items)
+        try:
+            # numpy only warns when a float does not fit in the dtype and returns inf, it is rejected like a too big int
+            with numpy.errstate(over='raise'):
+                array = array.astype(self._dtype)
+        except (ValueError, TypeError, OverflowError, FloatingPointError):
+            pass
+        else:
+            if self._unique or self._sort:
+                array = numpy.array(list(self._arrange_items(array.tolist())), dtype=self._dtype)
+            return [], array
+
+        # we fall back to the per-item conversion to report all the non-compliant items
+        errors = ItemErrors()
+        converted_items = list(self._iter_compliant_items(items, errors))
+        if errors:
+            return errors, converted_items
+
+        # all items are valid python numbers, but some of them do not fit in the dtype, e.g. too big integers or floats
+        with numpy.errstate(over='raise'):
+            for item, converted_item in zip(items, converted_items):
+                try:
+                    numpy.array(converted_item, dtype=self._dtype)
+                except (ValueError, TypeError, OverflowError, FloatingPointError):
+                    errors.append(item)
+        if errors:
+            return errors, converted_items
+        return errors, numpy.array(list(self._arrange_items(converted_items)), dtype=self._dtype)
+
+    def convert(self, value, param, ctx):
+        if self._as_array and self._ignore_empty and isinstance(value, str) and value == '':
+            numpy = _import_numpy()
+            if numpy is not None:
+                return numpy.empty(0, dtype=self._dtype)
+        return super().convert(value, param, ctx)
+
+
+def _parse_decimal(context: Optional[Context], exponent: Optional[Decimal], value: Any) -> Decimal:
+    """
+    Parses value like Decimal, then rounds it with context and quantizes it to exponent when they are given. Signals
+    trapped by the context are raised, so the value is rejected.
+    """
+    number = Decimal(value)
+    if context is not None:
+        number = context.create_decimal(number)
+    if exponent is not None:
+        number = number.quantize(exponent, context=context)
+    return number
+
+
+def _parse_fraction(value: Any) -> Fraction:
+    """
+    Returns the same fraction as Fraction(value). Ascii integers, ratios "a/b" and fixed-point decimals are parsed
+    without the regular expression and the general parser of Fraction, fractions are returned as is.
+    """
+    if type(value) is Fraction:
+        return value
+    if not isinstance(value, str) or not value.isascii():
+        return Fraction(value)
+    if value.isdigit():
+        return Fraction(int(value))
+    digits = value[1:] if value[:1] in ('-', '+') else value
+    sign = -1 if value.startswith('-') else 1
+    numerator, separator, denominator = digits.partition('/')
+    if separator:
+        if not (numerator.isdigit() and denominator.isdigit()):
+            return Fraction(value)
+        return Fraction(sign * int(numerator), int(denominator))
+    integer, separator, decimals = digits.partition('.')
+    if not (separator and integer.isdigit() and decimals.isdigit()):
+        return Fraction(value)
+    return Fraction(sign * int(integer + decimals), 10 ** len(decimals))
 
 
 class DecimalParamType(BaseParamType):
     name = 'decimal'
 
-    def __init__(self):
-        super().__init__(_type=Decimal, errors=DecimalException)
+    def __init__(self, context: Optional[Context] = None, quantize: Optional[Decimal] = None):
+        if context is None and quantize is None:
+            _type = Decimal
+        else:
+            _type = partial(_parse_decimal, context, quantize)
+        super().__init__(_type=_type, errors=DecimalException)
 
 
 class DecimalRange(RangeParamType):
@@ -25,15 +147,23 @@ class DecimalRange(RangeParamType):
 class DecimalListParamType(ListParamType):
     name = 'decimal list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(DECIMAL, separator=separator, name='decimal values', ignore_empty=ignore_empty)
+    def __init__(
+        self,
+        separator: str = ',',
+        ignore_empty: bool = False,
+        context: Optional[Context] = None,
+        quantize: Optional[Decimal] = None,
+        **kwargs,
+    ):
+        param_type = DECIMAL if context is None and quantize is None else DecimalParamType(context, quantize)
+        super().__init__(param_type, separator=separator, name='decimal values', ignore_empty=ignore_empty, **kwargs)
 
 
 class FractionParamType(BaseParamType):
     name = 'fraction'
 
     def __init__(self):
-        super().__init__(_type=Fraction, errors=(ValueError, ZeroDivisionError))
+        super().__init__(_type=_parse_fraction, errors=(ValueError, ZeroDivisionError))
 
 
 class FractionRange(RangeParamType):
@@ -46,8 +176,8 @@ class FractionRange(RangeParamType):
 class FractionListParamType(ListParamType):
     name = 'fraction list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(FRACTION, separator=separator, name='fractions', ignore_empty=ignore_empty)
+    def __init__(self, separator: str = ',', ignore_empty: bool = False, **kwargs):
+        super().__init__(FRACTION, separator=separator, name='fractions', ignore_empty=ignore_empty, **kwargs)
 
 
 class ComplexParamType(BaseParamType):
@@ -57,25 +187,121 @@ class ComplexParamType(BaseParamType):
         super().__init__(_type=complex, errors=ValueError)
 
 
-class ComplexListParamType(ListParamType):
+class ComplexListParamType(NumberListParamType):
     name = 'complex list'
+    dtype = 'complex128'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(COMPLEX, separator=separator, name='complex values', ignore_empty=ignore_empty)
+    def __init__(
+        self, separator: str = ',', ignore_empty: bool = False, as_array: bool = False, dtype: Any = None, **kwargs
+    ):
+        super().__init__(
+            COMPLEX,
+            separator=separator,
+            name='complex values',
+            ignore_empty=ignore_empty,
+            as_array=as_array,
+            dtype=dtype,
+            **kwargs,
+        )
 
 
-class IntListParamType(ListParamType):
-    name = 'int list'
+_INT_RANGE = re.compile(r'\s*([+-]?\d+)\s*-\s*([+-]?\d+)\s*(?::\s*(\d+)\s*)?\Z')
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(click.INT, separator=separator, name='integers', ignore_empty=ignore_empty)
 
+def _parse_int_or_range(value: Any) -> Union[int, range]:
+    """
+    Converts "a-b" or "a-b:step" to the range of integers from a to b included, and any other value to an integer like
+    click.INT. A ValueError is raised for an invalid value.
+    """
+    match = _INT_RANGE.match(value) if isinstance(value, str) else None
+    if match is None:
+        return int(value)
+    start, end, step = int(match[1]), int(match[2]), int(match[3] or 1)
+    if start > end:
+        raise ValueError(f'{value} is not an increasing range')
+    if not step:
+        raise ValueError(f'{value} has a null step')
+    return range(start, end + 1, step)
+
+
+def _format_segment(segment: range) -> str:
+    if segment[0] == segment[-1]:
+        return str(segment[0])
+    if segment.step == 1:
+        return f'{segment[0]}-{segment[-1]}'
+    return f'{segment[0]}-{segment[-1]}:{segment.step}'
 
-class FloatListParamType(ListParamType):
-    name = 'float list'
 
-    def __init__(self, separator: str = ',', ignore_empty: bool = False):
-        super().__init__(click.FLOAT, separator=separator, name='floating point values', ignore_empty=ignore_empty)
+_INT_OR_RANGE = BaseParamType(_type=_parse_int_or_range, errors=ValueError, name='integer or range')
+
+
+class IntListParamType(NumberListParamType):
+    name = 'int list'
+    dtype = 'int64'
+
+    def __init__(
+        self,
+        separator: str = ',',
+        ignore_empty: bool = False,
+        as_array: bool = False,
+        dtype: Any = None,
+        ranges: bool = False,
+        allow_overlaps: bool = True,
+        **kwargs,
+    ):
+        if ranges and (as_array or kwargs.get('unique') or kwargs.get('sort')):
+            raise ValueError('ranges cannot be used with as_array, unique or sort')
+        if not allow_overlaps and (not ranges or kwargs.get('stream')):
+            raise ValueError('allow_overlaps can only be disabled with ranges and without stream')
+        super().__init__(
+            _INT_OR_RANGE if ranges else click.INT,
+            separator=separator,
+            name='integers',
+            ignore_empty=ignore_empty,
+            as_array=as_array,
+            dtype=dtype,
+            **kwargs,
+        )
+        self._ranges = ranges
+        self._allow_overlaps = allow_overlaps
+
+    def _build_result(self, converted_items: Iterable[Union[int, range]]) -> Any:
+        if not self._ranges:
+            return super()._build_result(converted_items)
+        return RangeSequence(item if isinstance(item, range) else range(item, item + 1) for item in converted_items)
+
+    def _iter_converted_items(self, items: Iterable[str], param, ctx) -> Iterator[int]:
+        converted_items = super()._iter_converted_items(items, param, ctx)
+        if not self._ranges:
+            return converted_items
+        return chain.from_iterable(item if isinstance(item, range) else (item,) for item in converted_items)
+
+    def convert(self, value, param, ctx):
+        result = super().convert(value, param, ctx)
+        if not self._allow_overlaps and isinstance(value, str):
+            overlapping_segments = {segment: None for pair in result.overlaps() for segment in pair}
+            if overlapping_segments:
+                errors = [_format_segment(segment) for segment in overlapping_segments]
+                self.fail(f'These items overlap: {errors}', param, ctx)
+        return result
+
+
+class FloatListParamType(NumberListParamType):
+    name = 'float list'
+    dtype = 'float64'
+
+    def __init__(
+        self, separator: str = ',', ignore_empty: bool = False, as_array: bool = False, dtype: Any = None, **kwargs
+    ):
+        super().__init__(
+            click.FLOAT,
+            separator=separator,
+            name='floating point values',
+            ignore_empty=ignore_empty,
+            as_array=as_array,
+            dtype=dtype,
+            **kwargs,
+        )
 
 
 DECIMAL = DecimalParamType()
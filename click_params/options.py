@@ -0,0 +1,53 @@
+"""Click option and argument classes converting multiple values in one batch"""
+from typing import Any, Callable
+
+import click
+
+
+class _BatchConversionMixin:
+    """
+    Converts the values of a parameter with multiple=True or nargs=-1 with the convert_many method of its type, so all
+    the values are converted in one batch and all the invalid values are reported in one error.
+    """
+
+    def _is_batch(self) -> bool:
+        if not hasattr(self.type, 'convert_many') or self.type.is_composite:
+            return False
+        # with multiple=True and nargs=-1, or nargs > 1, values are tuples converted by click
+        return (self.multiple and self.nargs == 1) or (not self.multiple and self.nargs == -1)
+
+    def type_cast_value(self, ctx: click.Context, value: Any) -> Any:
+        if value is None or isinstance(value, str) or not self._is_batch():
+            return super().type_cast_value(ctx, value)
+        try:
+            values = list(value)
+        except TypeError:
+            # click reports values which are not iterables
+            return super().type_cast_value(ctx, value)
+        return tuple(self.type.convert_many(values, self, ctx))
+
+
+class BatchOption(_BatchConversionMixin, click.Option):
+    pass
+
+
+class BatchArgument(_BatchConversionMixin, click.Argument):
+    pass
+
+
+def batch_option(*param_decls: str, **attrs: Any) -> Callable:
+    """
+    Like click.option, but the values of an option with multiple=True are converted in one batch.
+    :param param_decls: the option names.
+    :param attrs: the keyword arguments of click.option.
+    """
+    return click.option(*param_decls, cls=BatchOption, **attrs)
+
+
+def batch_argument(*param_decls: str, **attrs: Any) -> Callable:
+    """
+    Like click.argument, but the values of an argument with nargs=-1 are converted in one batch.
+    :param param_decls: the argument name.
+    :param attrs: the keyword arguments of click.argument.
+    """
+    return click.argument(*param_decls, cls=BatchArgument, **attrs)
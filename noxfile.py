@@ -33,6 +33,13 @@ def tests(session):
     session.run('pytest')
 
 
+@nox.session(python=PYTHON_VERSIONS[-1])
+def benchmark(session):
+    """Runs the benchmark suite, extra arguments are passed to the benchmark command."""
+    session.run('poetry', 'install', '--only', 'main')
+    session.run('python', '-m', 'benchmarks.run', *session.posargs)
+
+
 @nox.session(python=PYTHON_VERSIONS[-1])
 def docs(session):
     """Builds the documentation."""
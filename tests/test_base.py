@@ -1,11 +1,33 @@
+import json
+import pickle
+import random
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from fractions import Fraction
 
 import click
 import pytest
 from validators.utils import validator
 
-from click_params.base import BaseParamType, ListParamType, RangeParamType, ValidatorParamType
-from click_params.numeric import COMPLEX, DECIMAL, FRACTION
+from click_params.base import (
+    BaseParamType,
+    CacheInfo,
+    ConversionCache,
+    ConversionStats,
+    CustomParamType,
+    ListParamType,
+    RangeParamType,
+    RangeSequence,
+    ValidatorParamType,
+    _get_default_executor,
+    _ranges_intersect,
+    disable_instrumentation,
+    enable_instrumentation,
+)
+from click_params.domain import UrlListParamType
+from click_params.miscellaneous import JSON, JSON_LINES, FirstOf
+from click_params.numeric import COMPLEX, DECIMAL, FRACTION, DecimalListParamType, IntListParamType
 
 
 class IntType(BaseParamType):
@@ -201,3 +223,760 @@ class TestListParamType:
     def test_should_return_non_empty_list_without_ignore_empty_string(self):
         base_list = ListParamType(param_type=click.STRING)
         assert base_list.convert('', None, None) == ['']
+
+    # we test the stream mode
+
+    @pytest.mark.parametrize(
+        ('separator', 'expression', 'values'),
+        [
+            (',', '1,2,3', [1, 2, 3]),
+            (', ', ', 1, 2, 3, ', [1, 2, 3]),
+            (' ', '4', [4]),
+        ],
+    )
+    def test_should_return_iterator_of_converted_items_in_stream_mode(self, separator, expression, values):
+        items = ListParamType(click.INT, separator, stream=True).convert(expression, None, None)
+
+        assert iter(items) is items
+        assert values == list(items)
+
+    def test_should_raise_error_on_first_incorrect_item_consumed_in_stream_mode(self):
+        items = ListParamType(click.INT, name='integers', stream=True).convert('1,foo,bar', None, None)
+
+        assert 1 == next(items)
+        with pytest.raises(click.BadParameter) as exc_info:
+            next(items)
+
+        assert "These items are not integers: ['foo']" == str(exc_info.value)
+
+    def test_should_return_empty_iterator_with_ignore_empty_string_in_stream_mode(self):
+        items = ListParamType(click.INT, ignore_empty=True, stream=True).convert('', None, None)
+
+        assert [] == list(items)
+
+    def test_should_raise_error_when_separator_is_empty_in_stream_mode(self):
+        items = ListParamType(click.INT, '', stream=True).convert('1', None, None)
+
+        with pytest.raises(ValueError, match='empty separator'):
+            next(items)
+
+    # we test the file source
+
+    @pytest.mark.parametrize(
+        ('separator', 'content', 'values'),
+        [
+            (',', b'1,2,3', ['1', '2', '3']),
+            (',', b'1,2\n3\r\n4\n', ['1', '2', '3', '4']),
+            ('; ', b'\n1; 2\n\n3; ', ['1', '2', '', '3']),
+        ],
+    )
+    def test_should_read_items_from_file(self, tmp_path, separator, content, values):
+        path = tmp_path / 'items.txt'
+        path.write_bytes(content)
+        base_list = ListParamType(click.STRING, separator, file_source=True)
+
+        assert values == base_list.convert(f'@{path}', None, None)
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 1024])
+    def test_should_split_items_across_chunks(self, mocker, tmp_path, chunk_size):
+        mocker.patch('click_params.base.CHUNK_SIZE', chunk_size)
+        path = tmp_path / 'items.txt'
+        path.write_bytes('foo, bar\r\nbaz, é\n'.encode())
+
+        base_list = ListParamType(click.STRING, ', ', file_source=True)
+        assert ['foo', 'bar', 'baz', 'é'] == base_list.convert(f'@{path}', None, None)
+
+    @pytest.mark.parametrize(('ignore_empty', 'values'), [(True, []), (False, [''])])
+    def test_should_apply_ignore_empty_to_empty_file(self, tmp_path, ignore_empty, values):
+        path = tmp_path / 'items.txt'
+        path.write_bytes(b'')
+        base_list = ListParamType(click.STRING, ignore_empty=ignore_empty, file_source=True)
+
+        assert values == base_list.convert(f'@{path}', None, None)
+
+    def test_should_report_incorrect_items_from_file(self, tmp_path):
+        path = tmp_path / 'items.txt'
+        path.write_bytes(b'1\nfoo\n2\nbar\n')
+        base_list = ListParamType(click.INT, name='integers', file_source=True)
+
+        with pytest.raises(click.BadParameter) as exc_info:
+            base_list.convert(f'@{path}', None, None)
+
+        assert "These items are not integers: ['foo', 'bar']" == str(exc_info.value)
+
+    def test_should_read_items_from_file_in_stream_mode(self, tmp_path):
+        path = tmp_path / 'items.txt'
+        path.write_bytes(b'1\n2\n')
+        items = ListParamType(click.INT, file_source=True, stream=True).convert(f'@{path}', None, None)
+
+        assert [1, 2] == list(items)
+
+    def test_should_raise_error_when_file_cannot_be_read(self, tmp_path):
+        path = tmp_path / 'missing.txt'
+        with pytest.raises(click.BadParameter) as exc_info:
+            ListParamType(click.INT, file_source=True).convert(f'@{path}', None, None)
+
+        assert f'unable to read {path}: No such file or directory' == str(exc_info.value)
+
+    def test_should_raise_error_when_file_is_not_utf8_encoded(self, tmp_path):
+        path = tmp_path / 'items.txt'
+        path.write_bytes(b'1,\xff')
+        with pytest.raises(click.BadParameter) as exc_info:
+            ListParamType(click.INT, file_source=True).convert(f'@{path}', None, None)
+
+        assert f'{path} is not a valid utf-8 file' == str(exc_info.value)
+
+    def test_should_read_items_from_standard_input(self, runner):
+        @click.command()
+        @click.option('-v', 'values', type=ListParamType(click.INT, file_source=True))
+        def cli(values):
+            click.echo(values)
+
+        result = runner.invoke(cli, ['-v', '@-'], input='1,2\n3\n')
+
+        assert 0 == result.exit_code
+        assert '[1, 2, 3]\n' == result.output
+
+    def test_should_not_read_file_when_file_source_is_not_set(self):
+        base_list = ListParamType(click.STRING)
+
+        assert ['@foo'] == base_list.convert('@foo', None, None)
+
+
+class TestRangeSequence:
+    """Tests the RangeSequence class"""
+
+    sequence = RangeSequence([range(1, 4), range(10, 20, 5), range(7, 8), range(3, 3)])
+
+    def test_should_compute_length_items_and_membership_from_segments(self):
+        values = [1, 2, 3, 10, 15, 7]
+
+        assert len(values) == len(self.sequence)
+        assert values == list(self.sequence)
+        assert values == [self.sequence[index] for index in range(len(values))]
+        assert 15 == self.sequence[-2]
+        assert all(value in self.sequence for value in values)
+        assert not any(value in self.sequence for value in [0, 4, 11, 20, '1', None, 1.5])
+        assert (range(1, 4), range(10, 20, 5), range(7, 8)) == self.sequence.segments
+
+    @pytest.mark.parametrize('index', [6, -7])
+    def test_should_raise_error_when_index_is_out_of_range(self, index):
+        with pytest.raises(IndexError):
+            self.sequence[index]
+
+    @pytest.mark.parametrize(
+        ('item', 'expected'),
+        [
+            (slice(1, 5), [2, 3, 10, 15]),
+            (slice(-3, None), [10, 15, 7]),
+            (slice(None, None, 2), [1, 3, 15]),
+            (slice(None, None, -1), [7, 15, 10, 3, 2, 1]),
+        ],
+    )
+    def test_should_slice_sequence(self, item, expected):
+        assert expected == self.sequence[item]
+
+    def test_should_return_range_sequence_for_contiguous_slices(self):
+        sequence = RangeSequence([range(1, 1000001)])[10:-10]
+
+        assert isinstance(sequence, RangeSequence)
+        assert (range(11, 999991),) == sequence.segments
+
+    def test_should_find_overlapping_segments(self):
+        sequence = RangeSequence([range(1, 11), range(20, 31, 2), range(5, 6), range(21, 30, 2), range(22, 23)])
+
+        assert [(range(1, 11), range(5, 6)), (range(20, 31, 2), range(22, 23))] == sequence.overlaps()
+        assert [] == self.sequence.overlaps()
+
+    def test_ranges_intersect_should_give_same_result_as_sets(self):
+        rng = random.Random(0)
+        for _ in range(2000):
+            first, second = (range(rng.randint(-30, 30), rng.randint(-30, 30), rng.randint(1, 7)) for _ in range(2))
+            if first and second:
+                assert bool(set(first) & set(second)) is _ranges_intersect(first, second), (first, second)
+
+    def test_should_compare_with_other_sequences(self):
+        assert [1, 2, 3, 10, 15, 7] == self.sequence
+        assert RangeSequence([range(1, 3), range(3, 4), range(10, 16, 5), range(7, 8)]) == self.sequence
+        assert (1, 2) != self.sequence
+        assert 'RangeSequence([range(1, 4), range(10, 20, 5), range(7, 8)])' == repr(self.sequence)
+
+
+class TestConversionCache:
+    """Tests class ConversionCache and the cache of parameter types"""
+
+    @pytest.mark.parametrize('maxsize', [0, -1, 1.5])
+    def test_should_raise_error_when_maxsize_is_not_a_positive_integer(self, maxsize):
+        with pytest.raises(ValueError) as exc_info:
+            ConversionCache(maxsize)
+
+        assert 'maxsize must be a positive integer' == str(exc_info.value)
+
+    def test_should_evict_least_recently_used_entries(self):
+        cache = ConversionCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert (True, 1) == cache.get('a')
+        cache.put('c', 3)
+
+        assert (False, None) == cache.get('b')
+        assert (True, 1) == cache.get('a')
+        assert (True, 3) == cache.get('c')
+        assert CacheInfo(hits=3, misses=1, maxsize=2, currsize=2) == cache.info()
+
+        cache.clear()
+        assert CacheInfo(hits=0, misses=0, maxsize=2, currsize=0) == cache.info()
+
+    def test_should_ignore_unhashable_keys(self):
+        cache = ConversionCache()
+        cache.put(['a'], 1)
+        cache.put(('a', ['b']), 1)
+
+        assert 0 == len(cache)
+        assert (False, None) == cache.get(['a'])
+        assert (False, None) == cache.get(('a', ['b']))
+
+    def test_should_cache_results_of_base_param_type(self, mocker):
+        int_type = IntType()
+        cache = int_type.enable_cache(10)
+        spy = mocker.spy(int_type, '_type')
+
+        assert 4 == int_type.convert('4', None, None)
+        assert 4 == int_type.convert('4', None, None)
+        for _ in range(2):
+            with pytest.raises(click.BadParameter) as exc_info:
+                int_type.convert('foo', None, None)
+            assert 'foo is not a valid integer' == str(exc_info.value)
+
+        assert 2 == spy.call_count
+        assert CacheInfo(hits=2, misses=2, maxsize=10, currsize=2) == cache.info()
+        assert cache is int_type.cache
+
+        int_type.disable_cache()
+        assert int_type.cache is None
+
+    def test_should_cache_results_of_validator_param_type(self):
+        calls = []
+
+        def is_even(value):
+            calls.append(value)
+            return not int(value) % 2
+
+        even_type = ValidatorParamType(is_even, 'even number')
+        even_type.enable_cache()
+        for _ in range(2):
+            assert '4' == even_type.convert('4', None, None)
+            with pytest.raises(click.BadParameter):
+                even_type.convert('5', None, None)
+
+        assert ['4', '5'] == calls
+
+    @pytest.mark.parametrize(
+        'param_type', [RangeParamType(click.INT, 1, 5), CustomParamType(), FirstOf(click.INT, click.BOOL), JSON_LINES]
+    )
+    def test_should_only_offer_cache_on_types_using_it(self, param_type):
+        assert not hasattr(param_type, 'enable_cache')
+        assert not hasattr(param_type, 'cache')
+
+    def test_should_share_cache_between_types_with_same_configuration(self):
+        cache = ConversionCache()
+        first_type, second_type = IntType(), IntType()
+        first_type.enable_cache(cache)
+        second_type.enable_cache(cache)
+
+        first_type.convert('2', None, None)
+        second_type.convert('2', None, None)
+        FRACTION.enable_cache(cache)
+        try:
+            assert Fraction(2) == FRACTION.convert('2', None, None)
+        finally:
+            FRACTION.disable_cache()
+
+        assert CacheInfo(hits=1, misses=2, maxsize=1024, currsize=2) == cache.info()
+
+    def test_should_cache_whole_expressions_of_list_param_type(self, mocker):
+        base_list = ListParamType(click.INT, name='integers')
+        cache = base_list.enable_cache(10)
+        spy = mocker.spy(base_list, '_convert_expression_to_list')
+
+        first_result = base_list.convert('1,2', None, None)
+        first_result.append(3)
+        assert [1, 2] == base_list.convert('1,2', None, None)
+        for _ in range(2):
+            with pytest.raises(click.BadParameter) as exc_info:
+                base_list.convert('1,foo', None, None)
+            assert "These items are not integers: ['foo']" == str(exc_info.value)
+
+        assert 2 == spy.call_count
+        assert CacheInfo(hits=2, misses=2, maxsize=10, currsize=2) == cache.info()
+        assert base_list.item_cache is None
+
+    def test_should_cache_items_of_list_param_type(self):
+        base_list = ListParamType(IntType(), name='integers')
+        base_list.enable_cache(item_cache=10)
+
+        assert [1, 2, 1, 1] == base_list.convert('1,2,1,1', None, None)
+        with pytest.raises(click.BadParameter) as exc_info:
+            base_list.convert('2,foo,foo', None, None)
+
+        assert "These items are not integers: ['foo', 'foo']" == str(exc_info.value)
+        assert CacheInfo(hits=4, misses=3, maxsize=10, currsize=3) == base_list.item_cache.info()
+
+        base_list.disable_cache()
+        assert base_list.cache is None
+        assert base_list.item_cache is None
+
+    def test_should_not_use_expression_cache_in_stream_mode(self):
+        base_list = ListParamType(click.INT, stream=True)
+        cache = base_list.enable_cache()
+
+        assert [1, 2] == list(base_list.convert('1,2', None, None))
+        assert 0 == len(cache)
+
+
+class TestParallelConversion:
+    """Tests the parallel conversion of ListParamType"""
+
+    @pytest.mark.parametrize('expression', ['1,2,3,4,5,6,7', '1,foo,3,bar,5,6,baz', 'foo,bar'])
+    def test_should_return_same_result_as_serial_conversion(self, expression):
+        serial_list = ListParamType(click.INT, name='integers')
+        with ThreadPoolExecutor(2) as executor:
+            parallel_list = ListParamType(
+                click.INT, name='integers', parallel=executor, parallel_threshold=2, chunk_size=2
+            )
+            try:
+                expected = serial_list.convert(expression, None, None)
+            except click.BadParameter as e:
+                with pytest.raises(click.BadParameter) as exc_info:
+                    parallel_list.convert(expression, None, None)
+                assert str(e) == str(exc_info.value)
+            else:
+                assert expected == parallel_list.convert(expression, None, None)
+
+    def test_should_not_use_executor_below_threshold(self, mocker):
+        executor = mocker.Mock()
+        base_list = ListParamType(click.INT, parallel=executor, parallel_threshold=4)
+
+        assert [1, 2, 3] == base_list.convert('1,2,3', None, None)
+        executor.map.assert_not_called()
+
+    def test_should_use_default_process_pool(self, mocker):
+        executor = ThreadPoolExecutor(1)
+        mocker.patch('click_params.base._get_default_executor', return_value=executor)
+        spy = mocker.spy(executor, 'map')
+        base_list = ListParamType(click.INT, parallel=True, parallel_threshold=1)
+
+        assert [1, 2] == base_list.convert('1,2', None, None)
+        assert 1 == spy.call_count
+        executor.shutdown()
+
+    def test_should_create_default_process_pool_once(self, mocker):
+        mocker.patch('click_params.base._default_executor', None)
+        executor = _get_default_executor()
+
+        assert isinstance(executor, ProcessPoolExecutor)
+        assert executor is _get_default_executor()
+        executor.shutdown()
+
+    def test_should_convert_items_in_worker_processes(self):
+        urls = ['https://example.com', 'foo', 'https://www.google.fr/search?q=click', 'bar']
+        with ProcessPoolExecutor(2) as executor:
+            url_list = UrlListParamType(parallel=executor, parallel_threshold=2, chunk_size=1)
+            url_list.enable_cache(item_cache=10)
+            with pytest.raises(click.BadParameter) as exc_info:
+                url_list.convert(','.join(urls), None, None)
+            assert urls[::2] == url_list.convert(','.join(urls[::2]), None, None)
+
+        assert "These items are not urls: ['foo', 'bar']" == str(exc_info.value)
+
+    def test_should_pickle_list_type_without_executor_and_cache_content(self):
+        with ThreadPoolExecutor(1) as executor:
+            base_list = ListParamType(click.INT, parallel=executor)
+            base_list.enable_cache(5, item_cache=10).put('foo', 'bar')
+            copied_list = pickle.loads(pickle.dumps(base_list))
+
+        assert copied_list._parallel is False
+        assert 5 == copied_list.cache.maxsize
+        assert 0 == len(copied_list.cache)
+        assert 10 == copied_list.item_cache.maxsize
+
+    def test_should_sort_and_deduplicate_items_with_lambdas_in_worker_processes(self):
+        duplicates = []
+        with ProcessPoolExecutor(2) as executor:
+            base_list = ListParamType(
+                click.INT,
+                parallel=executor,
+                parallel_threshold=2,
+                chunk_size=2,
+                unique=True,
+                sort=lambda item: -item,
+                on_duplicates=lambda counter: duplicates.append(dict(counter)),
+            )
+            assert [5, 4, 3, 2, 1] == base_list.convert('3,1,4,1,5,2,3', None, None)
+
+        assert [{1: 1, 3: 1}] == duplicates
+
+
+class TestErrorLimit:
+    """Tests fail_fast and max_errors options of ListParamType"""
+
+    @pytest.mark.parametrize('max_errors', [0, -2, 1.5])
+    def test_should_raise_error_when_max_errors_is_not_a_positive_integer(self, max_errors):
+        with pytest.raises(ValueError) as exc_info:
+            ListParamType(click.INT, max_errors=max_errors)
+
+        assert 'max_errors must be a positive integer' == str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        ('options', 'expression', 'message', 'call_count'),
+        [
+            (
+                {'fail_fast': True},
+                '1,foo,2,bar,baz',
+                "['foo'] (validation stopped, 3 remaining items were not checked)",
+                2,
+            ),
+            ({'fail_fast': True}, '1,2,foo,3', "['foo'] (validation stopped, 1 remaining item was not checked)", 3),
+            ({'fail_fast': True}, '1,2,foo', "['foo']", 3),
+            ({'max_errors': 2}, 'a,1,b,c,d', "['a', 'b'] (validation stopped, 2 remaining items were not checked)", 3),
+            ({'max_errors': 3}, 'a,1,b', "['a', 'b']", 3),
+        ],
+    )
+    def test_should_stop_conversion_when_error_limit_is_reached(self, mocker, options, expression, message, call_count):
+        base_list = ListParamType(click.INT, name='integers', **options)
+        spy = mocker.spy(click.INT, 'convert')
+
+        with pytest.raises(click.BadParameter) as exc_info:
+            base_list.convert(expression, None, None)
+
+        assert f'These items are not integers: {message}' == str(exc_info.value)
+        assert call_count == spy.call_count
+
+    @pytest.mark.parametrize(
+        ('max_errors', 'message'),
+        [
+            (1, "['a'] (validation stopped, 6 remaining items were not checked)"),
+            (2, "['a', 'b'] (validation stopped, 5 remaining items were not checked)"),
+            (3, "['a', 'b', 'c'] (validation stopped, 3 remaining items were not checked)"),
+        ],
+    )
+    def test_should_stop_parallel_conversion_when_error_limit_is_reached(self, max_errors, message):
+        with ThreadPoolExecutor(2) as executor:
+            base_list = ListParamType(
+                click.INT,
+                name='integers',
+                parallel=executor,
+                parallel_threshold=1,
+                chunk_size=2,
+                max_errors=max_errors,
+            )
+            with pytest.raises(click.BadParameter) as exc_info:
+                base_list.convert('1,a,b,2,c,3,d,e', None, None)
+
+        assert f'These items are not integers: {message}' == str(exc_info.value)
+
+    @pytest.mark.parametrize('max_errors', [1, 2, 3, 4])
+    @pytest.mark.parametrize('chunk_size', [1, 3, 4, 10])
+    def test_should_report_same_error_limit_message_in_parallel_and_serial_conversions(self, max_errors, chunk_size):
+        expression = '1,a,2,3,b,4,c,5,6,7'
+        with pytest.raises(click.BadParameter) as serial_info:
+            ListParamType(click.INT, max_errors=max_errors).convert(expression, None, None)
+
+        with ThreadPoolExecutor(2) as executor:
+            base_list = ListParamType(
+                click.INT, max_errors=max_errors, parallel=executor, parallel_threshold=1, chunk_size=chunk_size
+            )
+            with pytest.raises(click.BadParameter) as parallel_info:
+                base_list.convert(expression, None, None)
+
+        assert str(serial_info.value) == str(parallel_info.value)
+
+    def test_should_keep_truncated_message_in_expression_cache(self):
+        base_list = ListParamType(click.INT, name='integers', fail_fast=True)
+        base_list.enable_cache()
+
+        for _ in range(2):
+            with pytest.raises(click.BadParameter) as exc_info:
+                base_list.convert('foo,bar', None, None)
+            expected = "These items are not integers: ['foo'] (validation stopped, 1 remaining item was not checked)"
+            assert expected == str(exc_info.value)
+
+
+class TestUniqueAndSort:
+    """Tests the unique and sort options of ListParamType"""
+
+    @pytest.mark.parametrize(
+        ('options', 'expression', 'expected'),
+        [
+            ({'unique': True}, '3,1,3,2,1', [3, 1, 2]),
+            ({'sort': True}, '3,1,3,2', [1, 2, 3, 3]),
+            ({'unique': True, 'sort': True}, '3,1,3,2,1', [1, 2, 3]),
+            ({'sort': lambda item: -item}, '3,1,2', [3, 2, 1]),
+            ({'unique': True, 'parallel': True, 'parallel_threshold': 2, 'chunk_size': 2}, '3,1,3,2,1', [3, 1, 2]),
+            ({'unique': True}, '', []),
+        ],
+    )
+    def test_should_remove_duplicates_and_sort_items(self, options, expression, expected):
+        assert expected == ListParamType(click.INT, ignore_empty=True, **options).convert(expression, None, None)
+
+    def test_should_remove_duplicates_lazily_in_stream_mode(self):
+        items = ListParamType(click.INT, stream=True, unique=True).convert('1,2,1,3', None, None)
+
+        assert iter(items) is items
+        assert [1, 2, 3] == list(items)
+
+    def test_should_report_duplicate_counts(self):
+        reports = []
+        list_type = ListParamType(click.INT, unique=True, on_duplicates=reports.append)
+
+        assert [1, 2, 3] == list_type.convert('1,2,1,1,3,2', None, None)
+        assert [{1: 2, 2: 1}] == reports
+
+    def test_should_remove_unhashable_duplicates(self):
+        list_type = ListParamType(JSON, ';', unique=True)
+
+        assert [[1], {'a': 1}, 2] == list_type.convert('[1];{"a": 1};[1];2;2', None, None)
+
+    @pytest.mark.parametrize(
+        ('options', 'message'),
+        [
+            ({'stream': True, 'sort': True}, 'sort cannot be used in stream mode'),
+            ({'on_duplicates': print}, 'on_duplicates can only be used with unique'),
+        ],
+    )
+    def test_should_raise_error_when_options_are_incompatible(self, options, message):
+        with pytest.raises(ValueError) as exc_info:
+            ListParamType(click.INT, **options)
+
+        assert message == str(exc_info.value)
+
+    def test_should_use_sort_key_of_item_type(self):
+        class ReversedIntType(IntType):
+            _sort_key = staticmethod(lambda item: -item)
+
+        assert [3, 2, 1] == ListParamType(ReversedIntType(), sort=True).convert('2,3,1', None, None)
+        # range types use the key of the type they wrap
+        assert [3, 2, 1] == ListParamType(RangeParamType(ReversedIntType(), 1, 5), sort=True).convert(
+            '2,3,1', None, None
+        )
+
+    @pytest.mark.parametrize(
+        ('options', 'expected'),
+        [({'unique': True}, [3, 1, 2]), ({'sort': True}, [1, 1, 2, 3, 3]), ({'unique': True, 'sort': True}, [1, 2, 3])],
+    )
+    def test_should_arrange_numpy_arrays(self, options, expected):
+        numpy = pytest.importorskip('numpy')
+        array = IntListParamType(as_array=True, **options).convert('3,1,3,2,1', None, None)
+
+        assert isinstance(array, numpy.ndarray)
+        assert expected == array.tolist()
+
+
+class TestConvertMany:
+    """Tests the convert_many method of parameter types"""
+
+    @pytest.mark.parametrize(
+        ('param_type', 'values', 'expected'),
+        [
+            (IntType(), ['1', '2', 3], [1, 2, 3]),
+            (EvenType(), ['2', '4'], ['2', '4']),
+            (IntRange(1, 5), ['1', '5', '3'], [1, 5, 3]),
+            (IntRange(1, 5, clamp=True), ['0', '6', '3'], [1, 5, 3]),
+            (RangeParamType(click.INT, 1), ['1', '8'], [1, 8]),
+            (ListParamType(click.INT), ['1,2', '3'], [[1, 2], [3]]),
+            (IntType(), [], []),
+        ],
+    )
+    def test_should_return_converted_values(self, param_type, values, expected):
+        assert expected == param_type.convert_many(values)
+
+    @pytest.mark.parametrize(
+        ('param_type', 'values', 'message'),
+        [
+            (IntType(), ['1', 'foo', '2', 'bar'], "Invalid integer values: ['foo', 'bar']"),
+            (EvenType(), ['1', '2', '3'], "Invalid even values: ['1', '3']"),
+            (IntRange(1, 5), ['1', 'foo'], "Invalid integer values: ['foo']"),
+            (IntRange(1, 5), ['0', '3', '6'], "These values are not in the valid range of 1 to 5: ['0', '6']"),
+            (IntRange(1), ['0', '-1'], "These values are smaller than the minimum valid value 1: ['0', '-1']"),
+            (IntRange(None, 5), ['6'], "These values are bigger than the maximum valid value 5: ['6']"),
+            (RangeParamType(click.INT, 1), ['foo', 'bar'], "Invalid integer values: ['foo', 'bar']"),
+            (DecimalListParamType(), ['1,2', '3,a', 'b'], "Invalid decimal list values: ['3,a', 'b']"),
+        ],
+    )
+    def test_should_report_all_invalid_values_in_one_error(self, param_type, values, message):
+        with pytest.raises(click.BadParameter) as exc_info:
+            param_type.convert_many(values)
+
+        assert message == str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        ('param_type', 'values', 'message'),
+        [
+            (IntType(), ['2', '2', 'a', 'a'], "Invalid integer values: ['a', 'a']"),
+            (EvenType(), ['2', '2', '3', '3'], "Invalid even values: ['3', '3']"),
+        ],
+    )
+    def test_should_use_cache_when_enabled(self, param_type, values, message):
+        param_type.enable_cache()
+        with pytest.raises(click.BadParameter) as exc_info:
+            param_type.convert_many(values)
+
+        assert message == str(exc_info.value)
+        assert 2 == param_type.cache.info().hits
+
+
+class TestTryConvert:
+    """Tests the try_convert method of parameter types"""
+
+    @pytest.mark.parametrize(
+        ('param_type', 'value', 'expected'),
+        [
+            (IntType(), '4', (True, 4)),
+            (IntType(), 'foo', (False, None)),
+            (EvenType(), '4', (True, '4')),
+            (EvenType(), '5', (False, None)),
+            (IntRange(1, 5), '3', (True, 3)),
+            (IntRange(1, 5), '6', (False, None)),
+            (IntRange(1, 5), 'foo', (False, None)),
+            (IntRange(1, 5, clamp=True), '6', (True, 5)),
+            (IntRange(1, 5, clamp=True), '0', (True, 1)),
+            (ListParamType(click.INT), '1,2', (True, [1, 2])),
+            (ListParamType(click.INT), '1,a', (False, None)),
+        ],
+    )
+    def test_should_return_conversion_status_and_result(self, param_type, value, expected):
+        assert expected == param_type.try_convert(value)
+
+    @pytest.mark.parametrize('param_type', [IntType(), EvenType(), IntRange(1, 5)])
+    def test_should_not_call_fail(self, mocker, param_type):
+        fail_spy = mocker.spy(param_type, 'fail')
+
+        assert (False, None) == param_type.try_convert('foo')
+        assert 0 == fail_spy.call_count
+
+    def test_should_use_convert_of_subclasses_overriding_it(self):
+        class SmallIntType(IntType):
+            def convert(self, value, param, ctx):
+                converted_value = super().convert(value, param, ctx)
+                if converted_value > 10:
+                    self.fail(f'{value} is too big', param, ctx)
+                return converted_value
+
+        assert (True, 4) == SmallIntType().try_convert('4')
+        assert (False, None) == SmallIntType().try_convert('11')
+
+    def test_should_use_cache_when_enabled(self):
+        int_type = IntType()
+        int_type.enable_cache()
+
+        assert [(True, 2), (True, 2), (False, None), (False, None)] == [
+            int_type.try_convert(value) for value in ['2', '2', 'a', 'a']
+        ]
+        assert 2 == int_type.cache.info().hits
+
+    def test_list_type_should_convert_items_without_raising_errors(self, mocker):
+        int_type = IntType()
+        convert_spy = mocker.spy(int_type, 'convert')
+        with pytest.raises(click.BadParameter) as exc_info:
+            ListParamType(int_type, name='integers').convert('1,a,2,b', None, None)
+
+        assert "These items are not integers: ['a', 'b']" == str(exc_info.value)
+        assert 0 == convert_spy.call_count
+
+
+class TestInstrumentation:
+    """Tests the conversion statistics recorded when instrumentation is enabled"""
+
+    @pytest.fixture()
+    def stats(self):
+        yield enable_instrumentation()
+        disable_instrumentation()
+
+    def test_should_only_wrap_conversion_methods_while_enabled(self):
+        original_methods = (BaseParamType.convert, ListParamType.convert, CustomParamType.convert_many)
+        enable_instrumentation()
+
+        assert BaseParamType.convert is not original_methods[0]
+        assert BaseParamType.convert.__wrapped__ is original_methods[0]
+        disable_instrumentation()
+        assert original_methods == (BaseParamType.convert, ListParamType.convert, CustomParamType.convert_many)
+
+    def test_should_return_same_registry_while_enabled(self, stats):
+        assert isinstance(stats, ConversionStats)
+        assert stats is enable_instrumentation()
+
+    def test_should_record_conversions_per_type_and_per_parameter(self, runner, stats):
+        @click.command()
+        @click.option('-l', 'numbers', type=ListParamType(IntType(), name='integers'))
+        @click.option('-r', 'number', type=IntRange(1, 5))
+        def cli(numbers, number):
+            pass
+
+        runner.invoke(cli, ['-l', '1,2,3', '-r', '4'])
+        runner.invoke(cli, ['-l', '1,a'])
+        runner.invoke(cli, ['-r', '6'])
+        snapshot = stats.snapshot()
+
+        assert {'IntType', 'ListParamType', 'IntRange'} == set(snapshot['types'])
+        assert {'calls': 5, 'items': 4, 'failures': 1} == {
+            key: snapshot['types']['IntType'][key] for key in ('calls', 'items', 'failures')
+        }
+        assert {'calls': 2, 'items': 3, 'failures': 1} == {
+            key: snapshot['types']['ListParamType'][key] for key in ('calls', 'items', 'failures')
+        }
+        assert {'cli:numbers', 'cli:number'} == set(snapshot['parameters'])
+        assert (2, 1) == (
+            snapshot['parameters']['cli:number']['calls'],
+            snapshot['parameters']['cli:number']['failures'],
+        )
+        timer = snapshot['parameters']['cli:numbers']
+        assert 0 < timer['p50'] <= timer['p90'] <= timer['p99'] <= timer['total_time']
+
+    def test_should_measure_parent_class_methods_once(self, stats):
+        class BigIntType(IntType):
+            def convert(self, value, param, ctx):
+                return super().convert(value, param, ctx) * 1000
+
+        assert [1000, 2000] == BigIntType().convert_many(['1', '2'])
+        types = stats.snapshot()['types']
+
+        assert {'BigIntType'} == set(types)
+        assert (1, 2) == (types['BigIntType']['calls'], types['BigIntType']['items'])
+
+    def test_should_reset_statistics(self, stats):
+        IntType().convert('1', None, None)
+        stats.reset()
+
+        assert {'types': {}, 'parameters': {}} == stats.snapshot()
+
+    def test_should_record_conversions_from_many_threads(self, stats):
+        int_type = IntType()
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda value: int_type.convert(value, None, None), map(str, range(1000))))
+
+        assert 1000 == stats.snapshot()['types']['IntType']['calls']
+
+    def test_should_dump_statistics_as_json(self, tmp_path, stats):
+        IntType().convert('1', None, None)
+        path = tmp_path / 'stats.json'
+        stats.dump(path)
+
+        assert stats.snapshot() == json.loads(path.read_text())
+
+    def test_should_dump_statistics_at_exit(self):
+        code = (
+            'import click_params; click_params.enable_instrumentation(exit_hook=True); '
+            'click_params.IP_ADDRESS.convert("::1", None, None)'
+        )
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        assert 1 == json.loads(process.stderr)['types']['IpAddress']['calls']
+
+    def test_should_not_dump_statistics_at_exit_when_disabled(self):
+        code = (
+            'import click_params; click_params.enable_instrumentation(exit_hook=True); '
+            'click_params.disable_instrumentation()'
+        )
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+        assert '' == process.stderr
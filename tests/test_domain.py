@@ -156,3 +156,14 @@ def test_domain_list_param_types_ignore_empty_string(param_type):
     domain_list_type = param_type(ignore_empty=True)
 
     assert domain_list_type.convert('', None, None) == []
+
+
+@pytest.mark.parametrize(
+    ('param_type', 'expression', 'expected'),
+    [
+        (DomainListParamType(sort=True), 'a.org,B.com,A.com', ['A.com', 'a.org', 'B.com']),
+        (EmailListParamType(unique=True, sort=True), 'B@x.com,a@x.com,B@x.com', ['a@x.com', 'B@x.com']),
+    ],
+)
+def test_should_sort_domain_names_and_emails_regardless_of_case(param_type, expression, expected):
+    assert expected == param_type.convert(expression, None, None)
@@ -0,0 +1,75 @@
+import ast
+import inspect
+import subprocess
+import sys
+
+import pytest
+
+import click_params
+
+
+def test_public_names_are_unique():
+    assert len(click_params.__all__) == len(set(click_params.__all__))
+
+
+def test_type_checking_imports_match_public_names():
+    tree = ast.parse(inspect.getsource(click_params))
+    type_checking_block = next(node for node in tree.body if isinstance(node, ast.If))
+    imported_names = {
+        node.module: sorted(alias.name for alias in node.names)
+        for node in type_checking_block.body
+        if isinstance(node, ast.ImportFrom)
+    }
+
+    assert {module: sorted(names) for module, names in click_params._PUBLIC_NAMES.items()} == imported_names
+
+
+def test_import_does_not_load_third_party_dependencies():
+    code = 'import sys, click_params; print(sorted(m for m in ("validators", "deprecated") if m in sys.modules))'
+    output = subprocess.check_output([sys.executable, '-c', code], text=True)
+
+    assert '[]' == output.strip()
+
+
+def test_accessing_a_name_only_loads_its_submodule():
+    code = 'import sys, click_params; click_params.IntListParamType; print("validators" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code], text=True)
+
+    assert 'False' == output.strip()
+
+
+def test_list_types_do_not_load_multiprocessing_until_parallel_conversion():
+    code = (
+        'import sys, click_params; click_params.IntListParamType().convert("1,2", None, None); '
+        'print("multiprocessing" in sys.modules)'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code], text=True)
+
+    assert 'False' == output.strip()
+
+
+def test_json_backend_is_imported_on_first_decoding():
+    code = (
+        'import sys, click_params; json_type = click_params.JSON; loaded = "orjson" in sys.modules; '
+        'json_type.convert("[1]", None, None); print(loaded, json_type.backend == "json" or "orjson" in sys.modules)'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code], text=True)
+
+    assert 'False True' == output.strip()
+
+
+@pytest.mark.parametrize('name', click_params.__all__)
+def test_public_names_are_resolved_lazily(name):
+    module = __import__(f'click_params.{click_params._SUBMODULES[name]}', fromlist=[name])
+    assert getattr(module, name) is getattr(click_params, name)
+
+
+def test_should_raise_error_when_accessing_unknown_name():
+    with pytest.raises(AttributeError) as exc_info:
+        _ = click_params.foo
+
+    assert "module 'click_params' has no attribute 'foo'" == str(exc_info.value)
+
+
+def test_dir_lists_public_names():
+    assert set(click_params.__all__) <= set(dir(click_params))
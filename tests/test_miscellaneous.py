@@ -1,18 +1,45 @@
+import pickle
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from decimal import Decimal
+from ipaddress import ip_address
 
 import click
 import pytest
 
+from click_params.base import ListParamType
+from click_params.network import (
+    IP_ADDRESS,
+    IP_NETWORK,
+    IPV4_ADDRESS,
+    IPV4_NETWORK,
+    IPV6_ADDRESS,
+    IPV6_NETWORK,
+    IpAddressInNetworks,
+    Ipv4AddressRange,
+)
+
+from click_params.domain import DOMAIN, EMAIL, SLUG, URL
 from click_params.miscellaneous import (
     JSON,
+    JSON_LINES,
     MAC_ADDRESS,
     ChoiceListParamType,
     DateTimeListParamType,
     FirstOf,
+    JsonLinesParamType,
     JsonParamType,
     MacAddressListParamType,
+    PackedUUIDList,
     StringListParamType,
     UUIDListParamType,
+    _IndexedChoice,
+    _LearningDateTime,
+    _decode_canonical_uuids,
+    _shape_of,
+    register_json_backend,
 )
 from tests.helpers import assert_equals_output, assert_in_output
 
@@ -21,6 +48,7 @@ from tests.helpers import assert_equals_output, assert_in_output
     ('parameter', 'name'),
     [
         (JSON, 'json'),
+        (JSON_LINES, 'json lines'),
         (MAC_ADDRESS, 'mac address'),
         (StringListParamType(), 'string list'),
         (ChoiceListParamType(['a', 'b', 'c']), 'choice list'),
@@ -64,6 +92,7 @@ def test_should_print_error_when_giving_incorrect_option_for_simple_types(runner
         ),
         (UUIDListParamType(' '), 'foo a7309d0b-c858-4d54-b6e1-1c20f8c22047 142-48dr', "uuid: ['foo', '142-48dr']"),
         (DateTimeListParamType(' '), '145 2019-01-01 2019/01/01', "datetimes: ['145', '2019/01/01']"),
+        (ChoiceListParamType(['a', 'b']), 'a,c,B', "choices: ['c', 'B']"),
     ],
 )
 def test_should_print_error_when_giving_incorrect_option_for_list_types(runner, parameter, expression, message):
@@ -166,6 +195,17 @@ def test_miscellaneous_list_param_types_ignore_empty_string(param_type):
     assert misc_list_type.convert('', None, None) == []
 
 
+def test_should_sort_uuids_by_their_integer_value():
+    uuids = UUIDListParamType(unique=True, sort=True).convert(
+        'ffffffff-0000-4000-8000-000000000000,00000000-0000-4000-8000-000000000001,'
+        'FFFFFFFF-0000-4000-8000-000000000000',
+        None,
+        None,
+    )
+
+    assert ['00000000-0000-4000-8000-000000000001', 'ffffffff-0000-4000-8000-000000000000'] == list(map(str, uuids))
+
+
 def test_cli_with_multiple_similar_string_list_param_types(runner):
     @click.command()
     @click.option('-v', 'values', type=StringListParamType(','))
@@ -181,6 +221,197 @@ def test_cli_with_multiple_similar_string_list_param_types(runner):
     assert result.output == "['abc', 'def']\n"
 
 
+class TestChoiceListParamType:
+    """Tests the choice index and the shell completion of ChoiceListParamType"""
+
+    choices = ['Apple', 'banana', 'Avocado', 'apricot', 'BANANA']
+
+    @pytest.mark.parametrize(
+        ('case_sensitive', 'expression', 'expected'),
+        [
+            (True, 'Apple,banana,BANANA', ['Apple', 'banana', 'BANANA']),
+            (False, 'APPLE,Banana,apricot', ['Apple', 'BANANA', 'apricot']),
+        ],
+    )
+    def test_should_return_same_choices_as_click_choice(self, case_sensitive, expression, expected):
+        click_choice = click.Choice(self.choices, case_sensitive=case_sensitive)
+
+        assert expected == ChoiceListParamType(self.choices, case_sensitive=case_sensitive).convert(
+            expression, None, None
+        )
+        assert expected == [click_choice.convert(item, None, None) for item in expression.split(',')]
+
+    def test_should_use_token_normalize_func_of_context(self):
+        ctx = click.Context(click.Command('cli'), token_normalize_func=str.lower)
+
+        assert 'apple' == _IndexedChoice(['apple', 'banana']).convert('APPLE', None, ctx)
+
+    def test_should_not_scan_choices_to_convert_items(self, monkeypatch):
+        monkeypatch.setattr(click.Choice, 'convert', lambda *args: pytest.fail('click.Choice.convert was called'))
+
+        assert ['banana'] == ChoiceListParamType(self.choices).convert('banana', None, None)
+
+    @pytest.mark.parametrize(
+        ('case_sensitive', 'incomplete', 'expected'),
+        [
+            (True, '', ['Apple', 'banana', 'Avocado', 'apricot', 'BANANA']),
+            (True, 'A', ['Apple', 'Avocado']),
+            (True, 'banana,a', ['banana,apricot']),
+            (False, 'banana,a', ['banana,Apple', 'banana,Avocado', 'banana,apricot']),
+            (False, 'apple,AP', ['apple,Apple', 'apple,apricot']),
+            (False, 'apple,', ['apple,Apple', 'apple,banana', 'apple,Avocado', 'apple,apricot', 'apple,BANANA']),
+            (False, 'kiwi', []),
+        ],
+    )
+    def test_should_complete_last_item_of_list(self, case_sensitive, incomplete, expected):
+        choice_list = ChoiceListParamType(self.choices, case_sensitive=case_sensitive)
+
+        assert expected == [item.value for item in choice_list.shell_complete(None, None, incomplete)]
+
+
+class TestPackedUUIDList:
+    """Tests the packed mode of UUIDListParamType"""
+
+    uuids = [
+        uuid.UUID('a7309d0b-c858-4d54-b6e1-1c20f8c22047'),
+        uuid.UUID('bfa65f3c-e6ac-4844-8e09-e84535f8cdc5'),
+        uuid.UUID('00000000-0000-4000-8000-000000000001'),
+    ]
+
+    def test_should_raise_error_when_packed_is_used_in_stream_mode(self):
+        with pytest.raises(ValueError) as exc_info:
+            UUIDListParamType(packed=True, stream=True)
+
+        assert 'packed cannot be used in stream mode' == str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        ('separator', 'expression'),
+        [
+            (
+                ',',
+                'a7309d0b-c858-4d54-b6e1-1c20f8c22047,BFA65F3C-E6AC-4844-8E09-E84535F8CDC5,'
+                '00000000-0000-4000-8000-000000000001',
+            ),
+            (
+                ' ',
+                'a7309d0b-c858-4d54-b6e1-1c20f8c22047 bfa65f3c-e6ac-4844-8e09-e84535f8cdc5 '
+                '00000000-0000-4000-8000-000000000001',
+            ),
+            # forms which are not canonical are converted one by one
+            (
+                ',',
+                '{a7309d0b-c858-4d54-b6e1-1c20f8c22047}, urn:uuid:bfa65f3c-e6ac-4844-8e09-e84535f8cdc5,'
+                '00000000000040008000000000000001',
+            ),
+        ],
+    )
+    def test_should_return_packed_sequence_of_uuids(self, separator, expression):
+        packed = UUIDListParamType(separator, packed=True).convert(expression, None, None)
+
+        assert isinstance(packed, PackedUUIDList)
+        assert self.uuids == list(packed)
+        assert packed == self.uuids
+        assert self.uuids[-1] == packed[-1]
+        assert self.uuids[1:] == list(packed[1:])
+        assert isinstance(packed[::2], PackedUUIDList)
+        assert b''.join(item.bytes for item in self.uuids) == packed.tobytes()
+
+    def test_should_check_membership_with_hash_index(self):
+        packed = UUIDListParamType(packed=True).convert(','.join(map(str, self.uuids)), None, None)
+
+        assert all(item in packed for item in self.uuids + [str(item) for item in self.uuids])
+        assert uuid.UUID(int=1) not in packed
+        assert 'foo' not in packed
+        assert self.uuids[0].int not in packed
+        assert {item.bytes for item in self.uuids} == packed._index
+
+    @pytest.mark.parametrize(
+        'expression',
+        [
+            'a7309d0b-c858-4d54-b6e1-1c20f8c2 047',
+            'a7309d0b-c858-4d54-b6e1-1c20f8c2204٣',
+            'a7309d0b-c858-4d54-b6e1-1c20f8c22047;bfa65f3c-e6ac-4844-8e09-e84535f8cdc5',
+            'a7309d0b-c858-4d54-b6e1-1c20f8c22047,bfa65f3c-e6ac-4844-8e09-e84535f8cdc',
+            '{a7309d0b-c858-4d54-b6e1-1c20f8c2204}',
+        ],
+    )
+    def test_should_not_decode_expressions_which_are_not_canonical_in_one_pass(self, expression):
+        assert _decode_canonical_uuids(expression, ',') is None
+
+    def test_should_report_incorrect_items_in_packed_mode(self):
+        with pytest.raises(click.BadParameter) as exc_info:
+            UUIDListParamType(packed=True).convert('a7309d0b-c858-4d54-b6e1-1c20f8c22047,foo,a7309d0b-c858', None, None)
+
+        assert "These items are not uuid: ['foo', 'a7309d0b-c858']" == str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        ('options', 'expression', 'expected'),
+        [
+            ({'ignore_empty': True}, '', []),
+            (
+                {'unique': True, 'sort': True},
+                'bfa65f3c-e6ac-4844-8e09-e84535f8cdc5,00000000-0000-4000-8000-000000000001,'
+                'bfa65f3c-e6ac-4844-8e09-e84535f8cdc5',
+                ['00000000-0000-4000-8000-000000000001', 'bfa65f3c-e6ac-4844-8e09-e84535f8cdc5'],
+            ),
+        ],
+    )
+    def test_should_combine_packed_mode_with_list_options(self, options, expression, expected):
+        packed = UUIDListParamType(packed=True, **options).convert(expression, None, None)
+
+        assert isinstance(packed, PackedUUIDList)
+        assert expected == list(map(str, packed))
+
+
+class TestDateTimeListParamType:
+    """Tests the format learning and the iso fast path of DateTimeListParamType"""
+
+    @pytest.mark.parametrize(
+        ('formats', 'expression'),
+        [
+            (None, '2019-01-01,2019-01-01T12:30:00,2019-01-01 12:30:00,2019-02-30,2019-01-01T24:00:00,2019-1-1'),
+            (None, '2019-01-01 00:00:60,2019-01-01  12:30:00,2019-01-01t12:30:00,٢٠١٩-01-01,0000-01-01'),
+            # dates matching both formats must be parsed with the first one, even after a date only matching the second
+            (['%d/%m/%Y', '%m/%d/%Y'], '12/25/2019,01/02/2019,25/12/2019,13/13/2019'),
+            (['%Y-%m-%d %H:%M', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S'], '2019-01-01 12:30:00,2019-01-01 12:30,2019-01-01'),
+            (['%b %d %Y', '%Y-%m-%d'], '2019-01-01,Jan 02 2019,2019-01-03'),
+        ],
+    )
+    def test_should_give_same_results_and_errors_as_click_datetime(self, formats, expression):
+        def convert_items(datetime_type):
+            results = []
+            for item in expression.split(','):
+                try:
+                    results.append(datetime_type.convert(item, None, None))
+                except click.BadParameter as e:
+                    results.append(str(e))
+            return results
+
+        assert convert_items(click.DateTime(formats)) == convert_items(_LearningDateTime(formats))
+
+    def test_should_try_format_of_previous_value_first(self, monkeypatch):
+        tried_indices = []
+        parse = _LearningDateTime._parse
+
+        def spy(self, value, index):
+            tried_indices.append(index)
+            return parse(self, value, index)
+
+        monkeypatch.setattr(_LearningDateTime, '_parse', spy)
+        datetime_list = DateTimeListParamType(formats=['%d/%m/%Y', '%Y/%m/%d %H:%M'])
+
+        values = datetime_list.convert('2019/01/02 10:00,2019/01/03 11:00,03/01/2019', None, None)
+
+        assert [datetime(2019, 1, 2, 10), datetime(2019, 1, 3, 11), datetime(2019, 1, 3)] == values
+        assert [0, 1, 1, 0] == tried_indices
+
+    def test_should_report_invalid_datetimes(self):
+        with pytest.raises(click.BadParameter) as exc_info:
+            DateTimeListParamType().convert('2019-01-01,2019-02-30,foo', None, None)
+
+        assert "These items are not datetimes: ['2019-02-30', 'foo']" == str(exc_info.value)
+
+
 class TestJsonParamType:
     """Tests JsonParamType specific cases"""
 
@@ -199,6 +430,259 @@ class TestJsonParamType:
             object_pairs_hook=None,
         )
 
+    @pytest.mark.parametrize(
+        ('options', 'backend'),
+        [
+            ({}, 'orjson'),
+            ({'backend': 'orjson'}, 'orjson'),
+            ({'backend': 'json'}, 'json'),
+            ({'backend': 'orjson', 'parse_float': Decimal}, 'json'),
+            ({'object_pairs_hook': dict}, 'json'),
+            ({'strict': False}, 'json'),
+        ],
+    )
+    def test_should_select_json_backend(self, options, backend):
+        pytest.importorskip('orjson')
+
+        assert backend == JsonParamType(**options).backend
+
+    def test_should_use_json_module_when_no_fast_backend_is_installed(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, 'orjson', None)
+
+        assert 'json' == JsonParamType().backend
+        with pytest.raises(ValueError) as exc_info:
+            JsonParamType(backend='orjson')
+
+        assert 'json backend orjson is not installed' == str(exc_info.value)
+
+    def test_should_raise_error_when_backend_is_unknown(self):
+        with pytest.raises(ValueError) as exc_info:
+            JsonParamType(backend='foo')
+
+        assert 'unknown json backend: foo' == str(exc_info.value)
+
+    @pytest.mark.parametrize('backend', ['json', 'orjson'])
+    @pytest.mark.parametrize(
+        ('value', 'expected'),
+        [
+            ('{"a": [1, 2.5, null, true]}', {'a': [1, 2.5, None, True]}),
+            ('"\\u00e9t\\u00e9"', 'été'),
+            # documents rejected by orjson but accepted by the json module
+            ('[NaN]', [float('nan')]),
+            (str(2**70), 2**70),
+            ('[0.0012345678901234567, 1e400]', [0.0012345678901234567, float('inf')]),
+            (
+                f'{{"id": {-(2**63) - 1}, "name": "1234567890123456789"}}',
+                {'id': -(2**63) - 1, 'name': '1234567890123456789'},
+            ),
+        ],
+    )
+    def test_should_return_same_value_with_all_backends(self, backend, value, expected):
+        pytest.importorskip('orjson')
+        result = JsonParamType(backend=backend).convert(value, None, None)
+
+        assert repr(expected) == repr(result)
+
+    @pytest.mark.parametrize('backend', ['json', 'orjson'])
+    @pytest.mark.parametrize('value', ['{"a": }', '[1, 2', '2f', ''])
+    def test_should_report_same_error_with_all_backends(self, backend, value):
+        pytest.importorskip('orjson')
+        with pytest.raises(click.BadParameter) as exc_info:
+            JsonParamType(backend=backend).convert(value, None, None)
+
+        assert f'{value} is not a valid json string' == str(exc_info.value)
+
+    @pytest.mark.parametrize('backend', ['json', 'orjson'])
+    @pytest.mark.parametrize(('value', 'expected'), [('[1, 2]', (True, [1, 2])), ('[1, 2', (False, None))])
+    def test_should_try_to_convert_value_without_raising_error(self, backend, value, expected):
+        pytest.importorskip('orjson')
+
+        assert expected == JsonParamType(backend=backend).try_convert(value)
+
+    def test_should_use_registered_backend(self, monkeypatch):
+        monkeypatch.setattr('click_params.miscellaneous._JSON_BACKENDS', {})
+        decoded_values = []
+
+        def loads(value):
+            decoded_values.append(value)
+            if value == 'invalid':
+                raise KeyError(value)
+            return value
+
+        register_json_backend('fake', loads, KeyError)
+        json_type = JsonParamType()
+
+        assert 'fake' == json_type.backend
+        assert 'foo' == json_type.convert('foo', None, None)
+        with pytest.raises(click.BadParameter):
+            json_type.convert('invalid', None, None)
+        assert ['foo', 'invalid'] == decoded_values
+
+    @pytest.mark.parametrize('backend', ['json', 'orjson'])
+    def test_should_pickle_json_type_with_its_backend(self, backend):
+        pytest.importorskip('orjson')
+        json_type = pickle.loads(pickle.dumps(JsonParamType(backend=backend)))
+
+        assert backend == json_type.backend
+        assert {'a': [1, 2**70]} == json_type.convert(f'{{"a": [1, {2**70}]}}', None, None)
+
+    def test_should_fall_back_to_json_module_when_unpickled_backend_is_unknown(self, monkeypatch):
+        monkeypatch.setattr('click_params.miscellaneous._JSON_BACKENDS', {})
+        register_json_backend('fake', str.strip)
+        data = pickle.dumps(JsonParamType(backend='fake'))
+        monkeypatch.setattr('click_params.miscellaneous._JSON_BACKENDS', {})
+        json_type = pickle.loads(data)
+
+        assert 'json' == json_type.backend
+        assert [1] == json_type.convert('[1]', None, None)
+
+    def test_should_convert_json_items_in_worker_processes(self):
+        with ProcessPoolExecutor(2) as executor:
+            json_list = ListParamType(JSON, separator=';', parallel=executor, parallel_threshold=2, chunk_size=1)
+
+            assert [[1], {'a': 2}] == json_list.convert('[1];{"a": 2}', None, None)
+
+
+class TestJsonLinesParamType:
+    """Tests JsonLinesParamType"""
+
+    @pytest.mark.parametrize(
+        ('value', 'records'),
+        [
+            ('{"a": 1}\n{"b": [1, 2]}\n', [{'a': 1}, {'b': [1, 2]}]),
+            ('{"a": 1}\r\n\r\n{"b": 2}', [{'a': 1}, {'b': 2}]),
+            ('{"a": 1}{"b": 2} 3 "foo" null\n', [{'a': 1}, {'b': 2}, 3, 'foo', None]),
+            ('{\n  "a": [\n    1,\n    2\n  ]\n}\n[3]', [{'a': [1, 2]}, [3]]),
+            ('', []),
+            (' \n\t', []),
+        ],
+    )
+    def test_should_return_iterator_of_records(self, value, records):
+        result = JSON_LINES.convert(value, None, None)
+
+        assert iter(result) is result
+        assert records == list(result)
+
+    @pytest.mark.parametrize(
+        ('value', 'message'),
+        [
+            ('{"a": 1}\n{"b": }\n', 'invalid json record at line 2 (offset 15): Expecting value'),
+            ('1 2 tru\n', 'invalid json record at line 1 (offset 4): Expecting value'),
+            ('1\n[1,\n2', "invalid json record at line 3 (offset 7): Expecting ',' delimiter"),
+            ('{"a": 1}\n{"b"', "invalid json record at line 2 (offset 13): Expecting ':' delimiter"),
+        ],
+    )
+    def test_should_report_position_of_first_invalid_record(self, value, message):
+        records = JSON_LINES.convert(value, None, None)
+        with pytest.raises(click.BadParameter) as exc_info:
+            list(records)
+
+        assert message == str(exc_info.value)
+
+    def test_should_decode_records_on_demand(self):
+        records = JSON_LINES.convert('1\n2\nfoo\n', None, None)
+
+        assert [1, 2] == [next(records), next(records)]
+        with pytest.raises(click.BadParameter):
+            next(records)
+
+    def test_should_use_decoder_hooks(self):
+        json_lines = JsonLinesParamType(parse_float=Decimal, object_pairs_hook=list)
+
+        assert [[('a', Decimal('1.5'))], Decimal('2.5')] == list(json_lines.convert('{"a": 1.5}\n2.5', None, None))
+
+    def test_should_return_value_when_it_is_already_converted(self):
+        records = [{'a': 1}]
+
+        assert records is JSON_LINES.convert(records, None, None)
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+    def test_should_read_records_from_file_in_chunks(self, mocker, tmp_path, chunk_size):
+        mocker.patch('click_params.base.CHUNK_SIZE', chunk_size)
+        path = tmp_path / 'records.jsonl'
+        path.write_text('{"name": "été"}\n{\n  "id": 12345\n}\n"foo\\nbar"', encoding='utf-8')
+        json_lines = JsonLinesParamType(file_source=True)
+
+        assert [{'name': 'été'}, {'id': 12345}, 'foo\nbar'] == list(json_lines.convert(f'@{path}', None, None))
+
+    def test_should_decode_concatenated_records_without_reading_all_chunks(self):
+        read_chunks = []
+
+        def chunks():
+            for index in range(5):
+                read_chunks.append(index)
+                yield f'{{"n": {index}}}'
+
+        records = JSON_LINES._iter_records(chunks(), None, None)
+
+        assert {'n': 0} == next(records)
+        assert [0] == read_chunks
+        assert [{'n': index} for index in range(1, 5)] == list(records)
+
+    @pytest.mark.parametrize(
+        'value',
+        [
+            '{"a": [1.5e3, true]}12 345 -Infinity"\\u00e9t\\u00e9"null[-0.25]',
+            '1.5 2e3 -0.25E-2 1.5e+3 7{"a": 1}',
+            '{"a": 1}\n{"b": }',
+            '1 2 tru 3',
+        ],
+    )
+    def test_should_return_same_result_whatever_the_chunks(self, value):
+        def decode(chunks):
+            try:
+                return list(JSON_LINES._iter_records(chunks, None, None))
+            except click.BadParameter as e:
+                return str(e)
+
+        expected = decode([value])
+        for size in range(1, len(value) + 1):
+            assert expected == decode(value[index : index + size] for index in range(0, len(value), size))
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 5, 7, 1024])
+    def test_should_read_numbers_split_across_chunks(self, mocker, tmp_path, chunk_size):
+        mocker.patch('click_params.base.CHUNK_SIZE', chunk_size)
+        path = tmp_path / 'records.json'
+        path.write_text('  ' + ' '.join(['1.5', '-2.25e-3', '12345', '1E+2'] * 5), encoding='utf-8')
+        json_lines = JsonLinesParamType(file_source=True)
+
+        assert [1.5, -0.00225, 12345, 100.0] * 5 == list(json_lines.convert(f'@{path}', None, None))
+
+    def test_should_report_position_of_invalid_record_in_file(self, mocker, tmp_path):
+        mocker.patch('click_params.base.CHUNK_SIZE', 16)
+        path = tmp_path / 'records.jsonl'
+        path.write_text(''.join(f'{{"id": {index}}}\n' for index in range(100)) + '{"id": }\n{"id": 101}\n')
+        records = JsonLinesParamType(file_source=True).convert(f'@{path}', None, None)
+        with pytest.raises(click.BadParameter) as exc_info:
+            list(records)
+
+        assert 'invalid json record at line 101 (offset 1097): Expecting value' == str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        ('content', 'message'),
+        [(None, 'unable to read {path}: No such file or directory'), (b'"\xff"', '{path} is not a valid utf-8 file')],
+    )
+    def test_should_report_file_errors(self, tmp_path, content, message):
+        path = tmp_path / 'records.jsonl'
+        if content is not None:
+            path.write_bytes(content)
+        records = JsonLinesParamType(file_source=True).convert(f'@{path}', None, None)
+        with pytest.raises(click.BadParameter) as exc_info:
+            list(records)
+
+        assert message.format(path=path) == str(exc_info.value)
+
+    def test_should_read_records_from_standard_input(self, runner):
+        @click.command()
+        @click.option('-r', 'records', type=JsonLinesParamType(file_source=True))
+        def cli(records):
+            for record in records:
+                click.echo(record['id'])
+
+        result = runner.invoke(cli, ['-r', '@-'], input='{"id": 1}\n{"id": 2}\n')
+
+        assert_equals_output(0, '1\n2\n', result)
+
 
 class TestFirstOf:
     """Test class FirstOf"""
@@ -257,3 +741,94 @@ class TestFirstOf:
         union_type = FirstOf(*param_types)
         with pytest.raises(click.BadParameter, match=r'.*\n -  '.join(p.name.upper() for p in param_types)):
             union_type.convert(expression, None, None)
+
+    @pytest.mark.parametrize(
+        'expression',
+        ['1.2.3.4', '::1', 'example.com', 'https://example.com', 'foo@example.com', '12', 'auto', 'bla', ''],
+    )
+    @pytest.mark.parametrize('return_param', [False, True])
+    def test_should_give_same_result_in_adaptive_mode(self, expression, return_param):
+        param_types = (click.Choice(['auto', 'full']), IP_ADDRESS, click.INT, DOMAIN, URL, EMAIL)
+        try:
+            expected = FirstOf(*param_types, return_param=return_param).convert(expression, None, None)
+        except click.BadParameter as e:
+            with pytest.raises(click.BadParameter) as exc_info:
+                FirstOf(*param_types, return_param=return_param, adaptive=True).convert(expression, None, None)
+            assert str(e) == str(exc_info.value)
+        else:
+            assert expected == FirstOf(*param_types, return_param=return_param, adaptive=True).convert(
+                expression, None, None
+            )
+
+    def test_should_skip_types_which_cannot_convert_value_in_adaptive_mode(self, mocker):
+        ip_spy = mocker.spy(IP_ADDRESS, 'convert')
+        email_spy = mocker.spy(EMAIL, 'convert')
+        union_type = FirstOf(IP_ADDRESS, EMAIL, URL, adaptive=True)
+
+        assert 'https://example.com' == union_type.convert('https://example.com', None, None)
+        assert 0 == ip_spy.call_count
+        assert 0 == email_spy.call_count
+
+    def test_should_not_skip_types_for_values_which_are_not_strings_in_adaptive_mode(self):
+        union_type = FirstOf(IP_ADDRESS, click.INT, adaptive=True)
+
+        assert ip_address(1) == union_type.convert(1, None, None)
+
+    @pytest.mark.parametrize(
+        'param_type',
+        [
+            IP_ADDRESS,
+            IPV4_ADDRESS,
+            IPV6_ADDRESS,
+            IP_NETWORK,
+            IPV4_NETWORK,
+            IPV6_NETWORK,
+            IpAddressInNetworks(['0.0.0.0/0', '::/0']),
+            Ipv4AddressRange(),
+            DOMAIN,
+            URL,
+            EMAIL,
+            SLUG,
+            MAC_ADDRESS,
+            click.INT,
+            click.IntRange(0, 10),
+        ],
+    )
+    def test_shapes_should_match_all_convertible_values(self, param_type):
+        values = [
+            '1.2.3.4',
+            '10.0.0.0/8',
+            '10.0.0.0/255.0.0.0',
+            '::1',
+            'fe80::1%eth0',
+            '2001:db8::/32',
+            'example.com',
+            'пример.рф',
+            '例え。テスト',
+            'https://example.com/path',
+            'HTTP://example.com',
+            'foo@example.com',
+            'my-slug',
+            '01:23:45:67:ab:cd',
+            '01-23-45-67-AB-CD',
+            '12',
+            ' 7 ',
+            '1_000',
+            '١٢',
+            '-3',
+        ]
+        shape = _shape_of(param_type)
+        assert shape is not None
+        for value in values:
+            try:
+                param_type.convert(value, None, None)
+            except click.BadParameter:
+                continue
+            assert shape.match(value) is not None, value
+
+    def test_should_not_raise_errors_for_types_which_do_not_accept_value(self, mocker):
+        ip_fail_spy = mocker.spy(IP_ADDRESS, 'fail')
+        union_type = FirstOf(IP_ADDRESS, click.INT)
+
+        assert 12 == union_type.convert('12', None, None)
+        assert 0 == ip_fail_spy.call_count
@@ -1,4 +1,5 @@
-from ipaddress import IPv4Address, IPv6Address
+import sys
+from ipaddress import IPv4Address, IPv4Network, IPv6Address, IPv6Network, ip_address, ip_network
 
 import click
 import pytest
@@ -10,14 +11,21 @@ from click_params.network import (
     IPV4_NETWORK,
     IPV6_ADDRESS,
     IPV6_NETWORK,
+    IpAddressInNetworks,
+    IpAddressInNetworksListParamType,
     IpAddressListParamType,
     IpNetworkListParamType,
     Ipv4AddressListParamType,
     Ipv4AddressRange,
+    Ipv4AddressSequence,
     Ipv4NetworkListParamType,
     Ipv6AddressListParamType,
     Ipv6AddressRange,
+    Ipv6AddressSequence,
     Ipv6NetworkListParamType,
+    IpNetworkSet,
+    PackedIpv4AddressList,
+    PackedIpv6AddressList,
 )
 from tests.helpers import assert_equals_output, assert_in_output
 
@@ -278,3 +286,390 @@ def test_network_list_param_types_ignore_empty_string(param_type):
     network_list_type = param_type(ignore_empty=True)
 
     assert network_list_type.convert('', None, None) == []
+
+
+def test_should_convert_items_lazily_when_using_stream_mode(runner):
+    @click.command()
+    @click.option('-i', 'ips', type=IpAddressListParamType(stream=True))
+    def cli(ips):
+        for ip in ips:
+            click.echo(ip)
+
+    result = runner.invoke(cli, ['-i', '192.168.1.1,::1'])
+    assert_equals_output(0, '192.168.1.1\n::1\n', result)
+
+    result = runner.invoke(cli, ['-i', '192.168.1.1,foo,::1'])
+    assert_in_output(2, '192.168.1.1\n', result)
+    assert_in_output(2, "Invalid value for '-i': These items are not ip addresses: ['foo']", result)
+    assert '::1' not in result.output
+
+
+@pytest.mark.parametrize(
+    ('param_type', 'expression', 'expected'),
+    [
+        (IpAddressListParamType(unique=True, sort=True), '::1,10.0.0.2,::1,10.0.0.1', ['10.0.0.1', '10.0.0.2', '::1']),
+        (Ipv4AddressListParamType(sort=True), '10.0.0.10,10.0.0.9', ['10.0.0.9', '10.0.0.10']),
+        (
+            IpNetworkListParamType(sort=True),
+            '::/0,10.0.0.0/16,10.0.0.0/8,9.0.0.0/8',
+            ['9.0.0.0/8', '10.0.0.0/8', '10.0.0.0/16', '::/0'],
+        ),
+        (
+            IpAddressInNetworksListParamType(['0.0.0.0/0', '::/0'], sort=True),
+            '::2,1.1.1.1,::1',
+            ['1.1.1.1', '::1', '::2'],
+        ),
+    ],
+)
+def test_should_sort_ipv4_and_ipv6_values_together(param_type, expression, expected):
+    assert expected == [str(value) for value in param_type.convert(expression, None, None)]
+
+
+class TestPackedAddressLists:
+    """Tests the packed mode of Ipv4AddressListParamType and Ipv6AddressListParamType"""
+
+    @pytest.mark.parametrize(
+        ('parameter', 'packed_type', 'addresses', 'missing'),
+        [
+            (
+                Ipv4AddressListParamType(packed=True),
+                PackedIpv4AddressList,
+                ['10.0.0.1', '8.8.8.8', '127.0.0.1'],
+                '1.1.1.1',
+            ),
+            (Ipv6AddressListParamType(packed=True), PackedIpv6AddressList, ['::1', 'fe80::1', '2001:db8::'], '::2'),
+        ],
+    )
+    def test_should_return_packed_sequence_of_addresses(self, parameter, packed_type, addresses, missing):
+        packed = parameter.convert(','.join(addresses), None, None)
+        expected = [ip_address(address) for address in addresses]
+
+        assert isinstance(packed, packed_type)
+        assert 3 == len(packed)
+        assert expected == list(packed)
+        assert packed == expected
+        assert expected[1] == packed[1]
+        assert expected[-1] == packed[-1]
+        assert expected[1:] == list(packed[1:])
+        assert expected[::-2] == list(packed[::-2])
+        assert isinstance(packed[1:], packed_type)
+        assert all(address in packed for address in addresses + expected)
+        assert missing not in packed
+        assert 'foo' not in packed
+        assert packed is parameter.convert(packed, None, None)
+        with pytest.raises(IndexError):
+            _ = packed[3]
+
+    def test_should_expose_ipv4_addresses_as_32_bit_integers(self):
+        packed = Ipv4AddressListParamType(packed=True).convert('0.0.0.1,1.0.0.0', None, None)
+
+        assert [1, 2**24] == packed.buffer.tolist()
+        assert 8 == len(packed.tobytes())
+        assert packed.buffer.readonly
+
+    def test_should_expose_ipv6_addresses_as_packed_bytes(self):
+        packed = Ipv6AddressListParamType(packed=True).convert('::1,::2', None, None)
+
+        assert IPv6Address('::1').packed + IPv6Address('::2').packed == packed.tobytes()
+        # an address must be aligned on a 16-byte boundary to be found
+        assert IPv6Address('::100').packed in packed.tobytes()
+        assert '::100' not in packed
+
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason='the buffer protocol is only available in python 3.12+')
+    def test_should_support_buffer_protocol(self):
+        packed = Ipv4AddressListParamType(packed=True).convert('0.0.0.1,0.0.0.2', None, None)
+
+        assert [1, 2] == memoryview(packed).tolist()
+
+    @pytest.mark.parametrize(
+        ('parameter', 'packed_type'),
+        [
+            (Ipv4AddressListParamType(packed=True, ignore_empty=True), PackedIpv4AddressList),
+            (Ipv6AddressListParamType(packed=True, ignore_empty=True), PackedIpv6AddressList),
+        ],
+    )
+    def test_should_return_empty_packed_sequence_with_ignore_empty_string(self, parameter, packed_type):
+        packed = parameter.convert('', None, None)
+
+        assert isinstance(packed, packed_type)
+        assert 0 == len(packed)
+
+    def test_should_report_incorrect_items_in_packed_mode(self):
+        with pytest.raises(click.BadParameter) as exc_info:
+            Ipv4AddressListParamType(packed=True).convert('10.0.0.1,foo,::1', None, None)
+
+        assert "These items are not ipv4 addresses: ['foo', '::1']" == str(exc_info.value)
+
+    @pytest.mark.parametrize('param_class', [Ipv4AddressListParamType, Ipv6AddressListParamType])
+    def test_should_raise_error_when_packed_is_used_in_stream_mode(self, param_class):
+        with pytest.raises(ValueError) as exc_info:
+            param_class(packed=True, stream=True)
+
+        assert 'packed cannot be used in stream mode' == str(exc_info.value)
+
+
+class TestAddressRanges:
+    """Tests the ranges option of Ipv4AddressListParamType and Ipv6AddressListParamType"""
+
+    @pytest.mark.parametrize(
+        ('parameter', 'sequence_type', 'expression', 'segments'),
+        [
+            (
+                Ipv4AddressListParamType(ranges=True),
+                Ipv4AddressSequence,
+                '10.0.0.1,10.0.1.0/24,192.168.1.10-192.168.1.20',
+                [('10.0.0.1', '10.0.0.1'), ('10.0.1.1', '10.0.1.254'), ('192.168.1.10', '192.168.1.20')],
+            ),
+            (
+                Ipv6AddressListParamType(ranges=True),
+                Ipv6AddressSequence,
+                '::1-::3,2001:db8::/126,fe80::1',
+                [('::1', '::3'), ('2001:db8::1', '2001:db8::3'), ('fe80::1', 'fe80::1')],
+            ),
+        ],
+    )
+    def test_should_return_sequence_of_address_ranges(self, parameter, sequence_type, expression, segments):
+        sequence = parameter.convert(expression, None, None)
+        expected = [range(int(ip_address(first)), int(ip_address(last)) + 1) for first, last in segments]
+
+        assert isinstance(sequence, sequence_type)
+        assert tuple(expected) == sequence.segments
+        assert sum(map(len, expected)) == len(sequence)
+        assert ip_address(segments[1][0]) == sequence[len(expected[0])]
+        assert all(ip_address(address) in sequence for pair in segments for address in pair)
+        assert segments[1][0] in sequence
+        assert 'foo' not in sequence
+
+    @pytest.mark.parametrize('network', ['10.0.0.0/29', '10.0.0.0/31', '10.0.0.0/32', '::/125', '::/127', '::/128'])
+    def test_should_expand_networks_to_their_hosts(self, network):
+        parameter = Ipv4AddressListParamType(ranges=True) if '.' in network else Ipv6AddressListParamType(ranges=True)
+
+        assert list(ip_network(network).hosts()) == list(parameter.convert(network, None, None))
+
+    def test_should_not_materialize_big_networks(self):
+        sequence = Ipv6AddressListParamType(ranges=True).convert('2001:db8::/32', None, None)
+
+        assert '2001:db8:1234::1' in sequence
+        assert '2001:db9::' not in sequence
+        assert IPv6Address('2001:db8:ffff:ffff:ffff:ffff:ffff:ffff') == sequence[-1]
+        with pytest.raises(OverflowError):
+            len(sequence)
+
+    def test_should_summarize_ranges_as_networks(self):
+        sequence = Ipv4AddressListParamType(ranges=True).convert('10.0.0.0-10.0.0.5,8.8.8.8', None, None)
+
+        assert (IPv4Network('10.0.0.0/30'), IPv4Network('10.0.0.4/31'), IPv4Network('8.8.8.8/32')) == sequence.networks
+
+    def test_should_report_invalid_ranges_and_networks(self):
+        with pytest.raises(click.BadParameter) as exc_info:
+            Ipv4AddressListParamType(ranges=True).convert(
+                '10.0.0.9-10.0.0.1,10.0.0.1/24,10.0.0.0/33,1.1.1.1-foo,::1,1.1.1.1', None, None
+            )
+
+        assert (
+            "These items are not ipv4 addresses: ['10.0.0.9-10.0.0.1', '10.0.0.1/24', '10.0.0.0/33', '1.1.1.1-foo', '::1']"
+            == str(exc_info.value)
+        )
+
+    @pytest.mark.parametrize('ranges', [False, True])
+    def test_should_check_bounds_of_addresses_ranges_and_networks(self, ranges):
+        parameter = Ipv4AddressListParamType(
+            ranges=ranges, minimum=IPv4Address('10.0.0.0'), maximum=IPv4Address('10.255.255.255')
+        )
+        expression = '10.0.0.1,9.0.0.1,11.0.0.1' + (',10.0.0.0/8,11.0.0.0/24,9.255.255.255-10.0.0.5' if ranges else '')
+        with pytest.raises(click.BadParameter) as exc_info:
+            parameter.convert(expression, None, None)
+
+        expected_errors = ['9.0.0.1', '11.0.0.1'] + (['11.0.0.0/24', '9.255.255.255-10.0.0.5'] if ranges else [])
+        assert f'These items are not ipv4 addresses: {expected_errors}' == str(exc_info.value)
+
+    def test_should_reject_scoped_addresses(self):
+        parameter = Ipv6AddressListParamType(ranges=True)
+        with pytest.raises(click.BadParameter) as exc_info:
+            parameter.convert('fe80::1%eth0,fe80::1,fe80::1%1-fe80::2', None, None)
+
+        assert "These items are not ipv6 addresses: ['fe80::1%eth0', 'fe80::1%1-fe80::2']" == str(exc_info.value)
+        with pytest.raises(click.BadParameter) as exc_info:
+            parameter._param_type.convert('fe80::1%eth0', None, None)
+        assert 'fe80::1%eth0 is a scoped address, ranges of ipv6 addresses cannot keep its scope id' == str(
+            exc_info.value
+        )
+
+    @pytest.mark.parametrize(
+        ('options', 'value', 'message'),
+        [
+            (
+                {},
+                '10.0.0.9-10.0.0.1',
+                '10.0.0.9-10.0.0.1 is not a valid ipv4 address, range of ipv4 addresses or network',
+            ),
+            (
+                {'maximum': IPv4Address('10.255.255.255')},
+                '10.0.0.0/33',
+                '10.0.0.0/33 is not a valid ipv4 address, range of ipv4 addresses or network',
+            ),
+            (
+                {'minimum': IPv4Address('10.0.0.0'), 'maximum': IPv4Address('10.255.255.255')},
+                '10.0.0.1-11.0.0.1',
+                '11.0.0.1 is not in the valid range of 10.0.0.0 to 10.255.255.255.',
+            ),
+            (
+                {'minimum': IPv4Address('10.0.0.0')},
+                '9.0.0.0/24',
+                '9.0.0.1 is smaller than the minimum valid value 10.0.0.0.',
+            ),
+        ],
+    )
+    def test_should_report_why_a_range_is_invalid(self, options, value, message):
+        parameter = Ipv4AddressListParamType(ranges=True, **options)
+        with pytest.raises(click.BadParameter) as exc_info:
+            parameter._param_type.convert(value, None, None)
+
+        assert message == str(exc_info.value)
+
+    def test_should_yield_addresses_in_stream_mode(self):
+        items = Ipv6AddressListParamType(ranges=True, stream=True).convert('::1-::2,::/127', None, None)
+
+        assert [IPv6Address('::1'), IPv6Address('::2'), IPv6Address('::'), IPv6Address('::1')] == list(items)
+
+    @pytest.mark.parametrize('options', [{'packed': True}, {'unique': True}, {'sort': True}])
+    def test_should_raise_error_when_options_are_incompatible(self, options):
+        with pytest.raises(ValueError) as exc_info:
+            Ipv4AddressListParamType(ranges=True, **options)
+
+        assert 'ranges cannot be used with packed, unique or sort' == str(exc_info.value)
+
+
+class TestIpNetworkSet:
+    """Tests the collapse mode of network list types"""
+
+    @pytest.mark.parametrize(
+        ('parameter', 'expression', 'networks', 'merged_count'),
+        [
+            (
+                IpNetworkListParamType(collapse=True),
+                '192.168.0.0/16,10.0.1.0/24,10.0.0.0/24,192.168.1.0/24,::2/128,::/127',
+                ['10.0.0.0/23', '192.168.0.0/16', '::/127', '::2/128'],
+                2,
+            ),
+            (Ipv4NetworkListParamType(collapse=True), '10.0.0.0/24,10.0.2.0/24', ['10.0.0.0/24', '10.0.2.0/24'], 0),
+            (Ipv6NetworkListParamType(collapse=True), '::/127,::/128', ['::/127'], 1),
+        ],
+    )
+    def test_should_return_collapsed_networks(self, parameter, expression, networks, merged_count):
+        network_set = parameter.convert(expression, None, None)
+
+        assert isinstance(network_set, IpNetworkSet)
+        assert [ip_network(network) for network in networks] == list(network_set)
+        assert len(networks) == len(network_set)
+        assert merged_count == network_set.merged_count
+        assert len(expression.split(',')) == network_set.input_count
+        assert network_set is parameter.convert(network_set, None, None)
+
+    @pytest.mark.parametrize(
+        ('value', 'expected'),
+        [
+            ('10.0.0.0', True),
+            ('10.0.2.255', True),
+            ('10.0.3.0', False),
+            ('9.255.255.255', False),
+            (IPv4Address('192.168.10.1'), True),
+            ('10.0.0.0/22', False),
+            ('10.0.1.0/24', True),
+            (IPv4Network('10.0.0.0/23'), True),
+            ('::1', True),
+            (IPv6Address('::2'), False),
+            (IPv6Network('::/127'), True),
+            ('::/126', False),
+            ('foo', False),
+            (1, False),
+        ],
+    )
+    def test_should_check_membership_of_addresses_and_networks(self, value, expected):
+        network_set = IpNetworkSet(
+            [ip_network('10.0.0.0/23'), ip_network('10.0.2.0/24'), ip_network('192.168.0.0/16'), ip_network('::/127')]
+        )
+
+        assert expected is (value in network_set)
+
+    def test_should_compare_network_sets(self):
+        first_set = IpNetworkSet([ip_network('10.0.0.0/24'), ip_network('10.0.1.0/24')])
+
+        assert first_set == IpNetworkSet([ip_network('10.0.0.0/23')])
+        assert first_set != IpNetworkSet([ip_network('10.0.0.0/24')])
+        assert first_set != ['10.0.0.0/23']
+        assert "IpNetworkSet([IPv4Network('10.0.0.0/23')])" == repr(first_set)
+
+    @pytest.mark.parametrize(
+        'param_class', [IpNetworkListParamType, Ipv4NetworkListParamType, Ipv6NetworkListParamType]
+    )
+    def test_should_raise_error_when_collapse_is_used_in_stream_mode(self, param_class):
+        with pytest.raises(ValueError) as exc_info:
+            param_class(collapse=True, stream=True)
+
+        assert 'collapse cannot be used in stream mode' == str(exc_info.value)
+
+
+class TestIpAddressInNetworks:
+    """Tests types restricting ip addresses to a set of networks"""
+
+    allowed = ['10.0.0.0/24', '10.0.1.0/24', '192.168.0.0/16', '2001:db8::/32']
+    denied = ['192.168.1.0/24', IPv6Network('2001:db8:1::/48')]
+
+    def test_parameter_name_and_representation_are_correct(self):
+        parameter = IpAddressInNetworks(['10.0.0.0/24', '10.0.1.0/24'], ['10.0.0.0/30'])
+
+        assert 'ip address' == parameter.name
+        assert "IpAddressInNetworks([IPv4Network('10.0.0.0/23')], [IPv4Network('10.0.0.0/30')])" == repr(parameter)
+        assert 'ip address list' == IpAddressInNetworksListParamType(['10.0.0.0/24']).name
+
+    @pytest.mark.parametrize(
+        'value', ['10.0.0.0', '10.0.1.255', '192.168.0.1', '192.168.2.1', '2001:db8::1', IPv4Address('10.0.0.5')]
+    )
+    def test_should_return_address_when_it_is_in_an_allowed_network(self, value):
+        parameter = IpAddressInNetworks(self.allowed, self.denied)
+
+        assert ip_address(value) == parameter.convert(value, None, None)
+
+    @pytest.mark.parametrize(
+        ('value', 'message'),
+        [
+            ('10.0.2.0', '10.0.2.0 is not in an allowed network.'),
+            ('9.255.255.255', '9.255.255.255 is not in an allowed network.'),
+            ('::1', '::1 is not in an allowed network.'),
+            ('192.168.1.20', '192.168.1.20 is in a denied network.'),
+            ('2001:db8:1::1', '2001:db8:1::1 is in a denied network.'),
+            ('foo', 'foo is not a valid ip address'),
+        ],
+    )
+    def test_should_print_error_when_address_is_not_allowed(self, runner, value, message):
+        @click.command()
+        @click.option('-i', 'ip', type=IpAddressInNetworks(self.allowed, self.denied))
+        def cli(ip):
+            click.echo(ip)
+
+        result = runner.invoke(cli, ['-i', value])
+
+        assert_in_output(2, message, result)
+
+    def test_should_accept_network_set(self):
+        network_set = IpNetworkSet([ip_network('10.0.0.0/8')])
+        parameter = IpAddressInNetworks(network_set)
+
+        assert network_set is parameter._allowed
+        assert IPv4Address('10.1.2.3') == parameter.convert('10.1.2.3', None, None)
+
+    def test_should_raise_error_when_giving_invalid_network(self):
+        with pytest.raises(ValueError):
+            IpAddressInNetworks(['10.0.0.1/24'])
+
+    def test_should_report_addresses_which_are_not_allowed_in_list_type(self):
+        parameter = IpAddressInNetworksListParamType(self.allowed, self.denied)
+
+        assert [IPv4Address('10.0.0.1'), IPv6Address('2001:db8::1')] == parameter.convert(
+            '10.0.0.1,2001:db8::1', None, None
+        )
+        with pytest.raises(click.BadParameter) as exc_info:
+            parameter.convert('10.0.0.1,192.168.1.1,foo,8.8.8.8', None, None)
+
+        assert "These items are not allowed ip addresses: ['192.168.1.1', 'foo', '8.8.8.8']" == str(exc_info.value)
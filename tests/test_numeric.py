@@ -1,4 +1,4 @@
-from decimal import Decimal
+from decimal import ROUND_DOWN, Context, Decimal, Inexact
 from fractions import Fraction
 
 import click
@@ -15,7 +15,9 @@ from click_params.numeric import (
     FractionListParamType,
     FractionRange,
     IntListParamType,
+    _parse_fraction,
 )
+from click_params.base import RangeSequence
 from tests.helpers import assert_equals_output, assert_in_output
 
 
@@ -182,3 +184,258 @@ def test_numeric_list_param_types_ignore_empty_string(param_type):
     numeric_list_type = param_type(ignore_empty=True)
 
     assert numeric_list_type.convert('', None, None) == []
+
+
+class TestArrayMode:
+    """Tests the numpy array mode of numeric list types"""
+
+    @pytest.mark.parametrize(
+        ('param_type', 'expression', 'expected_dtype', 'values'),
+        [
+            (IntListParamType, '1,2,-3', 'int64', [1, 2, -3]),
+            (FloatListParamType, '1,.2,inf', 'float64', [1.0, 0.2, float('inf')]),
+            (ComplexListParamType, '5,1.4,2+1j', 'complex128', [complex(5, 0), complex(1.4, 0), complex(2, 1)]),
+        ],
+    )
+    def test_should_return_numpy_array_when_giving_correct_expression(
+        self, param_type, expression, expected_dtype, values
+    ):
+        numpy = pytest.importorskip('numpy')
+        array = param_type(as_array=True).convert(expression, None, None)
+
+        assert isinstance(array, numpy.ndarray)
+        assert expected_dtype == array.dtype
+        assert values == array.tolist()
+        # an already converted array is returned as is
+        assert array is param_type(as_array=True).convert(array, None, None)
+
+    def test_should_use_given_dtype(self):
+        pytest.importorskip('numpy')
+        array = IntListParamType(as_array=True, dtype='int8').convert('1,2', None, None)
+
+        assert 'int8' == array.dtype
+
+    @pytest.mark.parametrize(
+        ('parameter', 'expression', 'message'),
+        [
+            (IntListParamType(as_array=True), '1,foo,2,2.5', "integers: ['foo', '2.5']"),
+            (FloatListParamType(as_array=True), '1.2,foo,2.5,bar', "floating point values: ['foo', 'bar']"),
+            (ComplexListParamType(' ', as_array=True), '5 foo 2+1j 1.4 bar', "complex values: ['foo', 'bar']"),
+            (IntListParamType(as_array=True, dtype='int8'), '1,300,-2', "integers: ['300']"),
+            (IntListParamType(as_array=True), f'1,{2**64}', f"integers: ['{2**64}']"),
+            (
+                FloatListParamType(as_array=True, dtype='float32'),
+                '1e39,2.5,-1e39',
+                "floating point values: ['1e39', '-1e39']",
+            ),
+        ],
+    )
+    def test_should_report_all_incorrect_items(self, parameter, expression, message):
+        pytest.importorskip('numpy')
+        with pytest.raises(click.BadParameter) as exc_info:
+            parameter.convert(expression, None, None)
+
+        assert f'These items are not {message}' == str(exc_info.value)
+
+    def test_should_keep_infinite_floats_in_array(self, recwarn):
+        pytest.importorskip('numpy')
+        array = FloatListParamType(as_array=True, dtype='float32').convert('inf,-inf,1.5', None, None)
+
+        assert [float('inf'), float('-inf'), 1.5] == array.tolist()
+        assert [] == recwarn.list
+
+    def test_should_return_empty_array_with_ignore_empty_string(self):
+        pytest.importorskip('numpy')
+        array = FloatListParamType(ignore_empty=True, as_array=True).convert('', None, None)
+
+        assert (0,) == array.shape
+        assert 'float64' == array.dtype
+
+    @pytest.mark.parametrize('param_class', [IntListParamType, FloatListParamType, ComplexListParamType])
+    def test_should_raise_error_when_as_array_is_used_in_stream_mode(self, param_class):
+        with pytest.raises(ValueError) as exc_info:
+            param_class(as_array=True, stream=True)
+
+        assert 'as_array cannot be used in stream mode' == str(exc_info.value)
+
+    def test_should_return_converted_array_as_is_with_ignore_empty(self):
+        pytest.importorskip('numpy')
+        param_type = IntListParamType(as_array=True, ignore_empty=True)
+        array = param_type.convert('1,2', None, None)
+
+        assert array is param_type.convert(array, None, None)
+
+    def test_should_return_list_when_numpy_is_not_installed(self, mocker):
+        mocker.patch('click_params.numeric._import_numpy', return_value=None)
+
+        assert [1, 2] == IntListParamType(as_array=True).convert('1,2', None, None)
+        assert [] == IntListParamType(ignore_empty=True, as_array=True).convert('', None, None)
+
+
+class TestExactNumbers:
+    """Tests the parsing of decimal and fraction values"""
+
+    @pytest.mark.parametrize(
+        'value',
+        [
+            '12',
+            '007',
+            '-3/4',
+            '+10/4',
+            '1234/5678',
+            '12.50',
+            '-0.125',
+            '.5',
+            '5.',
+            '1e3',
+            '1_000',
+            ' 3 / 4 ',
+            '١٢',
+            '',
+            '-',
+            '3/',
+            '/4',
+            '1.2.3',
+            '1/0',
+            'foo',
+        ],
+    )
+    def test_should_parse_fractions_like_fraction_class(self, value):
+        try:
+            expected = Fraction(value)
+        except (ValueError, ZeroDivisionError) as e:
+            with pytest.raises(type(e)):
+                _parse_fraction(value)
+        else:
+            fraction = _parse_fraction(value)
+            assert Fraction is type(fraction)
+            assert (expected.numerator, expected.denominator) == (fraction.numerator, fraction.denominator)
+
+    @pytest.mark.parametrize(
+        ('param_type', 'value'),
+        [
+            (DECIMAL, Decimal('1.5')),
+            (FRACTION, Fraction(1, 3)),
+            (DecimalRange(0, 2), Decimal('1.5')),
+            (FractionRange(0, 1), Fraction(1, 3)),
+        ],
+    )
+    def test_should_return_already_parsed_values_as_is(self, param_type, value):
+        assert value is param_type.convert(value, None, None)
+
+    @pytest.mark.parametrize(
+        ('options', 'expression', 'expected'),
+        [
+            ({'context': Context(prec=3)}, '1.23456,-12345', [Decimal('1.23'), Decimal('-1.23E+4')]),
+            ({'quantize': Decimal('0.01')}, '1.005,2,-3.14159', [Decimal('1.00'), Decimal('2.00'), Decimal('-3.14')]),
+            (
+                {'context': Context(rounding=ROUND_DOWN), 'quantize': Decimal('0.1')},
+                '1.99, 2.05',
+                [Decimal('1.9'), Decimal('2.0')],
+            ),
+        ],
+    )
+    def test_should_round_decimals_with_given_context_and_quantize(self, options, expression, expected):
+        values = DecimalListParamType(**options).convert(expression, None, None)
+
+        assert [str(value) for value in expected] == [str(value) for value in values]
+
+    def test_should_reject_decimals_raising_signals_trapped_by_context(self):
+        decimal_list = DecimalListParamType(context=Context(prec=3, traps=[Inexact]))
+        with pytest.raises(click.BadParameter) as exc_info:
+            decimal_list.convert('1.23,1.2345,foo', None, None)
+
+        assert "These items are not decimal values: ['1.2345', 'foo']" == str(exc_info.value)
+
+    @pytest.mark.parametrize(
+        ('param_type', 'expression', 'expected'),
+        [
+            (DecimalListParamType(), ' 1.5 ,1_000,NaN', ['1.5', '1000', 'NaN']),
+            (FractionListParamType(), '1/2,-2.50,3', [Fraction(1, 2), Fraction(-5, 2), Fraction(3)]),
+        ],
+    )
+    def test_list_types_should_give_same_values_as_number_classes(self, param_type, expression, expected):
+        values = param_type.convert(expression, None, None)
+
+        assert expected == [str(value) if isinstance(value, Decimal) else value for value in values]
+
+
+class TestIntRanges:
+    """Tests the ranges option of IntListParamType"""
+
+    @pytest.mark.parametrize(
+        ('expression', 'segments'),
+        [
+            ('1-1024', [range(1, 1025)]),
+            ('22, 80-90:2 ,-5--3', [range(22, 23), range(80, 91, 2), range(-5, -2)]),
+            ('0-10:20,7-7', [range(0, 11, 20), range(7, 8)]),
+        ],
+    )
+    def test_should_convert_ranges_to_range_sequence(self, expression, segments):
+        sequence = IntListParamType(ranges=True).convert(expression, None, None)
+
+        assert isinstance(sequence, RangeSequence)
+        assert tuple(segments) == sequence.segments
+
+    def test_should_not_materialize_big_ranges(self):
+        sequence = IntListParamType(ranges=True).convert('0-1000000000000', None, None)
+
+        assert 1000000000001 == len(sequence)
+        assert 123456789 in sequence
+        assert 1000000000000 == sequence[-1]
+
+    def test_should_report_invalid_ranges(self):
+        with pytest.raises(click.BadParameter) as exc_info:
+            IntListParamType(ranges=True).convert('1-x,5-3,4-9:0,3,1.5', None, None)
+
+        assert "These items are not integers: ['1-x', '5-3', '4-9:0', '1.5']" == str(exc_info.value)
+
+    def test_should_reject_overlapping_ranges(self):
+        int_list = IntListParamType(ranges=True, allow_overlaps=False)
+        with pytest.raises(click.BadParameter) as exc_info:
+            int_list.convert('1-10,5,20-30:2,21-29:2,22', None, None)
+
+        assert "These items overlap: ['1-10', '5', '20-30:2', '22']" == str(exc_info.value)
+        assert (range(1, 5), range(5, 11)) == int_list.convert('1-4,5-10', None, None).segments
+
+    def test_should_report_overlaps_of_huge_ranges(self):
+        with pytest.raises(click.BadParameter) as exc_info:
+            IntListParamType(ranges=True, allow_overlaps=False).convert(f'0-{10**20},5', None, None)
+
+        assert f"These items overlap: ['0-{10**20}', '5']" == str(exc_info.value)
+
+    def test_should_yield_integers_in_stream_mode(self):
+        items = IntListParamType(ranges=True, stream=True).convert('1-3,7,10-14:2', None, None)
+
+        assert [1, 2, 3, 7, 10, 12, 14] == list(items)
+
+    def test_should_return_empty_sequence_for_empty_string(self):
+        assert RangeSequence([]) == IntListParamType(ranges=True, ignore_empty=True).convert('', None, None)
+
+    @pytest.mark.parametrize(
+        ('options', 'message'),
+        [
+            ({'ranges': True, 'as_array': True}, 'ranges cannot be used with as_array, unique or sort'),
+            ({'ranges': True, 'sort': True}, 'ranges cannot be used with as_array, unique or sort'),
+            ({'allow_overlaps': False}, 'allow_overlaps can only be disabled with ranges and without stream'),
+            (
+                {'ranges': True, 'stream': True, 'allow_overlaps': False},
+                'allow_overlaps can only be disabled with ranges and without stream',
+            ),
+        ],
+    )
+    def test_should_raise_error_when_options_are_incompatible(self, options, message):
+        with pytest.raises(ValueError) as exc_info:
+            IntListParamType(**options)
+
+        assert message == str(exc_info.value)
+
+    def test_should_print_ranges_from_command_line(self, runner):
+        @click.command()
+        @click.option('-p', '--ports', type=IntListParamType(ranges=True))
+        def cli(ports):
+            click.echo(f'{len(ports)} {80 in ports}')
+
+        result = runner.invoke(cli, ['-p', '22,1000-65535,80-90:2'])
+
+        assert_equals_output(0, '64543 True\n', result)
@@ -0,0 +1,115 @@
+from decimal import Decimal
+from ipaddress import ip_address
+
+import click
+import pytest
+
+from click_params.base import CustomParamType
+from click_params.domain import URL
+from click_params.network import IP_ADDRESS
+from click_params.numeric import DecimalRange
+from click_params.options import BatchArgument, BatchOption, batch_argument, batch_option
+from tests.helpers import assert_equals_output, assert_in_output
+
+
+def test_should_create_batch_parameters():
+    @click.command()
+    @batch_option('-i', 'ips', type=IP_ADDRESS, multiple=True)
+    @batch_argument('urls', type=URL, nargs=-1)
+    def cli(ips, urls):
+        pass
+
+    option, argument = cli.params
+
+    assert isinstance(option, BatchOption)
+    assert isinstance(argument, BatchArgument)
+
+
+@pytest.mark.parametrize(
+    ('arguments', 'output'),
+    [
+        (['-i', '1.1.1.1', '-i', '::1', '-d', '2.5', 'https://example.com'], "('1.1.1.1', '::1') (Decimal('2.5'),)"),
+        ([], '() ()'),
+    ],
+)
+def test_should_convert_multiple_values(runner, arguments, output):
+    @click.command()
+    @batch_option('-i', 'ips', type=IP_ADDRESS, multiple=True)
+    @batch_option('-d', 'decimals', type=DecimalRange(Decimal(0), Decimal(10)), multiple=True)
+    @batch_argument('urls', type=URL, nargs=-1)
+    def cli(ips, decimals, urls):
+        assert isinstance(urls, tuple)
+        click.echo(f'{tuple(map(str, ips))} {decimals!r}')
+
+    result = runner.invoke(cli, arguments)
+
+    assert_equals_output(0, f'{output}\n', result)
+
+
+@pytest.mark.parametrize(
+    ('arguments', 'message'),
+    [
+        (['-i', 'foo', '-i', '1.1.1.1', '-i', 'bar'], "Invalid ip address values: ['foo', 'bar']"),
+        (['-d', '11', '-d', '5', '-d', '-1'], "These values are not in the valid range of 0 to 10: ['11', '-1']"),
+        (['foo', 'https://example.com', 'bar'], "Invalid url values: ['foo', 'bar']"),
+    ],
+)
+def test_should_report_all_invalid_values_in_one_error(runner, arguments, message):
+    @click.command()
+    @batch_option('-i', 'ips', type=IP_ADDRESS, multiple=True)
+    @batch_option('-d', 'decimals', type=DecimalRange(Decimal(0), Decimal(10)), multiple=True)
+    @batch_argument('urls', type=URL, nargs=-1)
+    def cli(ips, decimals, urls):
+        pass
+
+    result = runner.invoke(cli, arguments)
+
+    assert_in_output(2, message, result)
+
+
+class CountingIpType(CustomParamType):
+    name = 'ip address'
+
+    def __init__(self):
+        self.batches = []
+
+    def convert(self, value, param, ctx):
+        return ip_address(value)
+
+    def convert_many(self, values, param=None, ctx=None):
+        self.batches.append(values)
+        return super().convert_many(values, param, ctx)
+
+
+@pytest.mark.parametrize(
+    ('attributes', 'arguments', 'batches'),
+    [
+        ({'multiple': True}, ['-i', '1.1.1.1', '-i', '::1'], [['1.1.1.1', '::1']]),
+        ({}, ['-i', '1.1.1.1'], []),
+        ({'nargs': 2}, ['-i', '1.1.1.1', '::1'], []),
+        ({'nargs': 2, 'multiple': True}, ['-i', '1.1.1.1', '::1'], []),
+    ],
+)
+def test_should_only_use_convert_many_for_multiple_single_values(runner, attributes, arguments, batches):
+    ip_type = CountingIpType()
+
+    @click.command()
+    @batch_option('-i', 'ips', type=ip_type, **attributes)
+    def cli(ips):
+        pass
+
+    result = runner.invoke(cli, arguments)
+
+    assert 0 == result.exit_code
+    assert batches == ip_type.batches
+
+
+def test_should_convert_values_one_by_one_when_type_has_no_convert_many(runner):
+    @click.command()
+    @batch_option('-n', 'numbers', type=click.INT, multiple=True)
+    def cli(numbers):
+        click.echo(repr(numbers))
+
+    result = runner.invoke(cli, ['-n', '1', '-n', '2'])
+
+    assert_equals_output(0, '(1, 2)\n', result)
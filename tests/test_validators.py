@@ -0,0 +1,170 @@
+import random
+import string
+
+import pytest
+import validators
+
+from click_params import _validators
+from click_params.domain import DOMAIN, EMAIL, SLUG, EmailParamType
+from click_params.miscellaneous import MAC_ADDRESS
+
+ALPHABET = string.ascii_letters + string.digits + '.-_@:"\\ \t\n' + '\x00\x7féĀɏфKſ日'
+SEEDS = range(2)
+CORPUS_SIZE = 2000
+
+
+def random_text(rng, alphabet, max_length):
+    return ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+
+
+def random_label(rng):
+    label = random_text(rng, string.ascii_lowercase + string.digits + '-', 8) or 'a'
+    if rng.random() < 0.05:
+        label = label * rng.randint(10, 20)
+    return label
+
+
+def random_domain(rng):
+    domain = '.'.join(random_label(rng) for _ in range(rng.randint(1, 4)))
+    if rng.random() < 0.1:
+        domain = domain.upper()
+    if rng.random() < 0.05:
+        domain += '.'
+    return domain
+
+
+def mutate(rng, value):
+    """Changes, inserts or removes a random character of value."""
+    position = rng.randint(0, len(value))
+    operation = rng.choice(['insert', 'replace', 'delete', 'keep'])
+    if operation == 'insert':
+        return value[:position] + rng.choice(ALPHABET) + value[position:]
+    if operation == 'replace':
+        return value[:position] + rng.choice(ALPHABET) + value[position + 1 :]
+    if operation == 'delete':
+        return value[:position] + value[position + 1 :]
+    return value
+
+
+def domain_corpus(rng):
+    for _ in range(CORPUS_SIZE):
+        yield mutate(rng, random_domain(rng))
+        yield random_text(rng, ALPHABET, 20)
+
+
+def email_corpus(rng):
+    username_alphabet = string.ascii_letters + string.digits + '!#$%&\'*+/=?^_`{}|~.-"\\ '
+    for _ in range(CORPUS_SIZE):
+        username = random_text(rng, username_alphabet, 10)
+        if rng.random() < 0.1:
+            username = f'"{username}"'
+        if rng.random() < 0.02:
+            username *= 20
+        yield mutate(rng, f'{username}@{random_domain(rng)}')
+        yield random_text(rng, ALPHABET, 20)
+
+
+def slug_corpus(rng):
+    for _ in range(CORPUS_SIZE):
+        yield mutate(rng, '-'.join(random_label(rng) for _ in range(rng.randint(1, 4))))
+        yield random_text(rng, ALPHABET, 10)
+
+
+def mac_address_corpus(rng):
+    for _ in range(CORPUS_SIZE):
+        parts = [f'{rng.randrange(256):02x}' for _ in range(rng.randint(5, 7))]
+        yield mutate(rng, rng.choice(':-').join(parts))
+        yield random_text(rng, string.hexdigits + ':-', 20)
+
+
+EDGE_CASES = [
+    '',
+    'example.com',
+    'example.com.',
+    'example.com\n',
+    'EXAMPLE.COM',
+    'xn--80ak6aa92e.com',
+    'пример.рф',
+    'exa mple.com',
+    'exa__mple.com',
+    '_example.com',
+    'example.c0m',
+    f'{"a" * 63}.com',
+    f'{"a" * 64}.com',
+    f'example.{"a" * 63}',
+    f'example.{"a" * 64}',
+    'a..b.com',
+    '.example.com',
+    'foo@example.com',
+    'foo\n@example.com',
+    'foo@example.com\n',
+    'Ābc@example.com',
+    'fóo@example.com',
+    'foo@bar@example.com',
+    '"foo bar"@example.com',
+    '"foo\\"@example.com',
+    f'{"a" * 64}@example.com',
+    f'{"a" * 65}@example.com',
+    'foo@localhost',
+    'foo@[127.0.0.1]',
+    'foo@',
+    '@example.com',
+    'my-slug',
+    'my-slug\n',
+    'my--slug',
+    '-my-slug',
+    'My-Slug',
+    '01:23:45:67:ab:CD',
+    '01-23-45-67-ab-cd',
+    '01:23:45:67:ab:cd\n',
+    '01:23:45:67:ab',
+    'K',
+]
+
+
+@pytest.mark.parametrize(
+    ('fast_validator', 'reference_validator', 'corpus'),
+    [
+        (_validators.domain, validators.domain, domain_corpus),
+        (_validators.email, validators.email, email_corpus),
+        (_validators.slug, validators.slug, slug_corpus),
+        (_validators.mac_address, validators.mac_address, mac_address_corpus),
+    ],
+)
+@pytest.mark.parametrize('seed', SEEDS)
+def test_should_give_same_results_as_validators_package(fast_validator, reference_validator, corpus, seed):
+    rng = random.Random(seed)
+    values = [*corpus(rng), *EDGE_CASES, *(mutate(rng, value) for value in EDGE_CASES)]
+    mismatches = [value for value in values if fast_validator(value) != bool(reference_validator(value))]
+
+    assert [] == mismatches
+    # the corpus must contain valid and invalid values to be meaningful
+    assert 0 < sum(fast_validator(value) for value in values) < len(values)
+
+
+@pytest.mark.parametrize(
+    'fast_validator', [_validators.domain, _validators.email, _validators.slug, _validators.mac_address]
+)
+@pytest.mark.parametrize('value', [None, b'example.com', b'foo@example.com'])
+def test_should_return_false_when_value_is_not_a_string(fast_validator, value):
+    assert fast_validator(value) is False
+
+
+@pytest.mark.parametrize(
+    ('param_type', 'fast_validator'),
+    [
+        (DOMAIN, _validators.domain),
+        (EMAIL, _validators.email),
+        (SLUG, _validators.slug),
+        (MAC_ADDRESS, _validators.mac_address),
+    ],
+)
+def test_should_use_fast_validators_in_parameter_types(param_type, fast_validator):
+    assert fast_validator is param_type._callback
+
+
+def test_should_use_validators_package_when_email_options_are_given():
+    email_type = EmailParamType(ipv4_address=True)
+
+    assert validators.email is email_type._callback.func
+    assert 'foo@[127.0.0.1]' == email_type.convert('foo@[127.0.0.1]', None, None)